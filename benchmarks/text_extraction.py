@@ -0,0 +1,169 @@
+"""テキスト取り出しのマイクロベンチマーク
+
+民法と同程度の規模（約1,050条）の法令XMLを生成し、次の2つを比較します。
+
+- 従来の実装: 要素ごとにPythonの再帰でツリーを辿り、Rtを読み飛ばす
+- 現在の実装: パース時にRtの除去とSup/Subの置き換えを1回だけ行い、
+  子要素の無い要素は `text` をそのまま、それ以外はlxmlのテキスト出力（C実装）で取り出す
+
+使い方:
+    python benchmarks/text_extraction.py [--articles 1050] [--repeat 5]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from lxml import etree
+
+from egov_law_mcp.parser import LawXMLParser
+
+# テキストを取り出す要素（見出し・本文）
+TEXT_TAGS = (
+    "LawTitle",
+    "PartTitle",
+    "ChapterTitle",
+    "SectionTitle",
+    "ArticleCaption",
+    "ArticleTitle",
+    "ParagraphNum",
+    "ItemTitle",
+    "Subitem1Title",
+    "Sentence",
+)
+
+
+def make_law_xml(articles: int) -> str:
+    """民法に似た構造（編・章・節・条・項・号・号の細分、ルビ・上付き文字）の法令XML"""
+    out = [
+        '<?xml version="1.0" encoding="UTF-8"?><Law><LawBody>',
+        "<LawTitle>民<Ruby>法<Rt>ほう</Rt></Ruby></LawTitle><MainProvision>",
+    ]
+    per_section = 10
+    for n in range(1, articles + 1):
+        if n % (per_section * 50) == 1:
+            out.append(f'<Part Num="{n}"><PartTitle>第{n}編　総則</PartTitle>')
+        if n % (per_section * 10) == 1:
+            out.append(f'<Chapter Num="{n}"><ChapterTitle>第{n}章　通則</ChapterTitle>')
+        if n % per_section == 1:
+            out.append(f'<Section Num="{n}"><SectionTitle>第{n}節　総則</SectionTitle>')
+        out.append(
+            f'<Article Num="{n}"><ArticleCaption>（見出し）</ArticleCaption>'
+            f"<ArticleTitle>第{n}条</ArticleTitle>"
+        )
+        for p in range(1, 4):
+            out.append(
+                f'<Paragraph Num="{p}"><ParagraphNum>{p}</ParagraphNum><ParagraphSentence>'
+                "<Sentence>私権は、<Ruby>公共<Rt>こうきょう</Rt></Ruby>の福祉に適合しなければ"
+                "ならない。</Sentence>"
+                "<Sentence>権利の行使及び義務の履行は、信義に従い誠実に行わなければならない。"
+                "</Sentence></ParagraphSentence>"
+            )
+            for i in range(1, 3):
+                out.append(
+                    f'<Item Num="{i}"><ItemTitle>{i}</ItemTitle><ItemSentence>'
+                    "<Sentence>前号に掲げるもののほか、政令で定めるもの</Sentence></ItemSentence>"
+                    '<Subitem1 Num="1"><Subitem1Title>イ</Subitem1Title><Subitem1Sentence>'
+                    "<Sentence>政令で定める額</Sentence></Subitem1Sentence></Subitem1>"
+                    "</Item>"
+                )
+            out.append("</Paragraph>")
+        # 上付き・下付き文字は条に1つ程度
+        out.append(
+            '<Paragraph Num="4"><ParagraphNum>4</ParagraphNum><ParagraphSentence>'
+            "<Sentence>面積は十<Sup>6</Sup>平方メートル、CO<Sub>2</Sub>の排出量とする。"
+            "</Sentence></ParagraphSentence></Paragraph></Article>"
+        )
+        if n % per_section == 0 or n == articles:
+            out.append("</Section>")
+        if n % (per_section * 10) == 0 or n == articles:
+            out.append("</Chapter>")
+        if n % (per_section * 50) == 0 or n == articles:
+            out.append("</Part>")
+    out.append("</MainProvision></LawBody></Law>")
+    return "".join(out)
+
+
+def legacy_get_text(element: etree._Element | None) -> str:
+    """従来の実装（Pythonの再帰でRtを読み飛ばす）"""
+    if element is None:
+        return ""
+    text_parts: list[str] = []
+
+    def extract_text(el: etree._Element) -> None:
+        if el.tag == "Rt":
+            return
+        if el.text:
+            text_parts.append(el.text)
+        for child in el:
+            extract_text(child)
+            if child.tail:
+                text_parts.append(child.tail)
+
+    extract_text(element)
+    return "".join(text_parts)
+
+
+class LegacyParser(LawXMLParser):
+    """従来のテキスト取り出しを使うパーサー（比較用）"""
+
+    def _prepare(self, root: etree._Element) -> etree._Element:
+        return root
+
+    def _get_text(self, element: etree._Element | None) -> str:
+        return legacy_get_text(element)
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    """`repeat` 回実行し、最速の実行時間（秒）を返す"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--articles", type=int, default=1050, help="条の数")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="繰り返し回数")
+    args = arg_parser.parse_args()
+
+    xml = make_law_xml(args.articles)
+    xml_bytes = xml.encode("utf-8")
+    parser = LawXMLParser()
+    legacy = LegacyParser()
+    raw_root = etree.fromstring(xml_bytes)
+    prepared_root = parser.parse(xml_bytes)
+    raw_targets = [el for el in raw_root.iter(*TEXT_TAGS)]
+    prepared_targets = [el for el in prepared_root.iter(*TEXT_TAGS)]
+
+    print(f"法令XML: {len(xml_bytes) / 1024 / 1024:.1f}MiB, {args.articles}条")
+    print(f"テキストを取り出す要素: {len(raw_targets)}")
+
+    results = {
+        "テキスト取り出し（全要素）": (
+            best_of(args.repeat, lambda: [legacy_get_text(el) for el in raw_targets]),
+            best_of(args.repeat, lambda: [parser._get_text(el) for el in prepared_targets]),
+        ),
+        "下処理（Rt除去・Sup/Sub置き換え）": (
+            0.0,
+            best_of(args.repeat, lambda: parser._prepare(etree.fromstring(xml_bytes)))
+            - best_of(args.repeat, lambda: etree.fromstring(xml_bytes)),
+        ),
+        "全文のMarkdown変換（パース込み）": (
+            best_of(args.repeat, lambda: legacy.parse_full_text(xml_bytes)),
+            best_of(args.repeat, lambda: parser.parse_full_text(xml_bytes)),
+        ),
+    }
+
+    print(f"{'':<34}{'従来':>10}{'現在':>10}{'倍率':>8}")
+    for name, (before, after) in results.items():
+        ratio = f"{before / after:.1f}x" if before and after > 0 else "-"
+        print(f"{name:<30}{before * 1000:>9.1f}ms{after * 1000:>9.1f}ms{ratio:>8}")
+    print(f"（{args.repeat}回中の最速値）")
+
+
+if __name__ == "__main__":
+    main()
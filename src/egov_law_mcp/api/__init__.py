@@ -1,5 +1,35 @@
 """api パッケージ"""
 
-from .client import EGovAPIClient, EGovAPIError
+from .client import (
+    EGovAPIClient,
+    EGovAPIError,
+    close_shared_http_client,
+    create_http_client,
+    get_shared_http_client,
+)
+from .ratelimit import (
+    AdaptiveConcurrencyLimiter,
+    TokenBucketRateLimiter,
+    get_adaptive_limiter,
+    get_rate_limiter,
+)
+from .resilience import CircuitBreaker, CircuitState, RetryPolicy, get_circuit_breaker
+from .singleflight import SingleFlight, get_single_flight
 
-__all__ = ["EGovAPIClient", "EGovAPIError"]
+__all__ = [
+    "EGovAPIClient",
+    "EGovAPIError",
+    "close_shared_http_client",
+    "create_http_client",
+    "get_shared_http_client",
+    "AdaptiveConcurrencyLimiter",
+    "TokenBucketRateLimiter",
+    "get_adaptive_limiter",
+    "get_rate_limiter",
+    "CircuitBreaker",
+    "CircuitState",
+    "RetryPolicy",
+    "get_circuit_breaker",
+    "SingleFlight",
+    "get_single_flight",
+]
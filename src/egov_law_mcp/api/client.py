@@ -1,13 +1,31 @@
 """e-Gov法令API v2 クライアント"""
 
 import asyncio
+import contextlib
+import importlib.util
+import logging
 import os
-from typing import Any
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
 
 import httpx
 
 from egov_law_mcp.models import ErrorCode
 
+from .ratelimit import RateLimiter, get_adaptive_limiter, get_rate_limiter
+from .resilience import (
+    CircuitBreaker,
+    CircuitState,
+    RetryPolicy,
+    get_circuit_breaker,
+    parse_retry_after,
+)
+from .singleflight import SingleFlight, get_single_flight
+
+T = TypeVar("T")
+
 
 class EGovAPIError(Exception):
     """e-Gov API エラー"""
@@ -19,36 +37,233 @@ class EGovAPIError(Exception):
         super().__init__(message)
 
 
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 5
+DEFAULT_KEEPALIVE_EXPIRY = 30.0  # seconds
+
+logger = logging.getLogger(__name__)
+
+# プロセス共有のコネクションプール（イベントループごとに1つ）
+_shared_http_client: httpx.AsyncClient | None = None
+_shared_loop: asyncio.AbstractEventLoop | None = None
+# ループが変わって使われなくなり、元のループが閉じていて閉じられなかったプール
+_retired_http_clients: list[httpx.AsyncClient] = []
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """真偽値の環境変数を読み取る"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def create_http_client(
+    timeout: float | None = None,
+    max_connections: int | None = None,
+    max_keepalive_connections: int | None = None,
+    keepalive_expiry: float | None = None,
+    http2: bool | None = None,
+) -> httpx.AsyncClient:
+    """コネクションプール付きHTTPクライアントを生成
+
+    HTTP/2は `h2` パッケージがインストールされている場合のみ有効になります。
+
+    Args:
+        timeout: リクエストタイムアウト（秒）
+        max_connections: 最大同時接続数
+        max_keepalive_connections: キープアライブで保持する最大接続数
+        keepalive_expiry: アイドル接続を保持する秒数
+        http2: HTTP/2を使用するか（未指定時は環境変数 `EGOV_API_HTTP2`）
+
+    Returns:
+        httpx.AsyncClient
+    """
+    if timeout is None:
+        timeout = float(os.getenv("EGOV_API_TIMEOUT", str(EGovAPIClient.DEFAULT_TIMEOUT)))
+    if max_connections is None:
+        max_connections = int(os.getenv("EGOV_API_MAX_CONNECTIONS", str(DEFAULT_MAX_CONNECTIONS)))
+    if max_keepalive_connections is None:
+        max_keepalive_connections = int(
+            os.getenv("EGOV_API_MAX_KEEPALIVE_CONNECTIONS", str(DEFAULT_MAX_KEEPALIVE_CONNECTIONS))
+        )
+    if keepalive_expiry is None:
+        keepalive_expiry = float(
+            os.getenv("EGOV_API_KEEPALIVE_EXPIRY", str(DEFAULT_KEEPALIVE_EXPIRY))
+        )
+    if http2 is None:
+        http2 = _env_flag("EGOV_API_HTTP2", True)
+
+    # h2 が無い環境ではHTTP/1.1にフォールバック
+    http2 = http2 and importlib.util.find_spec("h2") is not None
+
+    return httpx.AsyncClient(
+        timeout=timeout,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+    )
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """プロセス共有のHTTPクライアントを取得
+
+    全ての `EGovAPIClient` インスタンスが同じコネクションプールを使うため、
+    ツール呼び出しごとにTCP/TLSハンドシェイクが発生しません。
+    コネクションはイベントループに紐づくため、ループが変わった場合は作り直します。
+    """
+    global _shared_http_client, _shared_loop
+
+    loop = asyncio.get_running_loop()
+    if _shared_http_client is None or _shared_http_client.is_closed or _shared_loop is not loop:
+        _retire_shared_http_client()
+        _shared_http_client = create_http_client()
+        _shared_loop = loop
+    return _shared_http_client
+
+
+def _retire_shared_http_client() -> None:
+    """ループが変わって使われなくなったプールを閉じる
+
+    コネクションは元のループに紐づくため、元のループが動いていればそこで閉じます。
+    止まっている・閉じたループのものは `close_shared_http_client` でまとめて閉じます。
+    """
+    client, loop = _shared_http_client, _shared_loop
+    if client is None or client.is_closed or loop is None:
+        return
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    else:
+        _retired_http_clients.append(client)
+
+
+async def close_shared_http_client() -> None:
+    """プロセス共有のHTTPクライアントを閉じる（サーバー終了時に呼び出す）"""
+    global _shared_http_client, _shared_loop
+
+    client = _shared_http_client
+    _shared_http_client = None
+    _shared_loop = None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+    retired = list(_retired_http_clients)
+    _retired_http_clients.clear()
+    for client in retired:
+        # 元のループは閉じているため、ソケットを閉じられなくてもプールの破棄だけは行う
+        with contextlib.suppress(Exception):
+            await client.aclose()
+
+
 class EGovAPIClient:
-    """e-Gov法令API v2 クライアント"""
+    """e-Gov法令API v2 クライアント
+
+    `http_client` 未指定時はプロセス共有のコネクションプールを使用します。
+    """
 
     DEFAULT_BASE_URL = "https://laws.e-gov.go.jp/api/2"
     DEFAULT_TIMEOUT = 30.0
     DEFAULT_RATE_LIMIT = 5  # requests per second
+    DEFAULT_MAX_CONCURRENCY = 5  # in-flight requests
+    DEFAULT_ADAPTIVE_MAX_CONCURRENCY = 20
+    DEFAULT_MAX_RETRIES = 2
+    DEFAULT_RETRY_BACKOFF = 0.2  # seconds
+    DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 5
+    DEFAULT_CIRCUIT_RECOVERY_TIMEOUT = 30.0  # seconds
+    RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
 
     def __init__(
         self,
         base_url: str | None = None,
         timeout: float | None = None,
         rate_limit: int | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        rate_limiter: RateLimiter | None = None,
+        single_flight: SingleFlight | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        adaptive: bool | None = None,
     ) -> None:
         self.base_url = base_url or os.getenv("EGOV_API_BASE_URL", self.DEFAULT_BASE_URL)
         self.timeout = timeout or float(os.getenv("EGOV_API_TIMEOUT", str(self.DEFAULT_TIMEOUT)))
         self.rate_limit = rate_limit or int(
             os.getenv("RATE_LIMIT_PER_SECOND", str(self.DEFAULT_RATE_LIMIT))
         )
-        self._last_request_time: float = 0.0
-        self._lock = asyncio.Lock()
-
-    async def _rate_limit_wait(self) -> None:
-        """レート制限のための待機"""
-        async with self._lock:
-            now = asyncio.get_event_loop().time()
-            min_interval = 1.0 / self.rate_limit
-            elapsed = now - self._last_request_time
-            if elapsed < min_interval:
-                await asyncio.sleep(min_interval - elapsed)
-            self._last_request_time = asyncio.get_event_loop().time()
+        self._http_client = http_client
+
+        # レートリミッターはプロセス全体で共有（インスタンスごとに持たない）
+        if adaptive is None:
+            adaptive = _env_flag("EGOV_API_ADAPTIVE_CONCURRENCY", False)
+        max_concurrency = int(
+            os.getenv("EGOV_API_MAX_CONCURRENCY", str(self.DEFAULT_MAX_CONCURRENCY))
+        )
+        burst_env = os.getenv("RATE_LIMIT_BURST")
+        burst = int(burst_env) if burst_env else None
+        if rate_limiter is None and adaptive:
+            # 応答時間と429/タイムアウトに応じて同時実行数を自動調整
+            # （秒間リクエスト数の上限は引き続きトークンバケットで守る）
+            rate_limiter = get_adaptive_limiter(
+                max_limit=int(
+                    os.getenv(
+                        "EGOV_API_ADAPTIVE_MAX_CONCURRENCY",
+                        str(self.DEFAULT_ADAPTIVE_MAX_CONCURRENCY),
+                    )
+                ),
+                initial_limit=max_concurrency,
+                rate=self.rate_limit,
+                burst=burst,
+            )
+        elif rate_limiter is None:
+            rate_limiter = get_rate_limiter(
+                self.rate_limit, burst=burst, max_concurrency=max_concurrency
+            )
+        self.rate_limiter: RateLimiter = rate_limiter
+
+        # 同一リクエストの合流もプロセス全体で共有
+        self.single_flight = single_flight or get_single_flight()
+
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_retries=int(os.getenv("EGOV_API_MAX_RETRIES", str(self.DEFAULT_MAX_RETRIES))),
+            backoff_base=float(
+                os.getenv("EGOV_API_RETRY_BACKOFF", str(self.DEFAULT_RETRY_BACKOFF))
+            ),
+        )
+
+        # サーキットブレーカーはベースURL単位でプロセス全体で共有
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker(
+            self.base_url or self.DEFAULT_BASE_URL,
+            failure_threshold=int(
+                os.getenv(
+                    "EGOV_API_CIRCUIT_FAILURE_THRESHOLD",
+                    str(self.DEFAULT_CIRCUIT_FAILURE_THRESHOLD),
+                )
+            ),
+            recovery_timeout=float(
+                os.getenv(
+                    "EGOV_API_CIRCUIT_RECOVERY_TIMEOUT",
+                    str(self.DEFAULT_CIRCUIT_RECOVERY_TIMEOUT),
+                )
+            ),
+        )
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """リクエストに使用するHTTPクライアントを取得"""
+        if self._http_client is not None:
+            return self._http_client
+        return get_shared_http_client()
+
+    async def _coalesce(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None,
+        fn: Callable[[], Awaitable[T]],
+    ) -> T:
+        """同時に発行された同一リクエストを1回のAPI呼び出しにまとめる"""
+        key = (self.base_url, endpoint, tuple(sorted((params or {}).items())))
+        return await self.single_flight.do(key, fn)
 
     async def _request(
         self,
@@ -57,23 +272,13 @@ class EGovAPIClient:
         params: dict[str, Any] | None = None,
         accept: str = "application/json",
     ) -> httpx.Response:
-        """APIリクエストを実行"""
-        await self._rate_limit_wait()
-
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        headers = {"Accept": accept}
-
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.request(method, url, params=params, headers=headers)
-        except Exception as e:
-            raise EGovAPIError(
-                code=ErrorCode.API_CONNECTION_ERROR.value,
-                message=f"Failed to connect to e-Gov API: {e}",
-                details=str(e),
-            ) from e
+        """APIリクエストを実行（ボディを読み込んで返す）"""
+        async with self._stream(method, endpoint, params=params, accept=accept) as response:
+            await response.aread()
+        return response
 
-        # ステータスコードに応じたエラーハンドリング
+    def _raise_for_status(self, response: httpx.Response, url: str) -> None:
+        """ステータスコードに応じたエラーハンドリング"""
         if response.status_code == 404:
             raise EGovAPIError(
                 code=ErrorCode.LAW_NOT_FOUND.value,
@@ -93,7 +298,122 @@ class EGovAPIClient:
                 details={"url": url, "status_code": response.status_code, "body": response.text},
             )
 
-        return response
+    def _check_circuit(self, url: str) -> bool:
+        """サーキットがオープンなら即座に失敗させる
+
+        Returns:
+            ハーフオープン状態での試行リクエストの場合はTrue
+        """
+        probe = self.circuit_breaker.state == CircuitState.HALF_OPEN
+        if not self.circuit_breaker.allow_request():
+            raise EGovAPIError(
+                code=ErrorCode.API_CONNECTION_ERROR.value,
+                message="e-Gov API is temporarily unavailable. Please try again later.",
+                details={
+                    "url": url,
+                    "circuit_state": self.circuit_breaker.state.value,
+                    "retry_in": round(self.circuit_breaker.retry_in(), 1),
+                },
+            )
+        return probe
+
+    @asynccontextmanager
+    async def _stream(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        accept: str = "application/json",
+        extra_headers: dict[str, str] | None = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """APIリクエストをストリーミングモードで実行
+
+        レスポンスボディは読み込まずに返すため、呼び出し側で
+        `response.aiter_bytes()` により逐次読み出せます。
+        接続エラー・429・5xx は `retry_policy` に従ってリトライし（Retry-After を尊重）、
+        連続して失敗した場合はサーキットブレーカーにより即座に失敗させます。
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        headers = {"Accept": accept, **(extra_headers or {})}
+        http_client = self._get_http_client()
+
+        attempt = 0
+        while True:
+            probe = self._check_circuit(url)
+            error: EGovAPIError
+            retry_after: float | None = None
+
+            try:
+                async with self.rate_limiter.acquire():
+                    started = time.monotonic()
+                    try:
+                        request = http_client.build_request(
+                            method, url, params=params, headers=headers, timeout=self.timeout
+                        )
+                        response = await http_client.send(request, stream=True)
+                    except Exception as e:
+                        probe = False
+                        error = EGovAPIError(
+                            code=ErrorCode.API_CONNECTION_ERROR.value,
+                            message=f"Failed to connect to e-Gov API: {e}",
+                            details=str(e),
+                        )
+                        error.__cause__ = e
+                        self.circuit_breaker.record_failure()
+                        if isinstance(e, httpx.TimeoutException):
+                            self.rate_limiter.record_overload()
+                        else:
+                            self.rate_limiter.record_error()
+                    else:
+                        probe = False
+                        try:
+                            if response.status_code >= 500:
+                                self.circuit_breaker.record_failure()
+                            else:
+                                # 4xx もサーバー自体は応答しているので成功扱い
+                                self.circuit_breaker.record_success()
+
+                            if response.status_code in (429, 503):
+                                self.rate_limiter.record_overload()
+                            elif response.status_code >= 500:
+                                self.rate_limiter.record_error()
+                            else:
+                                self.rate_limiter.record_success(time.monotonic() - started)
+
+                            if response.status_code < 400:
+                                try:
+                                    yield response
+                                except httpx.HTTPError as e:
+                                    # ボディ受信中の切断など
+                                    raise EGovAPIError(
+                                        code=ErrorCode.API_CONNECTION_ERROR.value,
+                                        message=f"Failed to read response from e-Gov API: {e}",
+                                        details=str(e),
+                                    ) from e
+                                return
+
+                            await response.aread()
+                            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                            try:
+                                self._raise_for_status(response, url)
+                            except EGovAPIError as e:
+                                error = e
+                            if response.status_code not in self.RETRYABLE_STATUS_CODES:
+                                raise error
+                        finally:
+                            await response.aclose()
+            except BaseException:
+                # 結果を記録する前にキャンセルされた場合も、ハーフオープンの試行枠を返す
+                if probe:
+                    self.circuit_breaker.release_probe()
+                raise
+
+            # レートリミットの枠を解放してから待機する
+            delay = self.retry_policy.compute_delay(attempt, retry_after)
+            if delay is None:
+                raise error
+            attempt += 1
+            await asyncio.sleep(delay)
 
     async def search_laws(
         self,
@@ -126,8 +446,44 @@ class EGovAPIClient:
         if asof:
             params["asof"] = asof
 
-        response = await self._request("GET", "/laws", params=params)
-        return response.json()  # type: ignore[no-any-return]
+        async def fetch() -> dict[str, Any]:
+            response = await self._request("GET", "/laws", params=params)
+            return response.json()  # type: ignore[no-any-return]
+
+        return await self._coalesce("/laws", params, fetch)
+
+    async def list_updated_laws(
+        self,
+        updated_from: str,
+        updated_to: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> dict[str, Any]:
+        """
+        更新された法令の一覧 (GET /laws)
+
+        Args:
+            updated_from: 更新日範囲の開始 (YYYY-MM-DD形式)
+            updated_to: 更新日範囲の終了 (YYYY-MM-DD形式)
+            limit: 取得件数上限
+            offset: ページネーション用オフセット
+
+        Returns:
+            法令一覧レスポンス
+        """
+        params: dict[str, Any] = {
+            "updated_from": updated_from,
+            "limit": limit,
+            "offset": offset,
+        }
+        if updated_to:
+            params["updated_to"] = updated_to
+
+        async def fetch() -> dict[str, Any]:
+            response = await self._request("GET", "/laws", params=params)
+            return response.json()  # type: ignore[no-any-return]
+
+        return await self._coalesce("/laws", params, fetch)
 
     async def get_law_data(
         self,
@@ -148,13 +504,61 @@ class EGovAPIClient:
         if asof:
             params["asof"] = asof
 
-        response = await self._request(
+        endpoint = f"/law_data/{law_id_or_num}"
+
+        async def fetch() -> str:
+            response = await self._request(
+                "GET",
+                endpoint,
+                params=params if params else None,
+                accept="application/xml",
+            )
+            return response.text
+
+        return await self._coalesce(endpoint, params, fetch)
+
+    @asynccontextmanager
+    async def stream_law_data(
+        self,
+        law_id_or_num: str,
+        asof: str | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        法令本文をストリーミング取得 (GET /law_data/{law_id_or_num_or_revision_id})
+
+        ボディ全体をメモリに展開せず、`response.aiter_bytes()` で逐次読み出すための
+        コンテキストマネージャーです。大規模な法令（民法、会社法など）向け。
+        検証子を指定すると条件付きGETになり、未更新なら `304 Not Modified` が返ります。
+
+        Args:
+            law_id_or_num: 法令ID、法令番号、または法令履歴ID
+            asof: 施行日時点 (YYYY-MM-DD形式)
+            etag: キャッシュ済みのETag（If-None-Match に設定）
+            last_modified: キャッシュ済みのLast-Modified（If-Modified-Since に設定）
+
+        Yields:
+            ストリーミングモードのレスポンス
+        """
+        params: dict[str, Any] = {}
+        if asof:
+            params["asof"] = asof
+
+        headers: dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        async with self._stream(
             "GET",
             f"/law_data/{law_id_or_num}",
             params=params if params else None,
             accept="application/xml",
-        )
-        return response.text
+            extra_headers=headers,
+        ) as response:
+            yield response
 
     async def get_law_revisions(self, law_id_or_num: str) -> dict[str, Any]:
         """
@@ -166,8 +570,13 @@ class EGovAPIClient:
         Returns:
             改正履歴レスポンス
         """
-        response = await self._request("GET", f"/law_revisions/{law_id_or_num}")
-        return response.json()  # type: ignore[no-any-return]
+        endpoint = f"/law_revisions/{law_id_or_num}"
+
+        async def fetch() -> dict[str, Any]:
+            response = await self._request("GET", endpoint)
+            return response.json()  # type: ignore[no-any-return]
+
+        return await self._coalesce(endpoint, None, fetch)
 
     async def keyword_search(
         self,
@@ -193,5 +602,8 @@ class EGovAPIClient:
         if law_id:
             params["law_id"] = law_id
 
-        response = await self._request("GET", "/keyword", params=params)
-        return response.json()  # type: ignore[no-any-return]
+        async def fetch() -> dict[str, Any]:
+            response = await self._request("GET", "/keyword", params=params)
+            return response.json()  # type: ignore[no-any-return]
+
+        return await self._coalesce("/keyword", params, fetch)
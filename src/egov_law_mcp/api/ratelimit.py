@@ -0,0 +1,289 @@
+"""レート制限（トークンバケット方式・AIMD方式）"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketRateLimiter:
+    """トークンバケット方式のレートリミッター
+
+    - `rate`: 1秒あたりに補充されるトークン数（定常状態のリクエスト数/秒）
+    - `burst`: バケット容量（瞬間的に許容するリクエスト数）
+    - `max_concurrency`: 同時に実行中にできるリクエスト数
+
+    トークンは同期的に予約してからロック外で待機するため、
+    待機中の呼び出しが他の呼び出しをブロックすることはありません。
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.max_concurrency = max_concurrency
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._in_flight = 0
+        # asyncio.Semaphore はイベントループに紐づくため、ループごとに作り直す
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore | None:
+        """現在のイベントループ用のセマフォを取得"""
+        if self.max_concurrency is None:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    def _reserve(self) -> float:
+        """トークンを1つ予約し、必要な待機秒数を返す"""
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+        self._tokens -= 1.0
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+    async def wait(self) -> None:
+        """トークンが利用可能になるまで待機"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """同時実行枠とトークンを確保する
+
+        Example:
+            async with limiter.acquire():
+                response = await http_client.get(url)
+        """
+        semaphore = self._get_semaphore()
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            await self.wait()
+            self._in_flight += 1
+            try:
+                yield
+            finally:
+                self._in_flight -= 1
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    # トークンバケットは固定レートのため、リクエスト結果は使用しない
+    def record_success(self, latency: float) -> None:
+        """成功を記録（何もしない）"""
+
+    def record_overload(self) -> None:
+        """過負荷（429・タイムアウト）を記録（何もしない）"""
+
+    def record_error(self) -> None:
+        """その他のエラーを記録（何もしない）"""
+
+    def stats(self) -> dict[str, str | float | int | None]:
+        """現在の状態を取得"""
+        return {
+            "mode": "token_bucket",
+            "rate": self.rate,
+            "burst": self.burst,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "tokens": round(self._tokens, 3),
+        }
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD（加算増加・乗算減少）方式で同時実行数を自動調整するリミッター
+
+    - 応答が速くエラー率が低い間は、完了1件ごとに `1 / limit` ずつ上限を増やす
+      （おおむね1往復ごとに +1）
+    - 429やタイムアウトを受けたら上限を `decrease_factor` 倍に減らす
+      （同時に失敗した複数のリクエストで何重にも減らさないよう、1往復に1回まで）
+    - 応答時間が `latency_target` を超えた場合は緩やかに減らす
+
+    `rate` を指定すると、同時実行数に加えてトークンバケットで秒間リクエスト数も制限します。
+    """
+
+    def __init__(
+        self,
+        min_limit: int = 1,
+        max_limit: int = 20,
+        initial_limit: int = 5,
+        latency_target: float = 2.0,
+        decrease_factor: float = 0.5,
+        error_rate_threshold: float = 0.1,
+        rate: float | None = None,
+        burst: int | None = None,
+    ) -> None:
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("require 1 <= min_limit <= max_limit")
+        if not min_limit <= initial_limit <= max_limit:
+            clamped = min(max(initial_limit, min_limit), max_limit)
+            logger.warning(
+                "Initial concurrency limit %d is outside [%d, %d]; using %d",
+                initial_limit,
+                min_limit,
+                max_limit,
+                clamped,
+            )
+            initial_limit = clamped
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.error_rate_threshold = error_rate_threshold
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._latency_ewma: float | None = None
+        self._error_rate = 0.0
+        self._last_decrease = float("-inf")
+        self._condition: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._bucket = TokenBucketRateLimiter(rate, burst=burst) if rate is not None else None
+
+    @property
+    def limit(self) -> int:
+        """現在の同時実行数の上限"""
+        return int(self._limit)
+
+    def _get_condition(self) -> asyncio.Condition:
+        """現在のイベントループ用の条件変数を取得"""
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """同時実行枠を確保する"""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        try:
+            if self._bucket is not None:
+                await self._bucket.wait()
+            yield
+        finally:
+            self._in_flight -= 1
+            async with condition:
+                condition.notify_all()
+
+    def _update_error_rate(self, failed: bool) -> None:
+        self._error_rate = 0.9 * self._error_rate + 0.1 * (1.0 if failed else 0.0)
+
+    def _decrease(self, factor: float) -> None:
+        """上限を乗算で減らす（1往復に1回まで）"""
+        now = time.monotonic()
+        window = self._latency_ewma if self._latency_ewma is not None else self.latency_target
+        if now - self._last_decrease < window:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self.min_limit), self._limit * factor)
+
+    def record_success(self, latency: float) -> None:
+        """成功を記録し、条件が良ければ上限を増やす"""
+        self._update_error_rate(False)
+        if self._latency_ewma is None:
+            self._latency_ewma = latency
+        else:
+            self._latency_ewma = 0.8 * self._latency_ewma + 0.2 * latency
+
+        if latency > self.latency_target:
+            self._decrease(0.9)
+        elif self._error_rate < self.error_rate_threshold:
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+    def record_overload(self) -> None:
+        """過負荷（429・タイムアウト）を記録し、上限を乗算で減らす"""
+        self._update_error_rate(True)
+        self._decrease(self.decrease_factor)
+
+    def record_error(self) -> None:
+        """その他のエラーを記録（エラー率が高い間は上限を増やさない）"""
+        self._update_error_rate(True)
+
+    def stats(self) -> dict[str, str | float | int | None]:
+        """現在の状態を取得"""
+        return {
+            "mode": "adaptive",
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self._in_flight,
+            "latency_ewma": (
+                round(self._latency_ewma, 3) if self._latency_ewma is not None else None
+            ),
+            "error_rate": round(self._error_rate, 3),
+            "rate": self._bucket.rate if self._bucket is not None else None,
+        }
+
+
+# EGovAPIClient が受け付けるリミッター
+RateLimiter = TokenBucketRateLimiter | AdaptiveConcurrencyLimiter
+
+# 設定ごとに共有されるリミッター
+_limiters: dict[tuple[float, int | None, int | None], TokenBucketRateLimiter] = {}
+
+
+def get_rate_limiter(
+    rate: float,
+    burst: int | None = None,
+    max_concurrency: int | None = None,
+) -> TokenBucketRateLimiter:
+    """プロセス共有のレートリミッターを取得
+
+    同じ設定で呼び出した場合は同じインスタンスを返すため、
+    `EGovAPIClient` をいくつ生成してもレート制限はプロセス全体で守られます。
+    """
+    key = (float(rate), burst, max_concurrency)
+    limiter = _limiters.get(key)
+    if limiter is None:
+        limiter = TokenBucketRateLimiter(rate, burst=burst, max_concurrency=max_concurrency)
+        _limiters[key] = limiter
+    return limiter
+
+
+_adaptive_limiters: dict[
+    tuple[int, int, int, float | None, int | None], AdaptiveConcurrencyLimiter
+] = {}
+
+
+def get_adaptive_limiter(
+    min_limit: int = 1,
+    max_limit: int = 20,
+    initial_limit: int = 5,
+    rate: float | None = None,
+    burst: int | None = None,
+) -> AdaptiveConcurrencyLimiter:
+    """プロセス共有のAIMDリミッターを取得"""
+    key = (min_limit, max_limit, initial_limit, rate, burst)
+    limiter = _adaptive_limiters.get(key)
+    if limiter is None:
+        limiter = AdaptiveConcurrencyLimiter(
+            min_limit=min_limit,
+            max_limit=max_limit,
+            initial_limit=initial_limit,
+            rate=rate,
+            burst=burst,
+        )
+        _adaptive_limiters[key] = limiter
+    return limiter
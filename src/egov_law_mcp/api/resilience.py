@@ -0,0 +1,174 @@
+"""リトライとサーキットブレーカー"""
+
+import logging
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from enum import Enum
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After ヘッダを秒数に変換
+
+    秒数形式（`120`）とHTTP日付形式（`Wed, 21 Oct 2015 07:28:00 GMT`）の両方に対応します。
+
+    Returns:
+        待機秒数。解釈できない場合はNone。
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+@dataclass
+class RetryPolicy:
+    """指数バックオフ（フルジッター）によるリトライ方針
+
+    Attributes:
+        max_retries: 最大リトライ回数（0でリトライしない）
+        backoff_base: バックオフの基準秒数
+        backoff_max: バックオフの上限秒数
+        retry_after_max: Retry-After をこの秒数まで待つ（超える場合はリトライしない）
+    """
+
+    max_retries: int = 2
+    backoff_base: float = 0.2
+    backoff_max: float = 5.0
+    retry_after_max: float = 30.0
+
+    def compute_delay(self, attempt: int, retry_after: float | None = None) -> float | None:
+        """次のリトライまでの待機秒数を計算
+
+        Args:
+            attempt: これまでの試行回数（0始まり）
+            retry_after: サーバーが指定した待機秒数
+
+        Returns:
+            待機秒数。リトライすべきでない場合はNone。
+        """
+        if attempt >= self.max_retries:
+            return None
+        if retry_after is not None:
+            if retry_after > self.retry_after_max:
+                return None
+            return retry_after
+        ceiling = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return random.uniform(0, ceiling)
+
+
+class CircuitState(str, Enum):
+    """サーキットブレーカーの状態"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """サーキットブレーカー
+
+    連続失敗が `failure_threshold` に達するとオープンになり、
+    `recovery_timeout` 秒間はリクエストを即座に失敗させます。
+    その後ハーフオープンとなり、1件の試行が成功すればクローズに戻ります。
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._total_failures = 0
+        self._total_rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """現在の状態（オープンの期限切れはハーフオープンとして扱う）"""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: CircuitState) -> None:
+        if state != self._state:
+            logger.warning("e-Gov API circuit breaker: %s -> %s", self._state.value, state.value)
+            self._state = state
+
+    def retry_in(self) -> float:
+        """オープン状態が解除されるまでの秒数"""
+        if self._state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        """リクエストを送ってよいか判定"""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self._total_rejected += 1
+        return False
+
+    def release_probe(self) -> None:
+        """結果を記録せずに終わった試行（キャンセルなど）の枠を返す"""
+        if self._state == CircuitState.HALF_OPEN:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        """成功を記録"""
+        self._failures = 0
+        self._probe_in_flight = False
+        self._transition(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        """失敗を記録"""
+        self._failures += 1
+        self._total_failures += 1
+        self._probe_in_flight = False
+        if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._transition(CircuitState.OPEN)
+
+    def stats(self) -> dict[str, str | int | float]:
+        """監視用の状態を取得"""
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._failures,
+            "total_failures": self._total_failures,
+            "total_rejected": self._total_rejected,
+            "retry_in": round(self.retry_in(), 3),
+        }
+
+
+# ベースURLごとに共有されるブレーカー
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(
+    base_url: str,
+    failure_threshold: int = 5,
+    recovery_timeout: float = 30.0,
+) -> CircuitBreaker:
+    """プロセス共有のサーキットブレーカーを取得（ベースURL単位）"""
+    breaker = _breakers.get(base_url)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            failure_threshold=failure_threshold, recovery_timeout=recovery_timeout
+        )
+        _breakers[base_url] = breaker
+    return breaker
@@ -0,0 +1,59 @@
+"""同一リクエストの合流（single-flight）"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """実行中の同一リクエストを1つにまとめる
+
+    同じキーで同時に呼び出された場合、最初の呼び出しだけが実際に処理を実行し、
+    残りの呼び出しはその結果（または例外）を共有します。
+    完了したキーは即座に登録解除されるため、結果そのものはキャッシュしません。
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future[Any]] = {}
+
+    def _forget(self, key: Hashable, future: asyncio.Future[Any]) -> None:
+        """完了したリクエストを登録解除"""
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        # 待機者が全員キャンセルされた場合でも警告が出ないよう例外を回収
+        if not future.cancelled():
+            future.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """キーが同じ実行中の処理があれば合流し、無ければ `fn` を実行する
+
+        Args:
+            key: リクエストを識別するキー
+            fn: 実際の処理（コルーチンを返す関数）
+
+        Returns:
+            `fn` の結果
+        """
+        loop = asyncio.get_running_loop()
+        future = self._calls.get(key)
+        if future is None or future.get_loop() is not loop:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+        # 1人の呼び出し元がキャンセルされても共有処理は継続させる
+        return await asyncio.shield(future)  # type: ignore[no-any-return]
+
+    def in_flight(self) -> int:
+        """実行中のリクエスト数"""
+        return len(self._calls)
+
+
+# プロセス共有のレジストリ
+_default_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """プロセス共有のsingle-flightレジストリを取得"""
+    return _default_single_flight
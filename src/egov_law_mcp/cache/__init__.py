@@ -1,5 +1,21 @@
 """cache パッケージ"""
 
-from .manager import CacheManager
+from .backend import CacheBackend
+from .gc import BackendCollector, FileCacheCollector
+from .manager import CacheManager, LawDataEntry, LawDataWriter, compute_content_hash
+from .redis import RedisStore
+from .sqlite import SQLiteStore
+from .sync import CacheSyncer
 
-__all__ = ["CacheManager"]
+__all__ = [
+    "BackendCollector",
+    "CacheBackend",
+    "CacheManager",
+    "CacheSyncer",
+    "FileCacheCollector",
+    "LawDataEntry",
+    "LawDataWriter",
+    "RedisStore",
+    "SQLiteStore",
+    "compute_content_hash",
+]
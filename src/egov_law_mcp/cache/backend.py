@@ -0,0 +1,96 @@
+"""キャッシュの永続層のインターフェース"""
+
+from typing import Any, Protocol
+
+
+class CacheBackend(Protocol):
+    """メモリキャッシュの背後に置く永続層（SQLite・Redisなど）
+
+    エントリはカテゴリ（"law_data", "blob", "search", "revisions"）とキーで識別し、
+    値はバイト列で受け渡します（圧縮は実装側で行う）。"blob" は本文ハッシュをキーとする
+    法令本文で、"law_data" のエントリは `content_hash` でこれを参照します。
+    実装は参照されている "blob" を参照元より先に消してはいけません。
+    `get` / `get_many` は `value`（展開済みのバイト列）, `created_at`, `expires_at`,
+    `law_id`, `etag`, `last_modified`, `content_hash` を持つdictを返します。
+    メソッドは `CacheManager` の専用スレッドから呼ばれるため、ブロッキングI/Oで構いません。
+    """
+
+    def get(self, category: str, key: str) -> dict[str, Any] | None:
+        """エントリを取得（期限切れも含む）"""
+        ...
+
+    def get_many(self, category: str, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """複数のエントリをまとめて取得（見つかったものだけを返す）"""
+        ...
+
+    def exists(self, category: str, key: str) -> bool:
+        """エントリがあるか（値は読まない）"""
+        ...
+
+    def put(
+        self,
+        category: str,
+        key: str,
+        value: bytes,
+        expires_at: float,
+        law_id: str | None = None,
+        keyword: str | None = None,
+        law_ids: list[str] | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        content_hash: str | None = None,
+    ) -> None:
+        """エントリを保存（同じキーは置き換え）"""
+        ...
+
+    def put_law_data(
+        self,
+        key: str,
+        content: bytes,
+        content_hash: str,
+        expires_at: float,
+        law_id: str | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """法令本文（"blob"）と、それを参照する "law_data" のエントリをまとめて保存
+
+        実装は2つの書き込みの間に本文が消されないようにしなければなりません。
+        """
+        ...
+
+    def touch(self, category: str, key: str, expires_at: float) -> bool:
+        """エントリの期限を延長"""
+        ...
+
+    def delete(self, category: str, key: str) -> None:
+        """エントリを削除"""
+        ...
+
+    def delete_law(self, law_id: str, law_title: str | None = None) -> int:
+        """法令に関連するエントリ（法令本文・改正履歴・検索結果）を削除"""
+        ...
+
+    def purge_expired(self, now: float | None = None) -> int:
+        """期限切れのエントリを削除（`BackendCollector` が定期的に呼ぶ）"""
+        ...
+
+    def clear(self) -> None:
+        """全エントリを削除（メタデータは残す）"""
+        ...
+
+    def count(self, category: str) -> int:
+        """カテゴリのエントリ数（統計用のため走査せずに返す）"""
+        ...
+
+    def get_meta(self, name: str) -> str | None:
+        """メタデータを取得"""
+        ...
+
+    def set_meta(self, name: str, value: str) -> None:
+        """メタデータを保存"""
+        ...
+
+    def close(self) -> None:
+        """接続を閉じる"""
+        ...
@@ -0,0 +1,173 @@
+"""ファイルキャッシュのバイナリ形式
+
+1エントリ1ファイルで、次のレイアウトで保存します。
+
+    MAGIC | zlib圧縮した本文 | ヘッダ(JSON) | ヘッダ長(4バイト, ビッグエンディアン)
+
+ヘッダを末尾に置くことで、本文を圧縮しながら逐次書き出し、最後にハッシュなどを
+確定して書き込めます。読み込み時は末尾からヘッダだけを読んでTTLを判定できるため、
+期限切れのエントリを展開する必要はありません。
+書き込みは一時ファイルに行い、完了後に `os.replace` で置き換えます。
+法令本文は本文ハッシュ単位のファイルに書き、キーごとのファイルはヘッダのみ
+（本文は空）としてハッシュで参照します。
+"""
+
+import json
+import os
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+from typing import IO, Any
+
+MAGIC = b"EGLC\x01"
+_HEADER_LENGTH = struct.Struct(">I")
+COMPRESSION_LEVEL = 6
+
+
+class CorruptEntryError(Exception):
+    """ファイルキャッシュのエントリが壊れている"""
+
+
+def _open_temp(path: Path) -> tuple[Path, IO[bytes]]:
+    """書き込み用の一時ファイルを作る
+
+    同じキーへの書き込みが同時に行われても衝突しないよう、書き込みごとに
+    一意な名前（`{name}.xxxxxxxx.tmp`）で作成します。
+    """
+    fd, name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    return Path(name), os.fdopen(fd, "wb")
+
+
+class BinaryEntryWriter:
+    """エントリを圧縮しながら一時ファイルに書き出す"""
+
+    def __init__(self, path: Path, level: int = COMPRESSION_LEVEL) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path, file = _open_temp(path)
+        self._file: IO[bytes] | None = file
+        self._file.write(MAGIC)
+        self._compressor = zlib.compressobj(level)
+
+    def write(self, chunk: bytes) -> None:
+        """本文のチャンクを書き込む"""
+        if self._file is not None:
+            self._file.write(self._compressor.compress(chunk))
+
+    def commit(self, header: dict[str, Any], path: Path | None = None) -> None:
+        """ヘッダを書き込んで確定する
+
+        Args:
+            header: ヘッダ
+            path: 保存先（未指定時は作成時のパス）。書き終えるまで決まらない場合に指定する
+        """
+        if self._file is None:
+            return
+        encoded = json.dumps(header).encode("utf-8")
+        self._file.write(self._compressor.flush())
+        self._file.write(encoded)
+        self._file.write(_HEADER_LENGTH.pack(len(encoded)))
+        self._file.close()
+        self._file = None
+        try:
+            if path is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self._tmp_path, path or self.path)
+        except BaseException:
+            self._tmp_path.unlink(missing_ok=True)
+            raise
+
+    def abort(self) -> None:
+        """書き込みを中止して一時ファイルを削除する"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def _read_header(file: IO[bytes]) -> tuple[dict[str, Any], int]:
+    """ヘッダと、本文の終了位置を返す"""
+    size = file.seek(0, os.SEEK_END)
+    if size < len(MAGIC) + _HEADER_LENGTH.size:
+        raise CorruptEntryError("file too short")
+    file.seek(0)
+    if file.read(len(MAGIC)) != MAGIC:
+        raise CorruptEntryError("bad magic")
+    file.seek(size - _HEADER_LENGTH.size)
+    (length,) = _HEADER_LENGTH.unpack(file.read(_HEADER_LENGTH.size))
+    payload_end = size - _HEADER_LENGTH.size - length
+    if payload_end < len(MAGIC):
+        raise CorruptEntryError("bad header length")
+    file.seek(payload_end)
+    try:
+        header = json.loads(file.read(length))
+    except ValueError as e:
+        raise CorruptEntryError("bad header") from e
+    if not isinstance(header, dict):
+        raise CorruptEntryError("bad header")
+    return header, payload_end
+
+
+def read_header(path: Path) -> dict[str, Any]:
+    """ヘッダだけを読む（本文は展開しない）
+
+    Raises:
+        CorruptEntryError: エントリが壊れている
+        OSError: ファイルを読めない
+    """
+    with path.open("rb") as file:
+        header, _ = _read_header(file)
+    return header
+
+
+def read_entry(path: Path) -> tuple[dict[str, Any], str]:
+    """ヘッダと本文を読む
+
+    Raises:
+        CorruptEntryError: エントリが壊れている
+        OSError: ファイルを読めない
+    """
+    with path.open("rb") as file:
+        header, payload_end = _read_header(file)
+        file.seek(len(MAGIC))
+        compressed = file.read(payload_end - len(MAGIC))
+    try:
+        raw = zlib.decompress(compressed)
+    except zlib.error as e:
+        raise CorruptEntryError("bad payload") from e
+    if header.get("size") is not None and header["size"] != len(raw):
+        raise CorruptEntryError("size mismatch")
+    try:
+        return header, raw.decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise CorruptEntryError("bad payload encoding") from e
+
+
+def write_header_only(path: Path, header: dict[str, Any]) -> None:
+    """本文の無いエントリ（ヘッダのみ）を書き込む"""
+    BinaryEntryWriter(path).commit(header)
+
+
+def rewrite_header(path: Path, header: dict[str, Any]) -> None:
+    """本文はそのままにヘッダだけを書き換える（一時ファイル経由）
+
+    Raises:
+        CorruptEntryError: エントリが壊れている
+        OSError: ファイルを読み書きできない
+    """
+    with path.open("rb") as file:
+        _, payload_end = _read_header(file)
+        file.seek(0)
+        body = file.read(payload_end)
+    encoded = json.dumps(header).encode("utf-8")
+    tmp_path, tmp_file = _open_temp(path)
+    try:
+        with tmp_file:
+            tmp_file.write(body)
+            tmp_file.write(encoded)
+            tmp_file.write(_HEADER_LENGTH.pack(len(encoded)))
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,56 @@
+"""法令本文の内容アドレス方式の保存
+
+法令ID・法令履歴ID・asof違いなど、異なるキーが同じXMLを指すことが多いため、
+本文は本文ハッシュをキーに1つだけ保存し、各キーからはハッシュで参照します。
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from cachetools import LRUCache
+
+
+class BlobCache(LRUCache):  # type: ignore[type-arg]
+    """本文ハッシュ -> 法令本文のLRUキャッシュ
+
+    本文ごとに参照しているキーを記録し（参照カウント）、参照が無くなった本文は削除します。
+    容量超過で本文を追い出すと、参照していたキーもまとめて `on_evict` に渡します。
+    """
+
+    def __init__(
+        self,
+        maxsize: float,
+        getsizeof: Callable[[Any], float] | None = None,
+        on_evict: Callable[[set[str]], None] | None = None,
+    ) -> None:
+        super().__init__(maxsize=maxsize, getsizeof=getsizeof)
+        self.on_evict = on_evict
+        # 本文ハッシュ -> 参照しているキー
+        self.refs: dict[str, set[str]] = {}
+
+    def link(self, key: str, content_hash: str) -> None:
+        """キーから本文への参照を追加"""
+        self.refs.setdefault(content_hash, set()).add(key)
+
+    def unlink(self, key: str, content_hash: str) -> None:
+        """キーから本文への参照を外し、参照が無くなれば本文を削除"""
+        keys = self.refs.get(content_hash)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del self.refs[content_hash]
+            self.pop(content_hash, None)
+
+    def popitem(self) -> tuple[str, str]:
+        """最も古い本文を追い出し、参照していたキーを通知"""
+        content_hash, content = super().popitem()
+        keys = self.refs.pop(content_hash, set())
+        if keys and self.on_evict is not None:
+            self.on_evict(keys)
+        return content_hash, content
+
+    def clear(self) -> None:
+        # 参照を先に消し、追い出しの通知を出さない
+        self.refs.clear()
+        super().clear()
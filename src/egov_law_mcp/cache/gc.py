@@ -0,0 +1,184 @@
+"""キャッシュのバックグラウンドGC（ファイルキャッシュ・永続層）"""
+
+import asyncio
+import contextlib
+import logging
+import os
+from pathlib import Path
+
+from .manager import CacheManager
+
+logger = logging.getLogger(__name__)
+
+
+class FileCacheCollector:
+    """ファイルキャッシュの容量を一定以下に保つバックグラウンドGC
+
+    シャード（サブディレクトリ）を1つずつ別スレッドで走査するため、
+    ツール呼び出しを止めることはありません。
+
+    1. 検証子の無い期限切れエントリ・壊れたエントリ・古い一時ファイルを削除
+    2. どのエントリからも参照されなくなった本文を削除
+    3. 合計サイズが `max_bytes` を超えていれば、最終利用日時の古いものから
+       `low_water` の割合まで削除
+    """
+
+    DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1GiB
+    DEFAULT_INTERVAL = 600.0  # 10分
+    LOW_WATER = 0.9
+
+    def __init__(
+        self,
+        cache: CacheManager,
+        max_bytes: int | None = None,
+        interval: float | None = None,
+        low_water: float = LOW_WATER,
+    ) -> None:
+        """
+        Args:
+            cache: 対象のキャッシュマネージャー
+            max_bytes: ファイルキャッシュの最大サイズ（バイト）
+            interval: GCの間隔（秒）。0以下で無効
+            low_water: 容量超過時に、最大サイズのこの割合まで削除する
+        """
+        self.cache = cache
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else int(os.getenv("CACHE_MAX_DISK_BYTES", str(self.DEFAULT_MAX_BYTES)))
+        )
+        self.interval = (
+            interval
+            if interval is not None
+            else float(os.getenv("CACHE_GC_INTERVAL", str(self.DEFAULT_INTERVAL)))
+        )
+        self.low_water = low_water
+        self._task: asyncio.Task[None] | None = None
+
+    @staticmethod
+    def _evict(paths: list[Path]) -> None:
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    async def collect(self) -> int:
+        """GCを1回実行
+
+        Returns:
+            削除後のファイルキャッシュの合計サイズ（バイト）
+        """
+        survivors: list[tuple[float, int, Path]] = []
+        referenced: set[str] = set()
+        for shard in await asyncio.to_thread(self.cache.iter_file_shards):
+            survivors.extend(
+                await asyncio.to_thread(self.cache.sweep_file_shard, shard, referenced=referenced)
+            )
+            # シャードごとにイベントループへ制御を返す
+            await asyncio.sleep(0)
+        for shard in await asyncio.to_thread(self.cache.iter_blob_shards):
+            survivors.extend(
+                await asyncio.to_thread(self.cache.sweep_blob_shard, shard, referenced)
+            )
+            await asyncio.sleep(0)
+
+        total = sum(size for _, size, _ in survivors)
+        if total <= self.max_bytes:
+            return total
+
+        target = int(self.max_bytes * self.low_water)
+        victims: list[Path] = []
+        for _, size, path in sorted(survivors, key=lambda item: item[0]):
+            if total <= target:
+                break
+            victims.append(path)
+            total -= size
+
+        # 一度に大量に削除しないよう、少しずつ削除する
+        for i in range(0, len(victims), 100):
+            await asyncio.to_thread(self._evict, victims[i : i + 100])
+            await asyncio.sleep(0)
+        logger.info("File cache GC evicted %d entries", len(victims))
+        return total
+
+    async def run(self) -> None:
+        """`interval` 秒ごとにGCを繰り返す"""
+        while True:
+            try:
+                await self.collect()
+            except OSError as e:
+                logger.warning("File cache GC failed: %s", e)
+            except Exception:
+                # 想定外のエラーでもGC自体は止めない
+                logger.exception("File cache GC failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """バックグラウンドでGCを開始（ファイルキャッシュ以外・間隔が0以下なら何もしない）"""
+        if self.cache.cache_type != "file" or self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """バックグラウンドのGCを停止"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+
+class BackendCollector:
+    """永続層（SQLite・Redis）の期限切れエントリを定期的に削除するバックグラウンドGC
+
+    削除や法令インデックスの掃除はキーの走査を伴うため、書き込みのたびではなく
+    ここでまとめて行います。処理は永続層のスレッドで行い、ツール呼び出しを止めません。
+    """
+
+    DEFAULT_INTERVAL = FileCacheCollector.DEFAULT_INTERVAL
+
+    def __init__(self, cache: CacheManager, interval: float | None = None) -> None:
+        """
+        Args:
+            cache: 対象のキャッシュマネージャー
+            interval: GCの間隔（秒）。0以下で無効
+        """
+        self.cache = cache
+        self.interval = (
+            interval
+            if interval is not None
+            else float(os.getenv("CACHE_GC_INTERVAL", str(self.DEFAULT_INTERVAL)))
+        )
+        self._task: asyncio.Task[None] | None = None
+
+    async def collect(self) -> int:
+        """GCを1回実行
+
+        Returns:
+            削除したエントリ数
+        """
+        return await self.cache.apurge_expired()
+
+    async def run(self) -> None:
+        """`interval` 秒ごとにGCを繰り返す"""
+        while True:
+            try:
+                await self.collect()
+            except Exception:
+                # 想定外のエラーでもGC自体は止めない
+                logger.exception("Cache backend GC failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """バックグラウンドでGCを開始（永続層が無い・間隔が0以下なら何もしない）"""
+        if not self.cache.has_backend or self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """バックグラウンドのGCを停止"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
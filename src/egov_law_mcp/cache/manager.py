@@ -1,12 +1,211 @@
 """キャッシュマネージャー"""
 
+import asyncio
+import contextlib
 import hashlib
 import json
+import logging
 import os
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
-from cachetools import TTLCache
+from cachetools import Cache, LRUCache, TTLCache
+
+from .backend import CacheBackend
+from .binfile import (
+    BinaryEntryWriter,
+    CorruptEntryError,
+    read_entry,
+    read_header,
+    rewrite_header,
+    write_header_only,
+)
+from .blobs import BlobCache
+from .redis import RedisStore
+from .sqlite import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def compute_content_hash(content: str) -> str:
+    """法令本文のハッシュ（派生データのキャッシュキーに使用）"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class LawDataEntry:
+    """法令本文キャッシュのエントリ
+
+    期限切れ後も条件付きGET（If-None-Match / If-Modified-Since）に使えるよう、
+    本文と検証子（ETag / Last-Modified）を保持します。
+    """
+
+    content: str
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str = ""
+    # ファイルキャッシュの最終利用日時（mtime）を最後に更新した時刻
+    touched_at: float = 0.0
+
+    @property
+    def is_fresh(self) -> bool:
+        """TTL内かどうか"""
+        return time.time() < self.expires_at
+
+    def is_within(self, grace: float) -> bool:
+        """TTLを過ぎてから `grace` 秒以内かどうか（TTL内も含む）"""
+        return time.time() < self.expires_at + grace
+
+    @property
+    def has_validators(self) -> bool:
+        """条件付きGETに使える検証子を持っているか"""
+        return self.etag is not None or self.last_modified is not None
+
+
+def payload_size(value: Any) -> int:
+    """キャッシュする値のメモリ上のサイズ（バイト）を見積もる
+
+    文字列はPython上の実サイズ、dict/listは中身を再帰的に合計します。
+    """
+    if isinstance(value, LawDataEntry):
+        return (
+            sys.getsizeof(value.content)
+            + payload_size(value.etag)
+            + payload_size(value.last_modified)
+            + sys.getsizeof(value.content_hash)
+        )
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            payload_size(k) + payload_size(v) for k, v in value.items()
+        )
+    if isinstance(value, list | tuple):
+        return sys.getsizeof(value) + sum(payload_size(v) for v in value)
+    if value is None:
+        return 0
+    return sys.getsizeof(value)
+
+
+class LawDataWriter:
+    """法令本文のストリーミング書き込み
+
+    ダウンロード中のチャンクを受け取り、ハッシュの計算とファイルキャッシュへの圧縮を
+    逐次行います。`commit()` で確定してメモリキャッシュに載せ、`abort()` で書きかけの
+    データを破棄します。本文は本文ハッシュ単位で保存し、同じ本文が保存済みなら書き込んだ
+    ものは捨てて共有します。
+
+    メモリキャッシュには文字列として載せるため、受け取ったチャンクは1つのバッファに
+    まとめて保持し、`commit()` で一度だけデコードしてから解放します
+    （永続層へはワーカースレッド側で文字列からエンコードし直して渡す）。
+    """
+
+    def __init__(
+        self,
+        cache: "CacheManager",
+        key: str,
+        law_id: str,
+        asof: str | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        revision_id: str | None = None,
+    ) -> None:
+        self._cache = cache
+        self._key = key
+        self._law_id = law_id
+        self._asof = asof
+        self._revision_id = revision_id
+        self._etag = etag
+        self._last_modified = last_modified
+        self._buffer = bytearray()
+        self._hash = hashlib.sha256()
+        self._size = 0
+        self._file: BinaryEntryWriter | None = None
+
+        if cache.cache_type == "file":
+            # 書きかけのファイルが読まれないよう一時ファイルに書き出す
+            self._file = BinaryEntryWriter(cache._get_file_path(key))
+
+    def write(self, chunk: bytes) -> None:
+        """チャンクを書き込む"""
+        self._buffer += chunk
+        self._hash.update(chunk)
+        self._size += len(chunk)
+        if self._file is not None:
+            self._file.write(chunk)
+
+    def commit(self) -> str:
+        """書き込みを確定し、法令本文を返す"""
+        content = self._buffer.decode("utf-8")
+        self._buffer = bytearray()
+        created_at = time.time()
+        content_hash = self._hash.hexdigest()
+
+        if self._file is not None:
+            blob_path = self._cache._get_blob_path(content_hash)
+            if blob_path.exists():
+                # 同じ本文が保存済み（最終利用日時だけ更新する）
+                self._file.abort()
+                with contextlib.suppress(OSError):
+                    os.utime(blob_path)
+            else:
+                self._file.commit({"content_hash": content_hash, "size": self._size}, blob_path)
+            self._file = None
+            # キーごとのファイルにはヘッダのみを書き、本文はハッシュで参照する
+            write_header_only(
+                self._cache._get_file_path(self._key),
+                {
+                    "law_id": self._law_id,
+                    "asof": self._asof,
+                    "revision_id": self._revision_id,
+                    "created_at": created_at,
+                    "etag": self._etag,
+                    "last_modified": self._last_modified,
+                    "content_hash": content_hash,
+                    "blob": True,
+                },
+            )
+
+        backend = self._cache._backend
+        if backend is not None:
+            expires_at = created_at + self._cache.DEFAULT_LAW_DATA_TTL
+
+            def put() -> None:
+                # 本文は参照元が残っている間は残す（消し方は永続層ごとに管理）
+                backend.put_law_data(
+                    self._key,
+                    content.encode("utf-8"),
+                    content_hash,
+                    expires_at=expires_at,
+                    law_id=self._law_id,
+                    etag=self._etag,
+                    last_modified=self._last_modified,
+                )
+
+            self._cache._backend_write(put)
+
+        self._cache._store_law_data_entry(
+            self._key,
+            content,
+            etag=self._etag,
+            last_modified=self._last_modified,
+            created_at=created_at,
+            content_hash=content_hash,
+        )
+        return content
+
+    def abort(self) -> None:
+        """書き込みを中止する"""
+        self._buffer = bytearray()
+        if self._file is not None:
+            self._file.abort()
+            self._file = None
 
 
 class CacheManager:
@@ -15,44 +214,183 @@ class CacheManager:
     法令データのキャッシュを管理します。
     - メモリキャッシュ（デフォルト）
     - ファイルキャッシュ（オプション）
+    - 永続層（SQLite・Redis。メモリキャッシュの背後に置く `CacheBackend`）
+
+    永続層の読み書きは専用スレッドで順に実行し、イベントループを止めません。
+    書き込みは完了を待たずに返り（イベントループ外からの呼び出しでは待つ）、
+    ツールからの読み込みには `aget_law_data_entry` などの非同期版を使います。
+    永続層のエラーはログに残してキャッシュミスとして扱います。
     """
 
     # デフォルトTTL（秒）
     DEFAULT_LAW_DATA_TTL = 86400  # 24時間
     DEFAULT_SEARCH_TTL = 3600  # 1時間
     DEFAULT_REVISIONS_TTL = 21600  # 6時間
+    DEFAULT_NEGATIVE_TTL = 300  # 5分
+    # 期限切れの法令本文を返してよい期間（秒）
+    DEFAULT_STALE_WHILE_REVALIDATE = 3600  # 1時間（バックグラウンドで更新しつつ返す）
+    DEFAULT_STALE_IF_ERROR = 86400  # 24時間（APIエラー時に返す）
+    # メモリから返したエントリのファイルの最終利用日時を更新する間隔（秒）
+    FILE_TOUCH_INTERVAL = 60.0
+
+    # メモリキャッシュのカテゴリ別デフォルト容量（バイト）
+    DEFAULT_MAX_BYTES: dict[str, int] = {
+        "law_data": 256 * 1024 * 1024,
+        "derived": 128 * 1024 * 1024,
+        "document": 256 * 1024 * 1024,
+        "search": 16 * 1024 * 1024,
+        "revisions": 16 * 1024 * 1024,
+        "negative": 1024 * 1024,
+    }
 
     def __init__(
         self,
         cache_type: str = "memory",
         cache_dir: str | None = None,
-        max_size: int = 1000,
+        max_bytes: int | None = None,
+        category_max_bytes: dict[str, int] | None = None,
+        backend: CacheBackend | None = None,
+        negative_ttl: float | None = None,
+        stale_while_revalidate: float | None = None,
+        stale_if_error: float | None = None,
     ) -> None:
         """
         Args:
-            cache_type: "memory" または "file"
-            cache_dir: ファイルキャッシュのディレクトリ
-            max_size: メモリキャッシュの最大エントリ数
+            cache_type: "memory", "file", "sqlite" または "redis"
+            cache_dir: ファイルキャッシュ・SQLiteデータベースのディレクトリ
+            max_bytes: メモリキャッシュ全体の容量（バイト）。未指定時はカテゴリ別容量のみ
+            category_max_bytes: カテゴリ別の容量
+                （"law_data", "derived", "document", "search", "revisions", "negative"）
+            backend: 永続層（未指定時は `cache_type` に応じて作成）
+            negative_ttl: 「見つからない」結果のTTL（秒）
+            stale_while_revalidate: 期限切れの法令本文を、バックグラウンドで更新しつつ返す期間（秒）
+            stale_if_error: 期限切れの法令本文を、APIエラー時に返す期間（秒）
         """
         self.cache_type = os.getenv("CACHE_TYPE", cache_type)
         self.cache_dir = Path(os.getenv("CACHE_DIR", cache_dir or ".cache"))
-        self.max_size = max_size
+
+        # 容量はエントリ数ではなくバイト数で管理する
+        self.category_max_bytes = {
+            category: int(os.getenv(f"CACHE_{category.upper()}_MAX_BYTES", str(default)))
+            for category, default in self.DEFAULT_MAX_BYTES.items()
+        }
+        if category_max_bytes:
+            self.category_max_bytes.update(category_max_bytes)
+        global_max_bytes = os.getenv("CACHE_MAX_BYTES")
+        self.max_bytes = max_bytes or (int(global_max_bytes) if global_max_bytes else None)
+
+        # 法令本文のTTL（ソフトTTL）を過ぎても、この期間は期限切れとして返せる
+        self.stale_while_revalidate = (
+            stale_while_revalidate
+            if stale_while_revalidate is not None
+            else float(
+                os.getenv("CACHE_STALE_WHILE_REVALIDATE", str(self.DEFAULT_STALE_WHILE_REVALIDATE))
+            )
+        )
+        self.stale_if_error = (
+            stale_if_error
+            if stale_if_error is not None
+            else float(os.getenv("CACHE_STALE_IF_ERROR", str(self.DEFAULT_STALE_IF_ERROR)))
+        )
 
         # メモリキャッシュ（カテゴリ別）
-        self._law_data_cache: TTLCache[str, str] = TTLCache(
-            maxsize=max_size, ttl=self.DEFAULT_LAW_DATA_TTL
+        # 法令本文は本文ハッシュ単位で1つだけ持ち（容量もこちらで管理）、キーからは参照する
+        # 期限切れ後も再検証用に保持するため、TTLはエントリ側で管理する
+        self._law_data_blobs = BlobCache(
+            maxsize=self.category_max_bytes["law_data"],
+            getsizeof=payload_size,
+            on_evict=self._evict_law_data_keys,
         )
+        self._law_data_cache: dict[str, LawDataEntry] = {}
+        self._revalidated_count = 0
+        self._invalidated_count = 0
         self._search_cache: TTLCache[str, dict[str, Any]] = TTLCache(
-            maxsize=max_size, ttl=self.DEFAULT_SEARCH_TTL
+            maxsize=self.category_max_bytes["search"],
+            ttl=self.DEFAULT_SEARCH_TTL,
+            getsizeof=payload_size,
         )
         self._revisions_cache: TTLCache[str, dict[str, Any]] = TTLCache(
-            maxsize=max_size, ttl=self.DEFAULT_REVISIONS_TTL
+            maxsize=self.category_max_bytes["revisions"],
+            ttl=self.DEFAULT_REVISIONS_TTL,
+            getsizeof=payload_size,
+        )
+        # 法令ID -> {施行日時点: 法令履歴ID}
+        # 改正履歴の期限が切れても、施行日時点の法令本文のキャッシュを引けるようにする
+        self._revision_ids: LRUCache[str, dict[str, str]] = LRUCache(
+            maxsize=self.category_max_bytes["revisions"], getsizeof=payload_size
+        )
+
+        # 「見つからない」結果（ネガティブキャッシュ）
+        # 誤った法令ID・条番号の繰り返しをAPI呼び出しやパース無しで返すため、短いTTLで保持する
+        self.negative_ttl = (
+            negative_ttl
+            if negative_ttl is not None
+            else float(os.getenv("CACHE_NEGATIVE_TTL", str(self.DEFAULT_NEGATIVE_TTL)))
+        )
+        self._negative_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+            maxsize=self.category_max_bytes["negative"],
+            ttl=max(self.negative_ttl, 0.001),
+            getsizeof=payload_size,
+        )
+        self._negative_hits = 0
+
+        # 派生データ（Markdown・目次・条文）のキャッシュ
+        # キーに元XMLのハッシュを含むため、XMLが更新されれば自然に使われなくなる
+        self._derived_cache: LRUCache[str, str] = LRUCache(
+            maxsize=self.category_max_bytes["derived"], getsizeof=payload_size
+        )
+
+        # パース済みの法令XML（本文ハッシュ -> (文書, 見積もりサイズ)）
+        # 同じ法令の条文を続けて取得する際に、パースし直さずに済むようにする
+        self._document_cache: LRUCache[str, tuple[Any, int]] = LRUCache(
+            maxsize=self.category_max_bytes["document"], getsizeof=lambda item: item[1]
         )
 
+        # 法令単位の無効化用インデックス
+        # 法令ID -> 法令本文のキャッシュキー（asof違いを含む）
+        self._law_data_keys: dict[str, set[str]] = {}
+        # ファイルキャッシュのヘッダから `_law_data_keys` を読み込み済みか
+        # （再起動後も、asof・法令履歴ID違いのファイルを法令単位で無効化できるように）
+        self._file_law_data_indexed = False
+        # 検索結果のキャッシュキー -> (検索キーワード, 結果に含まれる法令ID)
+        self._search_index: dict[str, tuple[str, frozenset[str]]] = {}
+        # 法令ID -> ネガティブキャッシュのキー
+        self._negative_keys: dict[str, set[str]] = {}
+
         # ファイルキャッシュディレクトリ作成
         if self.cache_type == "file":
             self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+        # 永続層（メモリキャッシュの背後に置く）
+        self._metadata: dict[str, str] = {}
+        self._backend: CacheBackend | None = backend
+        if self._backend is None and self.cache_type == "sqlite":
+            self._backend = SQLiteStore(
+                Path(os.getenv("CACHE_SQLITE_PATH", str(self.cache_dir / "cache.sqlite3"))),
+                busy_timeout=float(
+                    os.getenv("CACHE_SQLITE_BUSY_TIMEOUT", str(SQLiteStore.DEFAULT_BUSY_TIMEOUT))
+                ),
+                stale_grace=self.stale_grace,
+            )
+        elif self._backend is None and self.cache_type == "redis":
+            self._backend = RedisStore.from_url(
+                os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+                prefix=os.getenv("REDIS_KEY_PREFIX", RedisStore.DEFAULT_PREFIX),
+                stale_grace=self.stale_grace,
+            )
+        # 永続層のI/O用のスレッド（1本で順に実行するため、読み込みは先の書き込みの後になる）
+        self._backend_io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="egov-law-cache")
+
+    @property
+    def has_backend(self) -> bool:
+        """永続層（SQLite・Redis）を使っているか"""
+        return self._backend is not None
+
+    @property
+    def stale_grace(self) -> float:
+        """検証子の無い法令本文を、TTLを過ぎても保持する期間（秒）"""
+        return max(self.stale_while_revalidate, self.stale_if_error, 0.0)
+
     def _get_cache_key(self, prefix: str, *args: Any, **kwargs: Any) -> str:
         """キャッシュキーを生成"""
         key_parts = [prefix, *[str(a) for a in args]]
@@ -61,42 +399,551 @@ class CacheManager:
         key_str = ":".join(key_parts)
         return hashlib.sha256(key_str.encode()).hexdigest()[:32]
 
+    def _memory_caches(self) -> dict[str, "Cache[str, Any]"]:
+        """カテゴリ名とメモリキャッシュの対応"""
+        return {
+            "law_data": self._law_data_blobs,
+            "derived": self._derived_cache,
+            "document": self._document_cache,
+            "search": self._search_cache,
+            "revisions": self._revisions_cache,
+            "negative": self._negative_cache,
+        }
+
+    def _put(self, cache: "Cache[str, Any]", key: str, value: Any) -> None:
+        """メモリキャッシュに保存し、全体の容量を超えたら追い出す
+
+        カテゴリの容量を単独で超える値はメモリには載せません。
+        全体の容量を超えた場合は、容量に対する使用率が最も高いカテゴリから
+        最も古いエントリを追い出します。
+        """
+        try:
+            cache[key] = value
+        except ValueError:
+            # 値が大きすぎる（cachetools は ValueError を送出する）
+            cache.pop(key, None)
+            return
+
+        if self.max_bytes is None:
+            return
+        caches = self._memory_caches()
+        while sum(c.currsize for c in caches.values()) > self.max_bytes:
+            _, victim = max(
+                caches.items(), key=lambda item: item[1].currsize / item[1].maxsize
+            )
+            if not victim:
+                break
+            victim.popitem()
+
     def _get_file_path(self, key: str) -> Path:
-        """ファイルキャッシュのパスを取得"""
-        return self.cache_dir / f"{key}.json"
+        """ファイルキャッシュのパスを取得
+
+        1ディレクトリのファイル数が増えすぎないよう、キーの先頭2文字で振り分けます。
+        """
+        return self.cache_dir / key[:2] / f"{key}.bin"
+
+    def _get_blob_path(self, content_hash: str) -> Path:
+        """ファイルキャッシュの本文（本文ハッシュ単位）のパスを取得"""
+        return self.cache_dir / "blobs" / content_hash[:2] / f"{content_hash}.blob"
+
+    # --- 永続層のI/O ---
+
+    @staticmethod
+    def _log_backend_error(future: "Future[Any]") -> None:
+        error = future.exception()
+        if error is not None:
+            logger.warning("Cache backend write failed: %s", error)
+
+    def _backend_write(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """永続層への書き込みを専用スレッドで実行（イベントループ上では完了を待たない）"""
+        future = self._backend_io.submit(fn, *args, **kwargs)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # 同期的な呼び出し元には書き込み済みの状態で返す（失敗はログに残すだけ）
+            future.exception()
+            self._log_backend_error(future)
+            return
+        future.add_done_callback(self._log_backend_error)
+
+    def _backend_call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T | None:
+        """永続層の処理を専用スレッドで実行して結果を待つ（失敗時はNone）"""
+        try:
+            return self._backend_io.submit(fn, *args, **kwargs).result()
+        except Exception as e:
+            logger.warning("Cache backend read failed: %s", e)
+            return None
+
+    async def _abackend_call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T | None:
+        """`_backend_call` の非同期版（イベントループを止めずに待つ）"""
+        try:
+            return await asyncio.wrap_future(self._backend_io.submit(fn, *args, **kwargs))
+        except Exception as e:
+            logger.warning("Cache backend read failed: %s", e)
+            return None
+
+    def flush(self) -> None:
+        """実行待ちの永続層への書き込みがすべて終わるまで待つ"""
+        self._backend_io.submit(lambda: None).result()
 
     # --- 法令本文キャッシュ ---
 
-    def get_law_data(self, law_id: str, asof: str | None = None) -> str | None:
-        """法令本文をキャッシュから取得"""
-        key = self._get_cache_key("law_data", law_id, asof=asof)
+    def _store_law_data_entry(
+        self,
+        key: str,
+        content: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        created_at: float | None = None,
+        content_hash: str | None = None,
+    ) -> LawDataEntry:
+        """法令本文をメモリキャッシュに載せる
 
-        # メモリキャッシュ確認
-        if key in self._law_data_cache:
-            return self._law_data_cache[key]
+        同じ本文がすでにあればそれを共有し、本文のコピーは持ちません。
+        本文が大きすぎてメモリに載らない場合は、エントリを返すだけで保持しません。
+        """
+        if created_at is None:
+            created_at = time.time()
+        content_hash = content_hash or compute_content_hash(content)
+        shared = self._law_data_blobs.get(content_hash)
+        if shared is None:
+            self._put(self._law_data_blobs, content_hash, content)
+        else:
+            content = shared
+        entry = LawDataEntry(
+            content=content,
+            expires_at=created_at + self.DEFAULT_LAW_DATA_TTL,
+            etag=etag,
+            last_modified=last_modified,
+            content_hash=content_hash,
+            # 書き込み・読み込みの直後はファイルの最終利用日時も新しい
+            touched_at=time.time(),
+        )
+
+        previous = self._law_data_cache.get(key)
+        if previous is not None and previous.content_hash != content_hash:
+            self._drop_law_data(key)
+        if content_hash in self._law_data_blobs:
+            self._law_data_cache[key] = entry
+            self._law_data_blobs.link(key, content_hash)
+        return entry
+
+    def _drop_law_data(self, key: str) -> LawDataEntry | None:
+        """法令本文のエントリをメモリから外す（参照が無くなった本文も削除）"""
+        entry = self._law_data_cache.pop(key, None)
+        if entry is not None:
+            self._law_data_blobs.unlink(key, entry.content_hash)
+        return entry
+
+    def _evict_law_data_keys(self, keys: set[str]) -> None:
+        """本文の追い出しに合わせて、参照していたエントリも外す"""
+        for key in keys:
+            self._law_data_cache.pop(key, None)
+
+    def _discard_file(self, file_path: Path, reason: str) -> None:
+        """使えないファイルキャッシュを削除"""
+        logger.warning("Discarding file cache entry %s: %s", file_path.name, reason)
+        file_path.unlink(missing_ok=True)
+
+    def _load_file_entry(self, key: str) -> LawDataEntry | None:
+        """ファイルキャッシュから法令本文のエントリを読む
+
+        TTLを過ぎていても検証子があれば再検証用に、`stale_grace` 以内なら期限切れとして返します。
+        それ以外の期限切れエントリや壊れたエントリは削除します。
+        """
+        file_path = self._get_file_path(key)
+        try:
+            # まずヘッダだけを読み、使えないエントリは本文を展開せずに捨てる
+            header = read_header(file_path)
+            expired = (
+                time.time() >= header["created_at"] + self.DEFAULT_LAW_DATA_TTL + self.stale_grace
+            )
+            if expired and not (header.get("etag") or header.get("last_modified")):
+                self._discard_file(file_path, "expired")
+                return None
+            if header.get("blob"):
+                # 本文は本文ハッシュ単位のファイルを参照する
+                blob = self._load_blob_file(header["content_hash"])
+                if blob is None:
+                    self._discard_file(file_path, "missing blob")
+                    return None
+                content = blob
+            else:
+                # 旧形式（本文を含む）
+                header, content = read_entry(file_path)
+            # 最終利用日時（GCのLRU判定に使用）
+            os.utime(file_path)
+        except FileNotFoundError:
+            return None
+        except (CorruptEntryError, KeyError, TypeError) as e:
+            self._discard_file(file_path, f"corrupt ({e})")
+            return None
+        except OSError as e:
+            logger.warning("Failed to read file cache entry %s: %s", file_path.name, e)
+            return None
+
+        if header.get("law_id"):
+            self._law_data_keys.setdefault(header["law_id"], set()).add(key)
+        # メモリにも載せる
+        return self._store_law_data_entry(
+            key,
+            content,
+            etag=header.get("etag"),
+            last_modified=header.get("last_modified"),
+            created_at=header["created_at"],
+            content_hash=header.get("content_hash"),
+        )
+
+    def _touch_file_entry(self, key: str, entry: LawDataEntry) -> None:
+        """メモリから返したエントリも、ファイルの最終利用日時を更新する
+
+        GCは最終利用日時の古いファイルから削除するため、メモリだけで返し続けている
+        よく使う法令が先に消えないようにします。更新は `FILE_TOUCH_INTERVAL` 秒に1回まで。
+        """
+        now = time.time()
+        if now - entry.touched_at < self.FILE_TOUCH_INTERVAL:
+            return
+        entry.touched_at = now
+        for path in (self._get_file_path(key), self._get_blob_path(entry.content_hash)):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+    def _load_blob_file(self, content_hash: str) -> str | None:
+        """本文ハッシュから本文を読む（メモリにあればファイルは読まない）
+
+        Raises:
+            OSError: ファイルを読めない
+        """
+        content = self._law_data_blobs.get(content_hash)
+        if content is not None:
+            return str(content)
+        blob_path = self._get_blob_path(content_hash)
+        try:
+            _, content = read_entry(blob_path)
+            os.utime(blob_path)
+        except FileNotFoundError:
+            return None
+        except CorruptEntryError as e:
+            self._discard_file(blob_path, f"corrupt ({e})")
+            return None
+        return str(content)
+
+    def _load_local_law_data_entry(self, key: str) -> LawDataEntry | None:
+        """法令本文のエントリをメモリ・ファイルキャッシュから取得（期限切れも含む）"""
+        # メモリキャッシュ確認（本文のLRU順も更新する）
+        entry = self._law_data_cache.get(key)
+        if entry is not None:
+            self._law_data_blobs.get(entry.content_hash)
+            if self.cache_type == "file":
+                self._touch_file_entry(key, entry)
+            return entry
 
         # ファイルキャッシュ確認
         if self.cache_type == "file":
-            file_path = self._get_file_path(key)
-            if file_path.exists():
-                data = json.loads(file_path.read_text())
-                # メモリにも載せる
-                self._law_data_cache[key] = data["content"]
-                return data["content"]  # type: ignore[no-any-return]
+            return self._load_file_entry(key)
+        return None
+
+    def _load_law_data_entry(self, key: str) -> LawDataEntry | None:
+        """法令本文のエントリを取得（期限切れも含む）"""
+        entry = self._load_local_law_data_entry(key)
+        if entry is not None or self.cache_type == "file" or self._backend is None:
+            return entry
+        # 永続層確認
+        rows = self._backend_call(self._fetch_backend_law_data, [key])
+        return self._store_backend_rows(rows).get(key)
+
+    async def _aload_law_data_entry(self, key: str) -> LawDataEntry | None:
+        """`_load_law_data_entry` の非同期版"""
+        entry = self._load_local_law_data_entry(key)
+        if entry is not None or self.cache_type == "file" or self._backend is None:
+            return entry
+        rows = await self._abackend_call(self._fetch_backend_law_data, [key])
+        return self._store_backend_rows(rows).get(key)
+
+    def _fetch_backend_law_data(
+        self, keys: list[str]
+    ) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any] | None]]:
+        """永続層から法令本文のエントリと参照先の本文を読む（永続層のスレッドで実行）
+
+        1件ずつの場合もまとめて読み、Redisではそれぞれ1往復にまとめます。
+        メモリにある本文は読みません。
+
+        Returns:
+            (キー -> エントリ, 本文ハッシュ -> 本文のエントリ（見つからなければNone）)
+        """
+        if self._backend is None or not keys:
+            return {}, {}
+        if len(keys) == 1:
+            row = self._backend.get("law_data", keys[0])
+            rows = {} if row is None else {keys[0]: row}
+        else:
+            rows = self._backend.get_many("law_data", keys)
+        hashes = sorted(
+            {
+                row["content_hash"]
+                for row in rows.values()
+                if not row["value"]
+                and row["content_hash"]
+                and row["content_hash"] not in self._law_data_blobs
+            }
+        )
+        if len(hashes) == 1:
+            found = {hashes[0]: blob} if (blob := self._backend.get("blob", hashes[0])) else {}
+        else:
+            found = self._backend.get_many("blob", hashes)
+        blobs: dict[str, dict[str, Any] | None] = {h: found.get(h) for h in hashes}
+        return rows, blobs
+
+    def _store_backend_rows(
+        self,
+        fetched: tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any] | None]] | None,
+    ) -> dict[str, LawDataEntry]:
+        """永続層から読んだ法令本文をメモリキャッシュに載せる
+
+        参照先の本文が消えているエントリは永続層からも削除します。
+        """
+        if fetched is None:
+            return {}
+        rows, blobs = fetched
+        entries: dict[str, LawDataEntry] = {}
+        for key, row in rows.items():
+            content = self._backend_content(row, blobs)
+            if content is not None:
+                entries[key] = self._store_backend_row(key, row, content)
+            elif self._backend is not None and (
+                not row["content_hash"] or row["content_hash"] in blobs
+            ):
+                # 参照先の本文が消えている
+                # （読んだ後にメモリから本文が追い出された場合は単にキャッシュミスとする）
+                self._backend_write(self._backend.delete, "law_data", key)
+        return entries
+
+    def _backend_content(
+        self, row: dict[str, Any], blobs: dict[str, dict[str, Any] | None]
+    ) -> str | None:
+        """永続層の法令本文エントリから本文を得る
+
+        本文は本文ハッシュ単位のエントリ（"blob"）を参照します。メモリにある本文を優先します。
+
+        Args:
+            row: 法令本文のエントリ
+            blobs: 読んでおいた本文のエントリ
+        """
+        if row["value"]:
+            # 旧形式（本文を含む）
+            return str(row["value"].decode("utf-8"))
+        content_hash = row["content_hash"]
+        if not content_hash:
+            return None
+        content = self._law_data_blobs.get(content_hash)
+        if content is not None:
+            return str(content)
+        blob = blobs.get(content_hash)
+        return None if blob is None else str(blob["value"].decode("utf-8"))
+
+    def _store_backend_row(self, key: str, row: dict[str, Any], content: str) -> LawDataEntry:
+        """永続層から読んだ法令本文をメモリキャッシュに載せる"""
+        if row["law_id"]:
+            self._law_data_keys.setdefault(row["law_id"], set()).add(key)
+        entry = self._store_law_data_entry(
+            key,
+            content,
+            etag=row["etag"],
+            last_modified=row["last_modified"],
+            content_hash=row["content_hash"],
+        )
+        entry.expires_at = row["expires_at"]
+        return entry
 
+    def _law_data_key(
+        self, law_id: str, asof: str | None = None, revision_id: str | None = None
+    ) -> str:
+        """法令本文のキャッシュキー
+
+        法令履歴IDが分かっている場合は施行日時点の代わりに使い、
+        同じ改正の施行期間内の日付で1つのエントリを共有します。
+        """
+        if revision_id is not None:
+            return self._get_cache_key("law_data", law_id, revision=revision_id)
+        return self._get_cache_key("law_data", law_id, asof=asof)
+
+    def get_law_data(
+        self, law_id: str, asof: str | None = None, revision_id: str | None = None
+    ) -> str | None:
+        """法令本文をキャッシュから取得（TTL内のもののみ）"""
+        key = self._law_data_key(law_id, asof, revision_id)
+        entry = self._load_law_data_entry(key)
+        if entry is not None and entry.is_fresh:
+            return entry.content
         return None
 
-    def set_law_data(self, law_id: str, content: str, asof: str | None = None) -> None:
+    def get_law_data_entry(
+        self, law_id: str, asof: str | None = None, revision_id: str | None = None
+    ) -> LawDataEntry | None:
+        """法令本文のエントリを取得（期限切れのものも返す）
+
+        期限切れのエントリは検証子を使った条件付きGETで再検証できます。
+        """
+        key = self._law_data_key(law_id, asof, revision_id)
+        return self._load_law_data_entry(key)
+
+    async def aget_law_data_entry(
+        self, law_id: str, asof: str | None = None, revision_id: str | None = None
+    ) -> LawDataEntry | None:
+        """`get_law_data_entry` の非同期版（永続層の読み込みでイベントループを止めない）"""
+        key = self._law_data_key(law_id, asof, revision_id)
+        return await self._aload_law_data_entry(key)
+
+    def set_law_data(
+        self,
+        law_id: str,
+        content: str,
+        asof: str | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        revision_id: str | None = None,
+    ) -> None:
         """法令本文をキャッシュに保存"""
-        key = self._get_cache_key("law_data", law_id, asof=asof)
+        writer = self.open_law_data_writer(
+            law_id, asof=asof, etag=etag, last_modified=last_modified, revision_id=revision_id
+        )
+        writer.write(content.encode("utf-8"))
+        writer.commit()
+
+    def renew_law_data(
+        self, law_id: str, asof: str | None = None, revision_id: str | None = None
+    ) -> bool:
+        """再検証（304 Not Modified）に成功したエントリのTTLを延長
 
-        # メモリキャッシュ
-        self._law_data_cache[key] = content
+        Returns:
+            延長できた場合はTrue
+        """
+        key, renewed, content_hash = self._renew_local_law_data(law_id, asof, revision_id)
+        if self._backend is not None:
+            renewed = bool(
+                self._backend_call(self._renew_backend_law_data, key, content_hash) or renewed
+            )
+        if renewed:
+            self._revalidated_count += 1
+        return renewed
+
+    async def arenew_law_data(
+        self, law_id: str, asof: str | None = None, revision_id: str | None = None
+    ) -> bool:
+        """`renew_law_data` の非同期版"""
+        key, renewed, content_hash = self._renew_local_law_data(law_id, asof, revision_id)
+        if self._backend is not None:
+            renewed = bool(
+                await self._abackend_call(self._renew_backend_law_data, key, content_hash)
+                or renewed
+            )
+        if renewed:
+            self._revalidated_count += 1
+        return renewed
+
+    def _renew_local_law_data(
+        self, law_id: str, asof: str | None, revision_id: str | None
+    ) -> tuple[str, bool, str | None]:
+        """メモリ・ファイルキャッシュのエントリのTTLを延長
+
+        Returns:
+            (キー, 延長できたか, 本文ハッシュ（メモリにあれば）)
+        """
+        key = self._law_data_key(law_id, asof, revision_id)
+        entry = self._law_data_cache.get(key)
+        now = time.time()
+        renewed = False
+        if entry is not None:
+            entry.expires_at = now + self.DEFAULT_LAW_DATA_TTL
+            renewed = True
 
-        # ファイルキャッシュ
         if self.cache_type == "file":
             file_path = self._get_file_path(key)
-            file_path.write_text(json.dumps({"law_id": law_id, "asof": asof, "content": content}))
+            try:
+                header = read_header(file_path)
+                header["created_at"] = now
+                rewrite_header(file_path, header)
+                renewed = True
+            except FileNotFoundError:
+                pass
+            except CorruptEntryError as e:
+                self._discard_file(file_path, f"corrupt ({e})")
+            except OSError as e:
+                logger.warning("Failed to renew file cache entry %s: %s", file_path.name, e)
+
+        return key, renewed, entry.content_hash if entry is not None else None
+
+    def _renew_backend_law_data(self, key: str, content_hash: str | None) -> bool:
+        """永続層のエントリのTTLを延長（永続層のスレッドで実行）"""
+        if self._backend is None:
+            return False
+        expires_at = time.time() + self.DEFAULT_LAW_DATA_TTL
+        if not self._backend.touch("law_data", key, expires_at):
+            return False
+        # 参照先の本文も参照元より先に消えないよう延長する
+        if content_hash is None:
+            row = self._backend.get("law_data", key)
+            content_hash = row["content_hash"] if row is not None else None
+        if content_hash:
+            self._backend.touch("blob", content_hash, expires_at)
+        return True
+
+    def open_law_data_writer(
+        self,
+        law_id: str,
+        asof: str | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        revision_id: str | None = None,
+    ) -> LawDataWriter:
+        """法令本文をストリーミングで保存するライターを取得
+
+        Example:
+            writer = cache.open_law_data_writer(law_id)
+            for chunk in chunks:
+                writer.write(chunk)
+            content = writer.commit()
+        """
+        key = self._law_data_key(law_id, asof, revision_id)
+        self._law_data_keys.setdefault(law_id, set()).add(key)
+        return LawDataWriter(
+            self,
+            key,
+            law_id,
+            asof=asof,
+            etag=etag,
+            last_modified=last_modified,
+            revision_id=revision_id,
+        )
+
+    def prefetch_law_data(self, law_ids: list[str], asof: str | None = None) -> int:
+        """複数の法令本文を永続層からまとめて読み、メモリキャッシュに載せる
+
+        Redisではエントリと参照先の本文をそれぞれパイプラインで1往復にまとめるため、
+        一括取得の前に呼ぶと法令ごとの往復を省けます。メモリにあるものは読みません。
+
+        Returns:
+            永続層から読んだエントリ数
+        """
+        if self._backend is None:
+            return 0
+        rows = self._backend_call(self._fetch_backend_law_data, self._prefetch_keys(law_ids, asof))
+        return len(self._store_backend_rows(rows))
+
+    async def aprefetch_law_data(self, law_ids: list[str], asof: str | None = None) -> int:
+        """`prefetch_law_data` の非同期版"""
+        if self._backend is None:
+            return 0
+        keys = self._prefetch_keys(law_ids, asof)
+        rows = await self._abackend_call(self._fetch_backend_law_data, keys)
+        return len(self._store_backend_rows(rows))
+
+    def _prefetch_keys(self, law_ids: list[str], asof: str | None) -> list[str]:
+        """プリフェッチするキー（メモリにあるもの・重複は読まない）"""
+        keys = {self._law_data_key(law_id, asof) for law_id in law_ids}
+        return sorted(key for key in keys if key not in self._law_data_cache)
 
     # --- 検索結果キャッシュ ---
 
@@ -109,14 +956,42 @@ class CacheManager:
         if key in self._search_cache:
             return self._search_cache[key]
 
-        return None
+        return self._load_backend_json("search", key, self._search_cache)
+
+    async def aget_search_result(
+        self, keyword: str, law_type: str | None = None, **kwargs: Any
+    ) -> dict[str, Any] | None:
+        """`get_search_result` の非同期版"""
+        key = self._get_cache_key("search", keyword, law_type=law_type, **kwargs)
+
+        if key in self._search_cache:
+            return self._search_cache[key]
+
+        return await self._aload_backend_json("search", key, self._search_cache)
 
     def set_search_result(
         self, keyword: str, result: dict[str, Any], law_type: str | None = None, **kwargs: Any
     ) -> None:
         """検索結果をキャッシュに保存"""
         key = self._get_cache_key("search", keyword, law_type=law_type, **kwargs)
-        self._search_cache[key] = result
+        self._put(self._search_cache, key, result)
+
+        law_ids = frozenset(law["law_id"] for law in result.get("laws", []) if law.get("law_id"))
+        self._search_index[key] = (keyword, law_ids)
+        if self._backend is not None:
+            self._backend_write(
+                self._backend.put,
+                "search",
+                key,
+                json.dumps(result).encode("utf-8"),
+                expires_at=time.time() + self.DEFAULT_SEARCH_TTL,
+                keyword=keyword,
+                law_ids=sorted(law_ids),
+            )
+        # 期限切れ・追い出し済みの検索結果のインデックスを掃除
+        if len(self._search_index) > 2 * len(self._search_cache) + 100:
+            for stale_key in [k for k in self._search_index if k not in self._search_cache]:
+                del self._search_index[stale_key]
 
     # --- 改正履歴キャッシュ ---
 
@@ -127,29 +1002,470 @@ class CacheManager:
         if key in self._revisions_cache:
             return self._revisions_cache[key]
 
-        return None
+        return self._load_backend_json("revisions", key, self._revisions_cache)
+
+    async def aget_revisions(self, law_id: str) -> dict[str, Any] | None:
+        """`get_revisions` の非同期版"""
+        key = self._get_cache_key("revisions", law_id)
+
+        if key in self._revisions_cache:
+            return self._revisions_cache[key]
+
+        return await self._aload_backend_json("revisions", key, self._revisions_cache)
 
     def set_revisions(self, law_id: str, result: dict[str, Any]) -> None:
         """改正履歴をキャッシュに保存"""
         key = self._get_cache_key("revisions", law_id)
-        self._revisions_cache[key] = result
+        self._put(self._revisions_cache, key, result)
+        if self._backend is not None:
+            self._backend_write(
+                self._backend.put,
+                "revisions",
+                key,
+                json.dumps(result).encode("utf-8"),
+                expires_at=time.time() + self.DEFAULT_REVISIONS_TTL,
+                law_id=law_id,
+            )
+
+    async def aget_revision_id(self, law_id: str, asof: str) -> str | None:
+        """以前に求めた施行日時点の法令履歴IDを取得
+
+        改正履歴のTTLとは別に、期限切れの法令本文を返しうる間は保持します。
+        """
+        key = self._get_cache_key("revision_ids", law_id)
+        revision_ids = self._revision_ids.get(key)
+        if revision_ids is None:
+            revision_ids = await self._aload_backend_json("revisions", key, self._revision_ids)
+        return None if revision_ids is None else revision_ids.get(asof)
+
+    def set_revision_id(self, law_id: str, asof: str, revision_id: str) -> None:
+        """施行日時点の法令履歴IDを記録"""
+        key = self._get_cache_key("revision_ids", law_id)
+        revision_ids = {**self._revision_ids.get(key, {}), asof: revision_id}
+        self._put(self._revision_ids, key, revision_ids)
+        if self._backend is not None:
+            self._backend_write(
+                self._backend.put,
+                "revisions",
+                key,
+                json.dumps(revision_ids).encode("utf-8"),
+                expires_at=time.time() + self.DEFAULT_LAW_DATA_TTL + self.stale_grace,
+                law_id=law_id,
+            )
+
+    def _load_backend_json(
+        self, category: str, key: str, front: "Cache[str, Any]"
+    ) -> dict[str, Any] | None:
+        """永続層からTTL内のJSONエントリを読み、メモリキャッシュにも載せる"""
+        if self._backend is None:
+            return None
+        row = self._backend_call(self._backend.get, category, key)
+        return self._store_backend_json(key, row, front)
+
+    async def _aload_backend_json(
+        self, category: str, key: str, front: "Cache[str, Any]"
+    ) -> dict[str, Any] | None:
+        """`_load_backend_json` の非同期版"""
+        if self._backend is None:
+            return None
+        row = await self._abackend_call(self._backend.get, category, key)
+        return self._store_backend_json(key, row, front)
+
+    def _store_backend_json(
+        self, key: str, row: dict[str, Any] | None, front: "Cache[str, Any]"
+    ) -> dict[str, Any] | None:
+        if row is None or row["expires_at"] <= time.time():
+            return None
+        result: dict[str, Any] = json.loads(row["value"])
+        self._put(front, key, result)
+        return result
+
+    # --- ネガティブキャッシュ ---
+
+    def get_not_found(
+        self, law_id: str, asof: str | None = None, article_number: str | None = None
+    ) -> dict[str, Any] | None:
+        """キャッシュ済みの「見つからない」エラーを取得
+
+        Args:
+            law_id: 法令ID
+            asof: 施行日時点
+            article_number: 条番号（未指定時は法令自体）
+
+        Returns:
+            エラー内容（`code`, `message`, `details`）。キャッシュされていなければNone
+        """
+        key = self._get_cache_key("negative", law_id, asof=asof, article=article_number)
+        error = self._negative_cache.get(key)
+        if error is not None:
+            self._negative_hits += 1
+        return error
+
+    def set_not_found(
+        self,
+        law_id: str,
+        error: dict[str, Any],
+        asof: str | None = None,
+        article_number: str | None = None,
+    ) -> None:
+        """「見つからない」エラーを短いTTLでキャッシュに保存（TTLが0以下なら何もしない）"""
+        if self.negative_ttl <= 0:
+            return
+        key = self._get_cache_key("negative", law_id, asof=asof, article=article_number)
+        self._put(self._negative_cache, key, error)
+        self._negative_keys.setdefault(law_id, set()).add(key)
+        # 期限切れ・追い出し済みのキーをインデックスから掃除
+        if len(self._negative_keys) > 2 * len(self._negative_cache) + 100:
+            for stale_id, keys in list(self._negative_keys.items()):
+                keys.intersection_update(self._negative_cache.keys())
+                if not keys:
+                    del self._negative_keys[stale_id]
+
+    # --- 派生データキャッシュ ---
+
+    def get_derived(
+        self, content_hash: str, renderer_version: str, fmt: str, *args: str
+    ) -> str | None:
+        """派生データをキャッシュから取得
+
+        Args:
+            content_hash: 元XMLのハッシュ
+            renderer_version: 変換処理のバージョン
+            fmt: 派生データの種類（"markdown", "toc", "article" など）
+            args: 種類ごとの追加キー（条番号など）
+        """
+        key = self._get_cache_key("derived", content_hash, renderer_version, fmt, *args)
+        return self._derived_cache.get(key)
+
+    def set_derived(
+        self, content_hash: str, renderer_version: str, fmt: str, *args: str, value: str
+    ) -> None:
+        """派生データをキャッシュに保存"""
+        key = self._get_cache_key("derived", content_hash, renderer_version, fmt, *args)
+        self._put(self._derived_cache, key, value)
+
+    # --- パース済み文書キャッシュ ---
+
+    def get_document(self, content_hash: str) -> Any | None:
+        """パース済みの法令XMLをキャッシュから取得（メモリのみ）
+
+        Args:
+            content_hash: 元XMLのハッシュ
+        """
+        item = self._document_cache.get(content_hash)
+        return None if item is None else item[0]
+
+    def set_document(self, content_hash: str, document: Any, size: int) -> None:
+        """パース済みの法令XMLをキャッシュに保存
+
+        Args:
+            content_hash: 元XMLのハッシュ
+            document: パース済みの文書
+            size: メモリ使用量の見積もり（バイト）
+        """
+        self._put(self._document_cache, content_hash, (document, size))
+
+    # --- ファイルキャッシュのGC ---
+
+    def iter_file_shards(self) -> list[Path]:
+        """ファイルキャッシュのシャードディレクトリ一覧"""
+        if not self.cache_dir.exists():
+            return []
+        return sorted(p for p in self.cache_dir.iterdir() if p.is_dir() and len(p.name) == 2)
+
+    def iter_blob_shards(self) -> list[Path]:
+        """ファイルキャッシュの本文（本文ハッシュ単位）のシャードディレクトリ一覧"""
+        blob_dir = self.cache_dir / "blobs"
+        if not blob_dir.exists():
+            return []
+        return sorted(p for p in blob_dir.iterdir() if p.is_dir())
+
+    def sweep_file_shard(
+        self, shard: Path, tmp_max_age: float = 3600.0, referenced: set[str] | None = None
+    ) -> list[tuple[float, int, Path]]:
+        """シャード内の不要なファイルを削除し、残ったファイルの一覧を返す
+
+        - 検証子が無く `stale_grace` も過ぎたエントリ・壊れたエントリを削除
+        - 参照先の本文が消えたエントリを削除
+        - 書き込みが中断されたまま残った古い一時ファイルを削除
+
+        Args:
+            shard: シャードディレクトリ
+            tmp_max_age: 一時ファイルを削除するまでの秒数
+            referenced: 残ったエントリが参照する本文ハッシュを追加する集合
+
+        Returns:
+            (最終利用日時, サイズ, パス) のリスト
+        """
+        now = time.time()
+        survivors: list[tuple[float, int, Path]] = []
+        for path in shard.iterdir():
+            try:
+                stat = path.stat()
+                if path.suffix == ".tmp":
+                    if now - stat.st_mtime > tmp_max_age:
+                        path.unlink(missing_ok=True)
+                    continue
+                if path.suffix != ".bin":
+                    continue
+                header = read_header(path)
+                expired = now >= header["created_at"] + self.DEFAULT_LAW_DATA_TTL + self.stale_grace
+                if expired and not (header.get("etag") or header.get("last_modified")):
+                    path.unlink(missing_ok=True)
+                    continue
+                if header.get("blob"):
+                    content_hash = header["content_hash"]
+                    if not self._get_blob_path(content_hash).exists():
+                        path.unlink(missing_ok=True)
+                        continue
+                    if referenced is not None:
+                        referenced.add(content_hash)
+            except FileNotFoundError:
+                continue
+            except (CorruptEntryError, KeyError, TypeError):
+                path.unlink(missing_ok=True)
+                continue
+            survivors.append((stat.st_mtime, stat.st_size, path))
+        return survivors
+
+    def sweep_blob_shard(
+        self, shard: Path, referenced: set[str], min_age: float = 3600.0
+    ) -> list[tuple[float, int, Path]]:
+        """本文のシャード内で参照されなくなった本文を削除し、残ったファイルの一覧を返す
+
+        書き込み直後でまだエントリから参照されていない本文を消さないよう、
+        最終利用から `min_age` 秒以上経ったものだけを削除します。
+
+        Args:
+            shard: 本文のシャードディレクトリ
+            referenced: エントリが参照している本文ハッシュ（`sweep_file_shard` で収集）
+            min_age: 参照されていない本文・一時ファイルを削除するまでの秒数
+
+        Returns:
+            (最終利用日時, サイズ, パス) のリスト
+        """
+        now = time.time()
+        survivors: list[tuple[float, int, Path]] = []
+        for path in shard.iterdir():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.suffix not in (".blob", ".tmp"):
+                continue
+            if path.stem in referenced and path.suffix == ".blob":
+                survivors.append((stat.st_mtime, stat.st_size, path))
+            elif now - stat.st_mtime > min_age:
+                path.unlink(missing_ok=True)
+        return survivors
 
     # --- 管理 ---
 
+    def _has_local_law_data(self, key: str) -> bool:
+        """法令本文のエントリがメモリ・ファイルキャッシュにあるか（本文は読まない）"""
+        if key in self._law_data_cache:
+            return True
+        if self.cache_type != "file":
+            return False
+        try:
+            read_header(self._get_file_path(key))
+        except (CorruptEntryError, OSError):
+            return False
+        return True
+
+    def has_law(self, law_id: str) -> bool:
+        """法令本文（asof未指定）がキャッシュされているか（期限切れを含む）
+
+        ファイルはヘッダだけ、永続層は存在だけを確認し、本文は読み込みません。
+        """
+        key = self._law_data_key(law_id)
+        if self._has_local_law_data(key):
+            return True
+        if self._backend is None or self.cache_type == "file":
+            return False
+        return bool(self._backend_call(self._backend.exists, "law_data", key))
+
+    async def ahas_law(self, law_id: str) -> bool:
+        """`has_law` の非同期版"""
+        key = self._law_data_key(law_id)
+        if self._has_local_law_data(key):
+            return True
+        if self._backend is None or self.cache_type == "file":
+            return False
+        return bool(await self._abackend_call(self._backend.exists, "law_data", key))
+
+    def invalidate_law(self, law_id: str, law_title: str | None = None) -> int:
+        """法令の改正に合わせて関連するキャッシュだけを無効化
+
+        - 法令本文（asof違いを含む）
+        - 改正履歴
+        - 法令・条文の「見つからない」結果
+        - 結果にその法令を含む検索結果、または法令名にキーワードが含まれる検索結果
+          （新たに検索にヒットするようになった法令に対応するため）
+
+        Args:
+            law_id: 法令ID
+            law_title: 法令名
+
+        Returns:
+            無効化したエントリ数
+        """
+        if self._needs_file_law_data_index:
+            self._merge_file_law_data_keys(self._scan_file_law_data_keys())
+        removed = self._invalidate_local_law(law_id, law_title)
+        if self._backend is not None:
+            removed += (
+                self._backend_call(self._backend.delete_law, law_id, law_title=law_title) or 0
+            )
+        self._invalidated_count += removed
+        return removed
+
+    async def ainvalidate_law(self, law_id: str, law_title: str | None = None) -> int:
+        """`invalidate_law` の非同期版"""
+        if self._needs_file_law_data_index:
+            scanned = await asyncio.to_thread(self._scan_file_law_data_keys)
+            self._merge_file_law_data_keys(scanned)
+        removed = self._invalidate_local_law(law_id, law_title)
+        if self._backend is not None:
+            removed += (
+                await self._abackend_call(self._backend.delete_law, law_id, law_title=law_title)
+                or 0
+            )
+        self._invalidated_count += removed
+        return removed
+
+    def _scan_file_law_data_keys(self) -> dict[str, set[str]]:
+        """ファイルキャッシュのヘッダから、法令IDと法令本文のキーの対応を集める"""
+        law_data_keys: dict[str, set[str]] = {}
+        for shard in self.iter_file_shards():
+            for path in shard.glob("*.bin"):
+                try:
+                    law_id = read_header(path).get("law_id")
+                except (OSError, CorruptEntryError):
+                    continue
+                if law_id:
+                    law_data_keys.setdefault(law_id, set()).add(path.stem)
+        return law_data_keys
+
+    def _merge_file_law_data_keys(self, law_data_keys: dict[str, set[str]]) -> None:
+        for law_id, keys in law_data_keys.items():
+            self._law_data_keys.setdefault(law_id, set()).update(keys)
+        self._file_law_data_indexed = True
+
+    @property
+    def _needs_file_law_data_index(self) -> bool:
+        return self.cache_type == "file" and not self._file_law_data_indexed
+
+    def _invalidate_local_law(self, law_id: str, law_title: str | None) -> int:
+        """メモリ・ファイルキャッシュの関連エントリを無効化"""
+        removed = 0
+
+        keys = self._law_data_keys.pop(law_id, set())
+        keys.add(self._law_data_key(law_id))
+        for key in keys:
+            found = self._drop_law_data(key) is not None
+            if self.cache_type == "file":
+                file_path = self._get_file_path(key)
+                if file_path.exists():
+                    file_path.unlink()
+                    found = True
+            removed += found
+
+        if self._revisions_cache.pop(self._get_cache_key("revisions", law_id), None) is not None:
+            removed += 1
+        self._revision_ids.pop(self._get_cache_key("revision_ids", law_id), None)
+
+        # 新たに公布された法令・追加された条文が「見つからない」のままにならないように
+        for key in self._negative_keys.pop(law_id, set()):
+            removed += self._negative_cache.pop(key, None) is not None
+
+        for key, (keyword, law_ids) in list(self._search_index.items()):
+            if law_id in law_ids or (law_title is not None and keyword in law_title):
+                del self._search_index[key]
+                if self._search_cache.pop(key, None) is not None:
+                    removed += 1
+        return removed
+
     def clear(self) -> None:
         """全キャッシュをクリア"""
         self._law_data_cache.clear()
+        self._law_data_blobs.clear()
         self._search_cache.clear()
         self._revisions_cache.clear()
+        self._revision_ids.clear()
+        self._derived_cache.clear()
+        self._document_cache.clear()
+        self._negative_cache.clear()
+        self._law_data_keys.clear()
+        self._search_index.clear()
+        self._negative_keys.clear()
 
         if self.cache_type == "file" and self.cache_dir.exists():
-            for file in self.cache_dir.glob("*.json"):
-                file.unlink()
+            # 旧形式（シャード無し・JSON）のファイルもあわせて削除する
+            patterns = ("*/*.bin", "*/*.tmp", "blobs/*/*.blob", "blobs/*/*.tmp")
+            for pattern in (*patterns, "*.bin", "*.json", "*.tmp"):
+                for file in self.cache_dir.glob(pattern):
+                    file.unlink(missing_ok=True)
+
+        if self._backend is not None:
+            self._backend_call(self._backend.clear)
+
+    def purge_expired(self) -> int:
+        """永続層から期限切れのエントリを削除
+
+        Returns:
+            削除したエントリ数
+        """
+        if self._backend is None:
+            return 0
+        return self._backend_call(self._backend.purge_expired) or 0
+
+    async def apurge_expired(self) -> int:
+        """`purge_expired` の非同期版"""
+        if self._backend is None:
+            return 0
+        return await self._abackend_call(self._backend.purge_expired) or 0
+
+    def get_metadata(self, name: str) -> str | None:
+        """メタデータ（同期日時など）を取得"""
+        if self._backend is not None:
+            return self._backend_call(self._backend.get_meta, name)
+        return self._metadata.get(name)
+
+    async def aget_metadata(self, name: str) -> str | None:
+        """`get_metadata` の非同期版"""
+        if self._backend is not None:
+            return await self._abackend_call(self._backend.get_meta, name)
+        return self._metadata.get(name)
+
+    def set_metadata(self, name: str, value: str) -> None:
+        """メタデータを保存（永続層があればプロセス間で共有される）"""
+        if self._backend is not None:
+            self._backend_write(self._backend.set_meta, name, value)
+        else:
+            self._metadata[name] = value
 
     def stats(self) -> dict[str, int]:
         """キャッシュ統計を取得"""
         return {
             "law_data_count": len(self._law_data_cache),
+            "law_data_blob_count": len(self._law_data_blobs),
             "search_count": len(self._search_cache),
             "revisions_count": len(self._revisions_cache),
+            "derived_count": len(self._derived_cache),
+            "document_count": len(self._document_cache),
+            "negative_count": len(self._negative_cache),
+            "negative_hit_count": self._negative_hits,
+            "law_data_revalidated_count": self._revalidated_count,
+            "invalidated_count": self._invalidated_count,
+            **(
+                {
+                    f"backend_{c}_count": self._backend_call(self._backend.count, c) or 0
+                    for c in ("law_data", "search", "revisions")
+                }
+                if self._backend is not None
+                else {}
+            ),
+            **{f"{name}_bytes": int(c.currsize) for name, c in self._memory_caches().items()},
+            "total_bytes": int(sum(c.currsize for c in self._memory_caches().values())),
         }
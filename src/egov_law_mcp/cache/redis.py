@@ -0,0 +1,394 @@
+"""Redisによる分散キャッシュ
+
+複数のサーバープロセス・ホストで1つのキャッシュを共有します。
+Redisプロトコルを話すサーバー（Redis, Valkey, KeyDB など）で動作し、
+クライアントには `redis` パッケージ（`pip install egov-law-mcp[redis]`）を使います。
+
+キーの構成（`prefix` は既定で "egov-law-mcp:"）:
+
+    {prefix}e:{category}:{key}  エントリ（HASH）。期限はサーバー側のTTLで管理
+    {prefix}law:{law_id}        法令に関連するエントリのキー（SET）。法令単位の無効化に使用
+    {prefix}kw:{keyword}        キーワードごとの検索結果のキー（SET）。法令名での無効化に使用
+    {prefix}kwlen               使われているキーワードの長さ（SET）
+    {prefix}counts              カテゴリ -> エントリ数（HASH）
+    {prefix}meta                メタデータ（HASH）
+"""
+
+import math
+import time
+import zlib
+from typing import Any
+
+# エントリのHASHのフィールド
+_FIELDS = {
+    "value": b"v",
+    "created_at": b"c",
+    "expires_at": b"x",
+    "law_id": b"l",
+    "etag": b"t",
+    "last_modified": b"m",
+    "content_hash": b"h",
+}
+
+
+def _text(value: Any) -> str | None:
+    if value is None:
+        return None
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+class RedisStore:
+    """Redisによるキャッシュの永続層
+
+    値はzlibで圧縮して保存し、期限切れのエントリはサーバー側のTTLで消えます。
+    検証子（ETag / Last-Modified）を持つエントリは条件付きGETで再検証できるよう、
+    期限後も `validator_grace` 秒だけ残します。法令本文は期限切れのまま返せるよう、
+    少なくとも `stale_grace` 秒は残します。本文ハッシュ単位の本文（"blob"）は
+    参照元より先に消えないよう、両方の猶予のうち長い方だけ残します。
+    複数キーの取得はパイプラインで1往復にまとめます。
+    キーの走査（SCAN）を伴う法令インデックスの掃除は、書き込みのたびではなく
+    バックグラウンドの `purge_expired` で行います。カテゴリ別のエントリ数は
+    書き込み・削除のたびに更新し、TTLで消えた分は `purge_expired` で数え直します。
+    """
+
+    DEFAULT_PREFIX = "egov-law-mcp:"
+    DEFAULT_VALIDATOR_GRACE = 7 * 86400  # 7日
+    SCAN_BATCH = 500
+
+    def __init__(
+        self,
+        client: Any,
+        prefix: str = DEFAULT_PREFIX,
+        validator_grace: float = DEFAULT_VALIDATOR_GRACE,
+        stale_grace: float = 0.0,
+    ) -> None:
+        """
+        Args:
+            client: `redis.Redis` 互換のクライアント（`decode_responses=False`）
+            prefix: キーのプレフィックス
+            validator_grace: 検証子を持つエントリを期限後も残す秒数
+            stale_grace: 法令本文を期限後も残す秒数
+        """
+        self._client = client
+        self.prefix = prefix
+        self.validator_grace = validator_grace
+        self.stale_grace = stale_grace
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisStore":
+        """URL（例: "redis://localhost:6379/0"）から接続する
+
+        Raises:
+            RuntimeError: `redis` パッケージがインストールされていない
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "CACHE_TYPE=redis requires the 'redis' package: pip install 'egov-law-mcp[redis]'"
+            ) from e
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _entry_key(self, category: str, key: str) -> str:
+        return f"{self.prefix}e:{category}:{key}"
+
+    def _law_key(self, law_id: str) -> str:
+        return f"{self.prefix}law:{law_id}"
+
+    def _keyword_key(self, keyword: str) -> str:
+        return f"{self.prefix}kw:{keyword}"
+
+    @property
+    def _keyword_lengths_key(self) -> str:
+        return f"{self.prefix}kwlen"
+
+    @property
+    def _meta_key(self) -> str:
+        return f"{self.prefix}meta"
+
+    @property
+    def _counts_key(self) -> str:
+        return f"{self.prefix}counts"
+
+    def _category_of(self, entry_key: str) -> str:
+        """エントリのキーからカテゴリを取り出す"""
+        return entry_key[len(self.prefix) + 2 :].partition(":")[0]
+
+    def _ttl(self, category: str, expires_at: float, retain: bool) -> int:
+        """サーバー側のTTL（秒）"""
+        grace = self.stale_grace if category == "law_data" else 0.0
+        if category == "blob":
+            # 本文は参照する法令本文のどれよりも長く残す
+            grace = max(self.stale_grace, self.validator_grace)
+        if retain:
+            grace = max(grace, self.validator_grace)
+        return max(1, math.ceil(expires_at - time.time() + grace))
+
+    def close(self) -> None:
+        """接続を閉じる"""
+        self._client.close()
+
+    def _decode(self, fields: dict[bytes, bytes]) -> dict[str, Any] | None:
+        """HASHのフィールドをdictに変換（空・壊れている場合はNone）"""
+        if not fields or _FIELDS["value"] not in fields:
+            return None
+        try:
+            value = zlib.decompress(fields[_FIELDS["value"]])
+            created_at = float(fields[_FIELDS["created_at"]])
+            expires_at = float(fields[_FIELDS["expires_at"]])
+        except (zlib.error, KeyError, ValueError):
+            return None
+        entry: dict[str, Any] = {
+            "value": value,
+            "created_at": created_at,
+            "expires_at": expires_at,
+        }
+        for name in ("law_id", "etag", "last_modified", "content_hash"):
+            entry[name] = _text(fields.get(_FIELDS[name]))
+        return entry
+
+    def get(self, category: str, key: str) -> dict[str, Any] | None:
+        """エントリを取得（期限切れも含む）
+
+        Returns:
+            `value`（展開済みのバイト列）と各フィールドを持つdict
+        """
+        entry_key = self._entry_key(category, key)
+        fields = self._client.hgetall(entry_key)
+        entry = self._decode(fields)
+        if entry is None and fields:
+            # 壊れたエントリは削除する
+            self._client.delete(entry_key)
+        return entry
+
+    def get_many(self, category: str, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """複数のエントリをパイプラインで1往復で取得（見つかったものだけを返す）"""
+        if not keys:
+            return {}
+        pipe = self._client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(self._entry_key(category, key))
+        entries: dict[str, dict[str, Any]] = {}
+        for key, fields in zip(keys, pipe.execute(), strict=True):
+            entry = self._decode(fields)
+            if entry is not None:
+                entries[key] = entry
+        return entries
+
+    def exists(self, category: str, key: str) -> bool:
+        """エントリがあるか（値は読まない）"""
+        return bool(self._client.exists(self._entry_key(category, key)))
+
+    def put(
+        self,
+        category: str,
+        key: str,
+        value: bytes,
+        expires_at: float,
+        law_id: str | None = None,
+        keyword: str | None = None,
+        law_ids: list[str] | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        content_hash: str | None = None,
+    ) -> None:
+        """エントリを保存（同じキーは置き換え）"""
+        entry_key = self._entry_key(category, key)
+        mapping: dict[bytes, Any] = {
+            _FIELDS["value"]: zlib.compress(value),
+            _FIELDS["created_at"]: repr(time.time()),
+            _FIELDS["expires_at"]: repr(expires_at),
+        }
+        for name, field_value in (
+            ("law_id", law_id),
+            ("etag", etag),
+            ("last_modified", last_modified),
+            ("content_hash", content_hash),
+        ):
+            if field_value is not None:
+                mapping[_FIELDS[name]] = field_value
+
+        retain = etag is not None or last_modified is not None
+        pipe = self._client.pipeline(transaction=True)
+        pipe.delete(entry_key)
+        pipe.hset(entry_key, mapping=mapping)
+        pipe.expire(entry_key, self._ttl(category, expires_at, retain))
+        for related in {*(law_ids or []), *([law_id] if law_id else [])}:
+            pipe.sadd(self._law_key(related), entry_key)
+        if keyword is not None:
+            pipe.sadd(self._keyword_key(keyword), entry_key)
+            pipe.sadd(self._keyword_lengths_key, len(keyword))
+        replaced = pipe.execute()[0]
+        if not replaced:
+            self._client.hincrby(self._counts_key, category, 1)
+
+    def put_law_data(
+        self,
+        key: str,
+        content: bytes,
+        content_hash: str,
+        expires_at: float,
+        law_id: str | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """法令本文（"blob"）と、それを参照する "law_data" のエントリを保存
+
+        本文はサーバー側のTTLで参照元より長く残るため、本文を先に書けば
+        2つの書き込みの間に消えることはありません。
+        """
+        self.put("blob", content_hash, content, expires_at=expires_at)
+        self.put(
+            "law_data",
+            key,
+            b"",
+            expires_at=expires_at,
+            law_id=law_id,
+            etag=etag,
+            last_modified=last_modified,
+            content_hash=content_hash,
+        )
+
+    def touch(self, category: str, key: str, expires_at: float) -> bool:
+        """エントリの期限を延長
+
+        Returns:
+            延長できた場合はTrue
+        """
+        entry_key = self._entry_key(category, key)
+        # 本文は読まずに、存在と検証子の有無だけを確認する
+        pipe = self._client.pipeline(transaction=False)
+        pipe.exists(entry_key)
+        pipe.hmget(entry_key, [_FIELDS["etag"], _FIELDS["last_modified"]])
+        exists, validators = pipe.execute()
+        if not exists:
+            return False
+        retain = any(v is not None for v in validators)
+        pipe = self._client.pipeline(transaction=True)
+        pipe.hset(entry_key, _FIELDS["expires_at"], repr(expires_at))
+        pipe.expire(entry_key, self._ttl(category, expires_at, retain))
+        pipe.execute()
+        return True
+
+    def delete(self, category: str, key: str) -> None:
+        """エントリを削除"""
+        if self._client.delete(self._entry_key(category, key)):
+            self._client.hincrby(self._counts_key, category, -1)
+
+    def delete_law(self, law_id: str, law_title: str | None = None) -> int:
+        """法令に関連するエントリを削除
+
+        法令本文・改正履歴に加え、結果にその法令を含む検索結果と、
+        キーワードが法令名に含まれる検索結果を削除します。
+
+        キーワードは全件を走査せず、法令名の部分文字列のうち使われている長さのものだけを
+        キーワードのインデックスから引きます。
+
+        Returns:
+            削除したエントリ数
+        """
+        law_key = self._law_key(law_id)
+        keywords: list[str] = []
+        if law_title:
+            lengths = sorted(int(n) for n in self._client.smembers(self._keyword_lengths_key))
+            keywords = sorted(
+                {
+                    law_title[i : i + n]
+                    for n in lengths
+                    if n <= len(law_title)
+                    for i in range(len(law_title) - n + 1)
+                }
+            )
+        keyword_keys = [self._keyword_key(keyword) for keyword in keywords]
+        pipe = self._client.pipeline(transaction=False)
+        pipe.smembers(law_key)
+        for keyword_key in keyword_keys:
+            pipe.smembers(keyword_key)
+        entry_keys = {_text(k) for members in pipe.execute() for k in members}
+        keys = sorted(k for k in entry_keys if k)
+
+        if not keys:
+            self._client.delete(law_key)
+            return 0
+        pipe = self._client.pipeline(transaction=True)
+        for key in keys:
+            pipe.delete(key)
+        # 他の法令・キーワードのインデックスに残った分は `purge_expired` で除く
+        pipe.delete(law_key, *keyword_keys)
+        results = pipe.execute()
+        deleted = [key for key, found in zip(keys, results, strict=False) if found]
+        if deleted:
+            pipe = self._client.pipeline(transaction=False)
+            for key in deleted:
+                pipe.hincrby(self._counts_key, self._category_of(key), -1)
+            pipe.execute()
+        return len(deleted)
+
+    def purge_expired(self, now: float | None = None) -> int:
+        """期限切れで消えたエントリを法令インデックス・キーワードから除く
+
+        エントリ自体はサーバー側のTTLで削除されます。キーを走査するため、
+        リクエストの処理中ではなくバックグラウンドで定期的に呼び出してください。
+        あわせてカテゴリ別のエントリ数を数え直します。
+
+        Returns:
+            インデックスから除いたキーの数
+        """
+        removed = 0
+        index_keys = [
+            _text(k) or ""
+            for pattern in (f"{self.prefix}law:*", f"{self.prefix}kw:*")
+            for k in self._client.scan_iter(match=pattern, count=self.SCAN_BATCH)
+        ]
+        for index_key in index_keys:
+            members = [_text(m) or "" for m in self._client.smembers(index_key)]
+            if not members:
+                continue
+            pipe = self._client.pipeline(transaction=False)
+            for member in members:
+                pipe.exists(member)
+            gone = [m for m, exists in zip(members, pipe.execute(), strict=True) if not exists]
+            if not gone:
+                continue
+            self._client.srem(index_key, *gone)
+            removed += len(gone)
+
+        counts: dict[str, int] = {}
+        for key in self._client.scan_iter(match=f"{self.prefix}e:*", count=self.SCAN_BATCH):
+            category = self._category_of(_text(key) or "")
+            counts[category] = counts.get(category, 0) + 1
+        pipe = self._client.pipeline(transaction=True)
+        pipe.delete(self._counts_key)
+        if counts:
+            pipe.hset(self._counts_key, mapping=counts)
+        pipe.execute()
+        return removed
+
+    def _scan_delete(self, pattern: str) -> None:
+        batch: list[Any] = []
+        for key in self._client.scan_iter(match=pattern, count=self.SCAN_BATCH):
+            batch.append(key)
+            if len(batch) >= self.SCAN_BATCH:
+                self._client.delete(*batch)
+                batch = []
+        if batch:
+            self._client.delete(*batch)
+
+    def clear(self) -> None:
+        """全エントリを削除（メタデータは残す）"""
+        self._scan_delete(f"{self.prefix}e:*")
+        self._scan_delete(f"{self.prefix}law:*")
+        self._scan_delete(f"{self.prefix}kw:*")
+        self._client.delete(self._keyword_lengths_key, self._counts_key)
+
+    def count(self, category: str) -> int:
+        """カテゴリのエントリ数（TTLで消えた分は次の `purge_expired` まで含む）"""
+        return max(0, int(self._client.hget(self._counts_key, category) or 0))
+
+    def get_meta(self, name: str) -> str | None:
+        """メタデータを取得"""
+        return _text(self._client.hget(self._meta_key, name))
+
+    def set_meta(self, name: str, value: str) -> None:
+        """メタデータを保存"""
+        self._client.hset(self._meta_key, name, value)
@@ -0,0 +1,306 @@
+"""SQLite（WALモード）による永続キャッシュ
+
+1つのデータベースファイルに法令本文・検索結果・改正履歴とメタデータを保存します。
+WALモードのため、同じホスト上の複数のサーバープロセスから同時に読み書きできます。
+期限（`expires_at`）にインデックスを張っているため、期限切れの一括削除は低コストです。
+"""
+
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Any
+
+SCHEMA_VERSION = "1"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    category TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    law_id TEXT,
+    keyword TEXT,
+    law_ids TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    PRIMARY KEY (category, key)
+);
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+CREATE INDEX IF NOT EXISTS entries_law_id ON entries (law_id);
+CREATE TABLE IF NOT EXISTS metadata (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SQLiteStore:
+    """SQLiteによるキャッシュの永続層
+
+    値はzlibで圧縮して保存します。
+    他プロセスの書き込みで待たされる時間は短く抑え、待ちきれなかった読み書きは
+    `sqlite3.OperationalError` として呼び出し元（`CacheManager`）でキャッシュミス扱いにします。
+    """
+
+    DEFAULT_BUSY_TIMEOUT = 0.5
+
+    def __init__(
+        self, path: Path, busy_timeout: float = DEFAULT_BUSY_TIMEOUT, stale_grace: float = 0.0
+    ) -> None:
+        """
+        Args:
+            path: データベースファイルのパス
+            busy_timeout: 他プロセスの書き込みを待つ秒数
+            stale_grace: 法令本文を期限後も残す秒数（期限切れのまま返すため）
+        """
+        self.path = path
+        self.stale_grace = stale_grace
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 自動コミット。書き込みは1文ずつ完結させる（複数の行は明示的なトランザクションで書く）
+        self._conn = sqlite3.connect(
+            str(path), timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO metadata (name, value) VALUES ('schema_version', ?)",
+            (SCHEMA_VERSION,),
+        )
+
+    def close(self) -> None:
+        """接続を閉じる"""
+        self._conn.close()
+
+    _COLUMNS = "key, value, created_at, expires_at, law_id, etag, last_modified, content_hash"
+
+    def _decode_row(self, category: str, row: tuple[Any, ...]) -> dict[str, Any] | None:
+        """行をdictに変換（展開できない値は削除してNone）"""
+        try:
+            value = zlib.decompress(row[1])
+        except zlib.error:
+            self.delete(category, row[0])
+            return None
+        return {
+            "value": value,
+            "created_at": row[2],
+            "expires_at": row[3],
+            "law_id": row[4],
+            "etag": row[5],
+            "last_modified": row[6],
+            "content_hash": row[7],
+        }
+
+    def get(self, category: str, key: str) -> dict[str, Any] | None:
+        """エントリを取得（期限切れも含む）
+
+        Returns:
+            `value`（展開済みのバイト列）と各列を持つdict
+        """
+        row = self._conn.execute(
+            f"SELECT {self._COLUMNS} FROM entries WHERE category = ? AND key = ?",
+            (category, key),
+        ).fetchone()
+        if row is None:
+            return None
+        return self._decode_row(category, row)
+
+    def get_many(self, category: str, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """複数のエントリを1回のクエリで取得（見つかったものだけを返す）"""
+        if not keys:
+            return {}
+        placeholders = ", ".join("?" * len(keys))
+        rows = self._conn.execute(
+            f"SELECT {self._COLUMNS} FROM entries WHERE category = ? AND key IN ({placeholders})",
+            (category, *keys),
+        ).fetchall()
+        entries: dict[str, dict[str, Any]] = {}
+        for row in rows:
+            entry = self._decode_row(category, row)
+            if entry is not None:
+                entries[row[0]] = entry
+        return entries
+
+    def exists(self, category: str, key: str) -> bool:
+        """エントリがあるか（値は読まない）"""
+        row = self._conn.execute(
+            "SELECT 1 FROM entries WHERE category = ? AND key = ?", (category, key)
+        ).fetchone()
+        return row is not None
+
+    def put(
+        self,
+        category: str,
+        key: str,
+        value: bytes,
+        expires_at: float,
+        law_id: str | None = None,
+        keyword: str | None = None,
+        law_ids: list[str] | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        content_hash: str | None = None,
+    ) -> None:
+        """エントリを保存（同じキーは置き換え）"""
+        self._insert(
+            category,
+            key,
+            value,
+            expires_at,
+            law_id=law_id,
+            keyword=keyword,
+            law_ids=law_ids,
+            etag=etag,
+            last_modified=last_modified,
+            content_hash=content_hash,
+        )
+
+    def put_law_data(
+        self,
+        key: str,
+        content: bytes,
+        content_hash: str,
+        expires_at: float,
+        law_id: str | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """法令本文（"blob"）と、それを参照する "law_data" のエントリを1つのトランザクションで保存
+
+        別々に書くと、その間に他プロセスの `purge_expired` が参照されていない本文として
+        消してしまうためです。
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._insert("blob", content_hash, content, expires_at)
+            self._insert(
+                "law_data",
+                key,
+                b"",
+                expires_at,
+                law_id=law_id,
+                etag=etag,
+                last_modified=last_modified,
+                content_hash=content_hash,
+            )
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _insert(
+        self,
+        category: str,
+        key: str,
+        value: bytes,
+        expires_at: float,
+        law_id: str | None = None,
+        keyword: str | None = None,
+        law_ids: list[str] | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        content_hash: str | None = None,
+    ) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO entries (category, key, value, created_at, expires_at,"
+            " law_id, keyword, law_ids, etag, last_modified, content_hash)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                category,
+                key,
+                zlib.compress(value),
+                time.time(),
+                expires_at,
+                law_id,
+                keyword,
+                # LIKE で完全一致させるため前後を空白で囲む
+                f" {' '.join(law_ids)} " if law_ids is not None else None,
+                etag,
+                last_modified,
+                content_hash,
+            ),
+        )
+
+    def touch(self, category: str, key: str, expires_at: float) -> bool:
+        """エントリの期限を延長
+
+        Returns:
+            延長できた場合はTrue
+        """
+        cursor = self._conn.execute(
+            "UPDATE entries SET expires_at = ? WHERE category = ? AND key = ?",
+            (expires_at, category, key),
+        )
+        return cursor.rowcount > 0
+
+    def delete(self, category: str, key: str) -> None:
+        """エントリを削除"""
+        self._conn.execute("DELETE FROM entries WHERE category = ? AND key = ?", (category, key))
+
+    def delete_law(self, law_id: str, law_title: str | None = None) -> int:
+        """法令に関連するエントリを削除
+
+        法令本文・改正履歴に加え、結果にその法令を含む検索結果と、
+        キーワードが法令名に含まれる検索結果を削除します。
+
+        Returns:
+            削除したエントリ数
+        """
+        # ORでまとめるとインデックスが使えず全行を走査するため、法令IDのインデックスと
+        # 主キー（カテゴリ）で絞り込める2文に分ける
+        removed = self._conn.execute("DELETE FROM entries WHERE law_id = ?", (law_id,)).rowcount
+        cursor = self._conn.execute(
+            "DELETE FROM entries WHERE category = 'search'"
+            " AND (law_ids LIKE ? OR instr(?, keyword) > 0)",
+            (f"% {law_id} %", law_title or ""),
+        )
+        return removed + cursor.rowcount
+
+    def purge_expired(self, now: float | None = None) -> int:
+        """期限切れのエントリを削除
+
+        検証子（ETag / Last-Modified）を持つエントリは条件付きGETで再検証できるため残します。
+        法令本文は `stale_grace` 秒の間も残します。本文ハッシュ単位の本文（"blob"）は
+        期限ではなく、参照する法令本文が無くなった時点で削除します。
+
+        Returns:
+            削除したエントリ数（参照されなくなって消した本文は数えない）
+        """
+        now = now if now is not None else time.time()
+        cursor = self._conn.execute(
+            "DELETE FROM entries WHERE expires_at < ? AND etag IS NULL AND last_modified IS NULL"
+            " AND category != 'blob' AND (category != 'law_data' OR expires_at < ?)",
+            (now, now - self.stale_grace),
+        )
+        removed = cursor.rowcount
+        self._conn.execute(
+            "DELETE FROM entries WHERE category = 'blob' AND key NOT IN"
+            " (SELECT content_hash FROM entries"
+            " WHERE category = 'law_data' AND content_hash IS NOT NULL)"
+        )
+        return removed
+
+    def clear(self) -> None:
+        """全エントリを削除（メタデータは残す）"""
+        self._conn.execute("DELETE FROM entries")
+
+    def count(self, category: str) -> int:
+        """カテゴリのエントリ数"""
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM entries WHERE category = ?", (category,)
+        ).fetchone()
+        return int(row[0])
+
+    def get_meta(self, name: str) -> str | None:
+        """メタデータを取得"""
+        row = self._conn.execute("SELECT value FROM metadata WHERE name = ?", (name,)).fetchone()
+        return None if row is None else str(row[0])
+
+    def set_meta(self, name: str, value: str) -> None:
+        """メタデータを保存"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO metadata (name, value) VALUES (?, ?)", (name, value)
+        )
@@ -0,0 +1,172 @@
+"""更新差分によるキャッシュ同期"""
+
+import asyncio
+import contextlib
+import logging
+import os
+from datetime import date, timedelta
+from typing import Any
+
+from egov_law_mcp.api import EGovAPIClient, EGovAPIError
+from egov_law_mcp.api.client import _env_flag
+from egov_law_mcp.parser import LawXMLParser
+
+from .manager import CacheManager
+
+logger = logging.getLogger(__name__)
+
+
+class CacheSyncer:
+    """更新された法令のキャッシュだけを無効化するバックグラウンド同期
+
+    e-Gov API の `GET /laws` を `updated_from` / `updated_to` で定期的に問い合わせ、
+    前回の同期以降に更新された法令について、法令本文・改正履歴・検索結果の
+    キャッシュを無効化します。`refresh` を有効にすると、キャッシュ済みだった
+    法令本文はその場で取得し直します。
+    """
+
+    DEFAULT_INTERVAL = 3600.0  # 1時間
+    DEFAULT_LOOKBACK_DAYS = 1
+    PAGE_SIZE = 100
+
+    def __init__(
+        self,
+        cache: CacheManager,
+        client: EGovAPIClient | None = None,
+        interval: float | None = None,
+        refresh: bool | None = None,
+        lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    ) -> None:
+        """
+        Args:
+            cache: 同期対象のキャッシュマネージャー
+            client: APIクライアント
+            interval: 同期間隔（秒）。0以下で無効
+            refresh: 無効化した法令本文を取得し直すか
+            lookback_days: 初回同期で遡る日数
+        """
+        self.cache = cache
+        self.client = client or EGovAPIClient()
+        self.interval = (
+            interval
+            if interval is not None
+            else float(os.getenv("CACHE_SYNC_INTERVAL", str(self.DEFAULT_INTERVAL)))
+        )
+        self.refresh = refresh if refresh is not None else _env_flag("CACHE_SYNC_REFRESH", False)
+        self.lookback_days = lookback_days
+        # 同じ更新を繰り返し無効化しないよう、法令ごとに処理済みの更新と記録日を保持
+        self._seen: dict[str, tuple[str, date]] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    async def _fetch_updated(self, updated_from: date, updated_to: date) -> list[dict[str, Any]]:
+        """更新された法令を全ページ取得"""
+        items: list[dict[str, Any]] = []
+        offset = 0
+        while True:
+            response = await self.client.list_updated_laws(
+                updated_from=updated_from.isoformat(),
+                updated_to=updated_to.isoformat(),
+                limit=self.PAGE_SIZE,
+                offset=offset,
+            )
+            page = response.get("laws", [])
+            items.extend(page)
+            if len(page) < self.PAGE_SIZE:
+                return items
+            offset += self.PAGE_SIZE
+
+    async def _refresh_law_data(self, law_id: str) -> None:
+        """法令本文を取得し直してキャッシュに保存
+
+        利用者の取得と同じ `load_law_data` を通し、取得中の同じ法令とダウンロードを1回にまとめます。
+        """
+        # tools は cache に依存するため、循環importを避けて実行時に読み込む
+        from egov_law_mcp.tools.loader import load_law_data
+
+        await load_law_data(law_id, None, self.client, self.cache, LawXMLParser())
+
+    async def sync_once(self, today: date | None = None) -> list[str]:
+        """前回の同期以降に更新された法令のキャッシュを無効化
+
+        Args:
+            today: 同期基準日（テスト用）
+
+        Returns:
+            無効化した法令IDのリスト
+
+        Raises:
+            EGovAPIError: API呼び出しエラー
+        """
+        today = today or date.today()
+        # 日付単位の指定のため、前回の同期日も含めて問い合わせる
+        # （前回の同期日はキャッシュのメタデータに保存し、永続層があればプロセス間で共有）
+        last_synced = await self.cache.aget_metadata("last_synced")
+        updated_from = (
+            date.fromisoformat(last_synced)
+            if last_synced
+            else today - timedelta(days=self.lookback_days)
+        )
+        # 問い合わせ範囲より前に記録した更新は再び返らないため捨てる
+        self._seen = {
+            law_id: seen for law_id, seen in self._seen.items() if seen[1] >= updated_from
+        }
+        items = await self._fetch_updated(updated_from, today)
+
+        updated: list[str] = []
+        to_refresh: list[str] = []
+        for item in items:
+            law_info = item.get("law_info", {})
+            revision_info = item.get("revision_info", {})
+            law_id = law_info.get("law_id")
+            if not law_id:
+                continue
+            marker = str(revision_info.get("updated") or revision_info.get("law_revision_id") or "")
+            seen = self._seen.get(law_id)
+            if marker and seen is not None and seen[0] == marker:
+                continue
+            self._seen[law_id] = (marker, today)
+
+            # 本文は読まずに、キャッシュにあるかだけを確認する
+            was_cached = await self.cache.ahas_law(law_id)
+            await self.cache.ainvalidate_law(law_id, law_title=revision_info.get("law_title"))
+            updated.append(law_id)
+            if self.refresh and was_cached:
+                to_refresh.append(law_id)
+
+        for law_id in to_refresh:
+            try:
+                await self._refresh_law_data(law_id)
+            except EGovAPIError as e:
+                logger.warning("Failed to refresh law data %s: %s", law_id, e.message)
+
+        self.cache.set_metadata("last_synced", today.isoformat())
+        if updated:
+            logger.info("Invalidated cache for %d updated laws", len(updated))
+        return updated
+
+    async def run(self) -> None:
+        """`interval` 秒ごとに同期を繰り返す"""
+        while True:
+            try:
+                await self.sync_once()
+            except EGovAPIError as e:
+                logger.warning("Cache sync failed: %s", e.message)
+            except Exception:
+                # 想定外のエラーでも同期自体は止めない
+                logger.exception("Cache sync failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """バックグラウンドで同期を開始（間隔が0以下なら何もしない）"""
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """バックグラウンドの同期を停止"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
@@ -1,6 +1,8 @@
 """モデルパッケージ"""
 
 from .schemas import (
+    BulkLawError,
+    BulkLawResult,
     ErrorCode,
     ErrorDetail,
     ErrorResponse,
@@ -26,6 +28,8 @@ __all__ = [
     "LawRevision",
     "LawRevisionsResult",
     "LawFullText",
+    "BulkLawError",
+    "BulkLawResult",
     "KeywordSearchHit",
     "KeywordSearchResult",
     "ErrorDetail",
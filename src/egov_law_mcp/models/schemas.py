@@ -73,6 +73,7 @@ class LawArticle(BaseModel):
     article_number: str = Field(..., description="条番号")
     article_title: str | None = Field(None, description="条見出し")
     content: str = Field(..., description="条文内容(Markdown形式)")
+    stale: bool = Field(False, description="期限切れのキャッシュから返した場合True")
 
 
 class LawRevision(BaseModel):
@@ -99,6 +100,7 @@ class LawFullText(BaseModel):
     law_name: str = Field(..., description="法令名")
     format: OutputFormat = Field(..., description="出力形式")
     content: str = Field(..., description="内容")
+    stale: bool = Field(False, description="期限切れのキャッシュから返した場合True")
 
 
 class KeywordSearchHit(BaseModel):
@@ -130,3 +132,18 @@ class ErrorResponse(BaseModel):
     """エラーレスポンス"""
 
     error: ErrorDetail = Field(..., description="エラー情報")
+
+
+class BulkLawError(BaseModel):
+    """一括取得で失敗した法令"""
+
+    law_id: str = Field(..., description="法令ID")
+    error: ErrorDetail = Field(..., description="エラー情報")
+
+
+class BulkLawResult(BaseModel):
+    """法令一括取得結果"""
+
+    total_count: int = Field(..., description="要求件数")
+    laws: list[LawFullText] = Field(default_factory=list, description="取得できた法令")
+    errors: list[BulkLawError] = Field(default_factory=list, description="取得に失敗した法令")
@@ -1,5 +1,14 @@
 """parser パッケージ"""
 
-from .xml_to_markdown import LawXMLParser
+from .article_number import normalize_article_number
+from .document import LawDocument
+from .xml_to_markdown import LawVisitor, LawXMLParser, MarkdownVisitor, TocVisitor
 
-__all__ = ["LawXMLParser"]
+__all__ = [
+    "LawDocument",
+    "LawVisitor",
+    "LawXMLParser",
+    "MarkdownVisitor",
+    "TocVisitor",
+    "normalize_article_number",
+]
@@ -0,0 +1,74 @@
+"""条番号の正規化"""
+
+import re
+import unicodedata
+
+_KANJI_DIGITS = {
+    "〇": 0,
+    "零": 0,
+    "一": 1,
+    "二": 2,
+    "三": 3,
+    "四": 4,
+    "五": 5,
+    "六": 6,
+    "七": 7,
+    "八": 8,
+    "九": 9,
+}
+_KANJI_UNITS = {"十": 10, "百": 100, "千": 1000}
+
+# 「条の二」「709_2」「709-2」などの枝番の区切り
+_BRANCH_SEPARATOR = re.compile(r"[の之ノ_\-]")
+
+
+def _kanji_to_int(text: str) -> int | None:
+    """漢数字（「七百九」「千五十」「二〇」など）を整数に変換"""
+    if not text:
+        return None
+    if all(c in _KANJI_DIGITS for c in text):
+        # 位取りのみの表記（「二〇」）
+        return int("".join(str(_KANJI_DIGITS[c]) for c in text))
+    total = 0
+    digit: int | None = None
+    for c in text:
+        if c in _KANJI_DIGITS:
+            if digit is not None:
+                return None
+            digit = _KANJI_DIGITS[c]
+        elif c in _KANJI_UNITS:
+            total += (1 if digit is None else digit) * _KANJI_UNITS[c]
+            digit = None
+        else:
+            return None
+    return total + (digit or 0)
+
+
+def _to_int(text: str) -> int | None:
+    if text.isascii() and text.isdigit():
+        return int(text)
+    return _kanji_to_int(text)
+
+
+def normalize_article_number(article_number: str) -> str | None:
+    """条番号を法令XMLの `Num` 属性の形式（"709", "709_2"）に正規化
+
+    "709", "７０９", "第709条", "第七百九条", "709_2", "709-2", "709の2",
+    "第七百九条の二" などの表記を受け付けます。
+
+    Returns:
+        正規化した条番号（解釈できない場合はNone）
+    """
+    text = unicodedata.normalize("NFKC", article_number).strip().replace(" ", "")
+    text = text.removeprefix("第")
+    # 「第三条の二」の「条」は本番号と枝番の間にある
+    head, sep, tail = text.partition("条")
+    if sep:
+        if tail and not _BRANCH_SEPARATOR.match(tail):
+            return None
+        text = head + tail
+    parts = _BRANCH_SEPARATOR.split(text)
+    numbers = [_to_int(part) for part in parts]
+    if any(n is None or n <= 0 for n in numbers):
+        return None
+    return "_".join(str(n) for n in numbers)
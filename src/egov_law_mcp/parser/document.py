@@ -0,0 +1,79 @@
+"""パース済みの法令XML"""
+
+from functools import cached_property
+
+from lxml import etree
+
+from .xml_to_markdown import LawXMLParser, XMLSource
+
+
+class LawDocument:
+    """パース済みの法令XML
+
+    XMLを1回だけパースし、法令タイトル・目次・条文・全文の変換に使い回します。
+    本文ハッシュをキーにキャッシュしておけば、同じ法令の条文を続けて取得しても
+    パースし直す必要はありません。
+    """
+
+    # パース後のツリーが元のXML（文字列）の何倍のメモリを使うかの目安
+    TREE_SIZE_FACTOR = 8
+
+    def __init__(
+        self,
+        root: etree._Element,
+        parser: LawXMLParser | None = None,
+        source_size: int = 0,
+    ) -> None:
+        """
+        Args:
+            root: ルート要素
+            parser: 変換に使うパーサー
+            source_size: 元のXMLのサイズ（バイト）。メモリ使用量の見積もりに使用
+        """
+        self.root = root
+        self.parser = parser or LawXMLParser()
+        self.source_size = source_size
+
+    @classmethod
+    def parse(cls, xml_content: XMLSource, parser: LawXMLParser | None = None) -> "LawDocument":
+        """XMLをパースする
+
+        Args:
+            xml_content: 法令XML文字列、バイト列、またはパース済みの要素
+            parser: 変換に使うパーサー
+        """
+        parser = parser or LawXMLParser()
+        size = 0 if isinstance(xml_content, etree._Element) else len(xml_content)
+        return cls(parser.parse(xml_content), parser, source_size=size)
+
+    @property
+    def memory_size(self) -> int:
+        """メモリ使用量の見積もり（バイト）"""
+        return self.source_size * self.TREE_SIZE_FACTOR
+
+    @cached_property
+    def title(self) -> str:
+        """法令タイトル"""
+        return self.parser.get_law_title(self.root)
+
+    @cached_property
+    def article_index(self) -> dict[str, etree._Element]:
+        """正規化した条番号 -> 条（Article）要素の索引（初回参照時に1回だけ作成）"""
+        return self.parser.build_article_index(self.root)
+
+    def toc(self) -> str:
+        """目次形式のMarkdown"""
+        return self.parser.parse_toc(self.root)
+
+    def full_text(self) -> str:
+        """Markdown形式の法令全文"""
+        return self.parser.parse_full_text(self.root)
+
+    def article(self, article_number: str) -> str | None:
+        """Markdown形式の条文（見つからない場合はNone）
+
+        条番号は "709", "709_2", "第七百九条の二" などの表記を受け付け、索引から引きます。
+        """
+        return self.parser.extract_article(
+            self.root, article_number, law_title=self.title, index=self.article_index
+        )
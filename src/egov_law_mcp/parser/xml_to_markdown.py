@@ -1,7 +1,128 @@
 """法令XMLからMarkdownへの変換パーサー"""
 
+from collections.abc import AsyncIterable, Callable, Iterator
+from typing import TypeVar
+
 from lxml import etree
 
+from .article_number import normalize_article_number
+
+# パース済みのツリー、またはXML文字列
+XMLSource = str | bytes | etree._Element
+
+VisitorT = TypeVar("VisitorT", bound="LawVisitor")
+
+
+class LawVisitor:
+    """法令XMLの変換処理（`LawXMLParser.render` で要素を辿りながら呼ばれる）
+
+    `CHILDREN` に要素ごとに辿る子要素のタグを定義し、`enter` で要素ごとの出力を
+    `lines` に追記します。出力は1つのリストにまとめて書き込み、最後に1回だけ連結します。
+    """
+
+    # 要素のタグ -> 辿る子要素のタグ（無いタグの子要素は辿らない）
+    CHILDREN: dict[str, frozenset[str]] = {}
+
+    def __init__(self, parser: "LawXMLParser") -> None:
+        self.parser = parser
+        self.lines: list[str] = []
+
+    def enter(self, element: etree._Element) -> None:
+        """要素に入ったときの処理（子要素より先に呼ばれる）"""
+
+    def getvalue(self) -> str:
+        """出力を連結した文字列"""
+        return "\n".join(self.lines)
+
+
+_PROVISION_CHILDREN = frozenset(
+    {"Part", "Chapter", "Section", "Subsection", "Article", "Paragraph"}
+)
+_TOC_CHILDREN = frozenset({"Part", "Chapter", "Section", "Subsection", "Article"})
+
+
+class MarkdownVisitor(LawVisitor):
+    """全文・条文のMarkdownへの変換"""
+
+    CHILDREN = {
+        "MainProvision": _PROVISION_CHILDREN,
+        "SupplProvision": _PROVISION_CHILDREN,
+        "Part": frozenset({"Chapter", "Article"}),
+        "Chapter": frozenset({"Section", "Article"}),
+        "Section": frozenset({"Subsection", "Article"}),
+        "Subsection": frozenset({"Article"}),
+        "Article": frozenset({"Paragraph"}),
+        "Paragraph": frozenset({"Item"}),
+        "Item": frozenset({"Subitem1"}),
+        # 号の細分（Subitem1〜Subitem10）
+        **{f"Subitem{level}": frozenset({f"Subitem{level + 1}"}) for level in range(1, 10)},
+    }
+    # 見出しを持つ要素 -> (見出し要素, Markdownの見出しレベル)
+    HEADINGS = {
+        "Part": ("PartTitle", "#"),
+        "Chapter": ("ChapterTitle", "##"),
+        "Section": ("SectionTitle", "###"),
+        "Subsection": ("SubsectionTitle", "####"),
+    }
+
+    def _sentences(self, element: etree._Element | None) -> str:
+        if element is None:
+            return ""
+        get_text = self.parser._get_text
+        return "".join(get_text(s) for s in element.findall("Sentence"))
+
+    def enter(self, element: etree._Element) -> None:
+        tag = element.tag
+        get_text = self.parser._get_text
+        if tag == "Paragraph":
+            num = get_text(element.find("ParagraphNum")).strip()
+            text = f"**{num}** " if num else ""
+            text += self._sentences(element.find("ParagraphSentence"))
+            if text.strip():
+                self.lines += (text, "")
+        elif tag == "Item":
+            title = element.find("ItemTitle")
+            text = "* " if title is None else f"* {get_text(title)} "
+            self.lines.append(text + self._sentences(element.find("ItemSentence")))
+        elif tag == "Article":
+            header = get_text(element.find("ArticleTitle"))
+            header += get_text(element.find("ArticleCaption"))
+            if header:
+                self.lines += ("", f"#### {header}", "")
+        elif isinstance(tag, str) and tag.startswith("Subitem"):
+            indent = "  " * int(tag[7:])
+            title = element.find(f"{tag}Title")
+            text = f"{indent}* " if title is None else f"{indent}* {get_text(title)} "
+            self.lines.append(text + self._sentences(element.find(f"{tag}Sentence")))
+        elif tag in self.HEADINGS:
+            title_tag, level = self.HEADINGS[tag]
+            title = element.find(title_tag)
+            if title is not None:
+                self.lines += ("", f"{level} {get_text(title)}", "")
+        elif tag == "SupplProvision":
+            self.lines += ("", "---", "", f"# 附則 {element.get('AmendLawNum', '附則')}")
+
+
+class TocVisitor(LawVisitor):
+    """目次（編・章・節・款・条の見出しのみ）への変換"""
+
+    CHILDREN = {
+        tag: _TOC_CHILDREN for tag in ("MainProvision", "Part", "Chapter", "Section", "Subsection")
+    }
+
+    def enter(self, element: etree._Element) -> None:
+        tag = element.tag
+        get_text = self.parser._get_text
+        if tag == "Article":
+            text = get_text(element.find("ArticleTitle")) + get_text(element.find("ArticleCaption"))
+            if text:
+                self.lines.append(f"- {text}")
+        elif tag in MarkdownVisitor.HEADINGS:
+            title_tag, level = MarkdownVisitor.HEADINGS[tag]
+            title = element.find(title_tag)
+            if title is not None:
+                self.lines.append(f"{level} {get_text(title)}")
+
 
 class LawXMLParser:
     """法令XMLパーサー
@@ -10,396 +131,347 @@ class LawXMLParser:
     SPEC.mdの「5. データ変換ロジック」に準拠。
     """
 
+    # 変換結果が変わる修正を入れたら上げる（派生データキャッシュのキーに使用）
+    RENDERER_VERSION = "2"
+
+    # 全文の逐次変換で、1回にパーサーへ渡す文字数
+    STREAM_FEED_SIZE = 64 * 1024
+
+    # 全文の逐次変換で、1つのチャンクとして変換する単位
+    _STREAM_UNITS = ("Article", "Paragraph")
+    # 見出し要素 -> (親要素, Markdownの見出しレベル)
+    _STREAM_HEADINGS = {
+        title_tag: (tag, level) for tag, (title_tag, level) in MarkdownVisitor.HEADINGS.items()
+    }
+
     def __init__(self) -> None:
         self._namespaces: dict[str, str] = {}
 
-    def _get_text(self, element: etree._Element | None) -> str:
-        """要素からテキストを取得（Rubyタグのフリガナを除去）"""
-        if element is None:
-            return ""
+    def _prepare(self, root: etree._Element) -> etree._Element:
+        """変換前の下処理（ツリーごとに1回だけ行う）
 
-        # Rtタグ（フリガナ）を除去してテキストを取得
-        text_parts: list[str] = []
+        - Rubyタグのフリガナ（Rt）を除去
+        - 上付き文字（Sup）を `^{...}`、下付き文字（Sub）を `_{...}` に置き換え
 
-        def extract_text(el: etree._Element) -> None:
-            if el.tag == "Rt":
-                # フリガナは無視
-                return
-            if el.text:
-                text_parts.append(el.text)
-            for child in el:
-                extract_text(child)
-                if child.tail:
-                    text_parts.append(child.tail)
+        以降は要素のテキスト（子孫のテキストの連結）をそのまま本文として使えるため、
+        テキストの取り出しのたびにPythonでツリーを辿る必要がありません。
+        """
+        etree.strip_elements(root, "Rt", with_tail=False)
+        # 入れ子の場合に内側から置き換わるよう、文書順の逆に処理する
+        for el in reversed(list(root.iter("Sup", "Sub"))):
+            marker = "^" if el.tag == "Sup" else "_"
+            text = self._get_text(el)
+            if len(el):
+                el.clear(keep_tail=True)
+            el.text = f"{marker}{{{text}}}"
+        etree.strip_tags(root, "Sup", "Sub")
+        return root
 
-        extract_text(element)
-        return "".join(text_parts)
+    def _get_text(self, element: etree._Element | None) -> str:
+        """要素からテキストを取得（`_prepare` 済みの要素を前提とする）"""
+        if element is None:
+            return ""
+        if not len(element):
+            # 子要素の無い要素（大半の見出し・文）はテキストをそのまま返す
+            return element.text or ""
+        return etree.tostring(element, method="text", encoding="unicode", with_tail=False)
 
     def _parse_element(self, element: etree._Element) -> str:
         """任意のXML要素からテキストを取得"""
         return self._get_text(element)
 
-    def get_law_title(self, xml_content: str) -> str:
+    def parse(self, xml_content: XMLSource) -> etree._Element:
+        """XMLをパースしてルート要素を返す
+
+        パース済みの要素を渡した場合はそのまま返します（`parse` / `parse_stream` で
+        得た要素を渡してください）。
+        同じXMLに対して複数の変換を行う場合は、先にパースして要素を使い回してください。
+
+        Args:
+            xml_content: 法令XML文字列、バイト列、またはパース済みの要素
+
+        Returns:
+            ルート要素
+        """
+        if isinstance(xml_content, etree._Element):
+            return xml_content
+        if isinstance(xml_content, str):
+            xml_content = xml_content.encode("utf-8")
+        return self._prepare(etree.fromstring(xml_content))
+
+    async def parse_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        sink: Callable[[bytes], None] | None = None,
+    ) -> etree._Element:
+        """バイト列のストリームを逐次パースする
+
+        ダウンロードと並行してパースを進めるため、ボディ全体の文字列を保持する必要がありません。
+
+        Args:
+            chunks: XMLのバイト列チャンク（`response.aiter_bytes()` など）
+            sink: 各チャンクを受け取るコールバック（キャッシュ書き込み用）
+
+        Returns:
+            ルート要素
+        """
+        feed_parser = etree.XMLParser()
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            if sink is not None:
+                sink(chunk)
+            feed_parser.feed(chunk)
+        return self._prepare(feed_parser.close())
+
+    def get_law_title(self, xml_content: XMLSource) -> str:
         """法令タイトルを取得
 
         Args:
-            xml_content: 法令XML文字列
+            xml_content: 法令XML文字列またはパース済みの要素
 
         Returns:
             法令タイトル
         """
-        root = etree.fromstring(xml_content.encode("utf-8"))
+        root = self.parse(xml_content)
         law_title = root.find(".//LawTitle")
         return self._get_text(law_title) if law_title is not None else ""
 
-    def parse_full_text(self, xml_content: str) -> str:
+    def parse_full_text(self, xml_content: XMLSource) -> str:
         """法令全文をMarkdown形式に変換
 
         Args:
-            xml_content: 法令XML文字列
+            xml_content: 法令XML文字列またはパース済みの要素
 
         Returns:
             Markdown形式の法令全文
         """
-        root = etree.fromstring(xml_content.encode("utf-8"))
-        lines: list[str] = []
+        root = self.parse(xml_content)
+        visitor = MarkdownVisitor(self)
 
         # 法令タイトル
         law_title = root.find(".//LawTitle")
         if law_title is not None:
-            title = self._get_text(law_title)
-            lines.append(f"# {title}")
-            lines.append("")
+            visitor.lines += (f"# {self._get_text(law_title)}", "")
 
         # 本則
         main_provision = root.find(".//MainProvision")
         if main_provision is not None:
-            lines.extend(self._parse_provision(main_provision))
+            self.render(main_provision, visitor)
 
         # 附則
-        suppl_provisions = root.findall(".//SupplProvision")
-        for suppl in suppl_provisions:
-            lines.append("")
-            lines.append("---")
-            lines.append("")
-            suppl_label = suppl.get("AmendLawNum", "附則")
-            lines.append(f"# 附則 {suppl_label}")
-            lines.extend(self._parse_provision(suppl))
-
-        return "\n".join(lines)
-
-    def _parse_provision(self, provision: etree._Element) -> list[str]:
-        """本則・附則をパース"""
-        lines: list[str] = []
-
-        for child in provision:
-            tag = child.tag
-            if tag == "Part":
-                lines.extend(self._parse_part(child))
-            elif tag == "Chapter":
-                lines.extend(self._parse_chapter(child))
-            elif tag == "Section":
-                lines.extend(self._parse_section(child))
-            elif tag == "Subsection":
-                lines.extend(self._parse_subsection(child))
-            elif tag == "Article":
-                lines.extend(self._parse_article(child))
-            elif tag == "Paragraph":
-                lines.extend(self._parse_paragraph(child))
-
-        return lines
-
-    def _parse_part(self, part: etree._Element) -> list[str]:
-        """編（Part）をパース"""
-        lines: list[str] = []
-        title = part.find("PartTitle")
-        if title is not None:
-            lines.append("")
-            lines.append(f"# {self._get_text(title)}")
-            lines.append("")
-
-        for child in part:
-            if child.tag == "Chapter":
-                lines.extend(self._parse_chapter(child))
-            elif child.tag == "Article":
-                lines.extend(self._parse_article(child))
-
-        return lines
-
-    def _parse_chapter(self, chapter: etree._Element) -> list[str]:
-        """章（Chapter）をパース"""
-        lines: list[str] = []
-        title = chapter.find("ChapterTitle")
-        if title is not None:
-            lines.append("")
-            lines.append(f"## {self._get_text(title)}")
-            lines.append("")
-
-        for child in chapter:
-            if child.tag == "Section":
-                lines.extend(self._parse_section(child))
-            elif child.tag == "Article":
-                lines.extend(self._parse_article(child))
-
-        return lines
-
-    def _parse_section(self, section: etree._Element) -> list[str]:
-        """節（Section）をパース"""
-        lines: list[str] = []
-        title = section.find("SectionTitle")
-        if title is not None:
-            lines.append("")
-            lines.append(f"### {self._get_text(title)}")
-            lines.append("")
-
-        for child in section:
-            if child.tag == "Subsection":
-                lines.extend(self._parse_subsection(child))
-            elif child.tag == "Article":
-                lines.extend(self._parse_article(child))
-
-        return lines
-
-    def _parse_subsection(self, subsection: etree._Element) -> list[str]:
-        """款（Subsection）をパース"""
-        lines: list[str] = []
-        title = subsection.find("SubsectionTitle")
-        if title is not None:
-            lines.append("")
-            lines.append(f"#### {self._get_text(title)}")
-            lines.append("")
-
-        for child in subsection:
-            if child.tag == "Article":
-                lines.extend(self._parse_article(child))
-
-        return lines
-
-    def _parse_article(self, article: etree._Element) -> list[str]:
-        """条（Article）をパース"""
-        lines: list[str] = []
-
-        # 条見出し
-        caption = article.find("ArticleCaption")
-        title = article.find("ArticleTitle")
-
-        article_header = ""
-        if title is not None:
-            article_header = self._get_text(title)
-        if caption is not None:
-            cap_text = self._get_text(caption)
-            if article_header:
-                article_header = f"{article_header}{cap_text}"
-            else:
-                article_header = cap_text
-
-        if article_header:
-            lines.append("")
-            lines.append(f"#### {article_header}")
-            lines.append("")
-
-        # 項
-        for para in article.findall("Paragraph"):
-            lines.extend(self._parse_paragraph(para))
-
-        return lines
-
-    def _parse_paragraph(self, paragraph: etree._Element) -> list[str]:
-        """項（Paragraph）をパース"""
-        lines: list[str] = []
-
-        para_num = paragraph.find("ParagraphNum")
-        para_sentence = paragraph.find("ParagraphSentence")
-
-        para_text = ""
-        if para_num is not None and self._get_text(para_num).strip():
-            num_text = self._get_text(para_num).strip()
-            para_text = f"**{num_text}** "
-
-        if para_sentence is not None:
-            sentences = para_sentence.findall("Sentence")
-            sentence_texts = [self._get_text(s) for s in sentences]
-            para_text += "".join(sentence_texts)
-
-        if para_text.strip():
-            lines.append(para_text)
-            lines.append("")
-
-        # 号
-        for item in paragraph.findall("Item"):
-            lines.extend(self._parse_item(item))
-
-        return lines
-
-    def _parse_item(self, item: etree._Element, indent: int = 0) -> list[str]:
-        """号（Item）をパース"""
-        lines: list[str] = []
-        indent_str = "  " * indent
-
-        item_title = item.find("ItemTitle")
-        item_sentence = item.find("ItemSentence")
-
-        item_text = f"{indent_str}* "
-        if item_title is not None:
-            item_text += f"{self._get_text(item_title)} "
-        if item_sentence is not None:
-            sentences = item_sentence.findall("Sentence")
-            sentence_texts = [self._get_text(s) for s in sentences]
-            item_text += "".join(sentence_texts)
-
-        lines.append(item_text)
+        for suppl in root.findall(".//SupplProvision"):
+            self.render(suppl, visitor)
 
-        # Subitem1 (号の細分)
-        for subitem in item.findall("Subitem1"):
-            lines.extend(self._parse_subitem(subitem, 1))
+        return visitor.getvalue()
 
-        return lines
+    def iter_full_text(self, xml_content: str | bytes) -> Iterator[str]:
+        """法令全文をMarkdown形式に逐次変換
 
-    def _parse_subitem(self, subitem: etree._Element, level: int) -> list[str]:
-        """号の細分（Subitem）をパース"""
-        lines: list[str] = []
-        indent_str = "  " * level
+        ツリー全体は作らず、`XMLPullParser` で少しずつ読み進めます。
+        条・項を変換し終えた要素はその場で破棄するため、法令の大きさによらず
+        メモリ使用量はほぼ一定です。チャンクを連結すると `parse_full_text` の結果と一致します。
 
-        title_tag = f"Subitem{level}Title"
-        sentence_tag = f"Subitem{level}Sentence"
+        Args:
+            xml_content: 法令XML文字列またはバイト列
 
-        title = subitem.find(title_tag)
-        sentence = subitem.find(sentence_tag)
+        Yields:
+            Markdown形式の法令全文のチャンク（見出し・条・項の単位）
+        """
+        pull = etree.XMLPullParser(events=("start", "end"))
+        # 開いている要素ごとの (タグ, 全文に含めるか)
+        stack: list[tuple[str, bool]] = []
+        # 変換待ちの条・項の数（中の要素はまだ破棄できない）
+        open_units = 0
+        seen_title = False
+        seen_main = False
+        first = True
+
+        def chunk(lines: list[str]) -> str:
+            nonlocal first
+            text = "\n".join(lines) if first else "\n" + "\n".join(lines)
+            first = False
+            return text
+
+        def handle_events() -> Iterator[str]:
+            nonlocal open_units, seen_title, seen_main
+            for event, el in pull.read_events():
+                if not isinstance(el, etree._Element):
+                    continue
+                tag = el.tag
+                if event == "start":
+                    parent_tag, parent_shown = stack[-1] if stack else ("", False)
+                    if tag == "MainProvision":
+                        shown = not seen_main
+                        seen_main = True
+                    elif tag == "SupplProvision":
+                        shown = True
+                        yield chunk(["", "---", "", f"# 附則 {el.get('AmendLawNum', '附則')}"])
+                    else:
+                        # 条・項の中はまとめて変換するため、個別には扱わない
+                        shown = (
+                            parent_shown
+                            and parent_tag not in self._STREAM_UNITS
+                            and tag in MarkdownVisitor.CHILDREN.get(parent_tag, ())
+                        )
+                    if shown and tag in self._STREAM_UNITS:
+                        open_units += 1
+                    stack.append((tag, shown))
+                    continue
+
+                tag, shown = stack.pop()
+                lines: list[str] = []
+                if shown and tag in self._STREAM_UNITS:
+                    lines = self.render(self._prepare(el), MarkdownVisitor(self)).lines
+                    open_units -= 1
+                elif tag == "LawTitle" and not seen_title:
+                    seen_title = True
+                    lines = [f"# {self._get_text(self._prepare(el))}", ""]
+                elif tag in self._STREAM_HEADINGS and stack:
+                    parent_tag, level = self._STREAM_HEADINGS[tag]
+                    if stack[-1] == (parent_tag, True):
+                        lines = ["", f"{level} {self._get_text(self._prepare(el))}", ""]
+                if lines:
+                    yield chunk(lines)
+
+                # 変換済みの要素と、それより前の兄弟要素を破棄する
+                # （見出しなど、親要素のテキストとしてまだ読む要素は残す）
+                if open_units == 0 and (
+                    not stack or stack[-1][1] or stack[-1][0] in ("Law", "LawBody")
+                ):
+                    el.clear(keep_tail=True)
+                    parent = el.getparent()
+                    if parent is not None:
+                        while el.getprevious() is not None:
+                            del parent[0]
+
+        for offset in range(0, len(xml_content), self.STREAM_FEED_SIZE):
+            piece = xml_content[offset : offset + self.STREAM_FEED_SIZE]
+            pull.feed(piece.encode("utf-8") if isinstance(piece, str) else piece)
+            yield from handle_events()
+        pull.close()
+        yield from handle_events()
+
+    def render(
+        self, element: etree._Element, visitor: VisitorT, include_self: bool = True
+    ) -> VisitorT:
+        """要素以下を辿って変換処理を呼び出す
+
+        再帰呼び出しは使わず、開いている要素の子要素のイテレータをスタックに積んで
+        文書順に辿ります。`visitor.CHILDREN` に無い子要素の下は辿りません。
 
-        sub_text = f"{indent_str}* "
-        if title is not None:
-            sub_text += f"{self._get_text(title)} "
-        if sentence is not None:
-            sentences = sentence.findall("Sentence")
-            sentence_texts = [self._get_text(s) for s in sentences]
-            sub_text += "".join(sentence_texts)
+        Args:
+            element: 変換する要素（`_prepare` 済み）
+            visitor: 変換処理
+            include_self: `element` 自体も `visitor.enter` に渡すか
 
-        lines.append(sub_text)
+        Returns:
+            渡した `visitor`
+        """
+        children = visitor.CHILDREN
+        enter = visitor.enter
+        if include_self:
+            enter(element)
+        allowed = children.get(element.tag)
+        if allowed is None:
+            return visitor
+        stack: list[tuple[frozenset[str], Iterator[etree._Element]]] = [(allowed, iter(element))]
+        while stack:
+            allowed, it = stack[-1]
+            for child in it:
+                if child.tag in allowed:
+                    enter(child)
+                    child_allowed = children.get(child.tag)
+                    if child_allowed is not None:
+                        stack.append((child_allowed, iter(child)))
+                        break
+            else:
+                stack.pop()
+        return visitor
 
-        # さらに深い階層のSubitem
-        next_level = level + 1
-        next_tag = f"Subitem{next_level}"
-        for child_subitem in subitem.findall(next_tag):
-            lines.extend(self._parse_subitem(child_subitem, next_level))
+    def build_article_index(self, xml_content: XMLSource) -> dict[str, etree._Element]:
+        """正規化した条番号 -> 条（Article）要素の索引を作成
 
-        return lines
+        同じ条番号が複数ある場合（本則と附則など）は文書中で先に現れるものを採ります。
 
-    def extract_article(self, xml_content: str, article_number: str) -> str | None:
+        Args:
+            xml_content: 法令XML文字列またはパース済みの要素
+        """
+        index: dict[str, etree._Element] = {}
+        for article in self.parse(xml_content).iter("Article"):
+            num = article.get("Num")
+            if num:
+                index.setdefault(normalize_article_number(num) or num, article)
+        return index
+
+    def extract_article(
+        self,
+        xml_content: XMLSource,
+        article_number: str,
+        law_title: str | None = None,
+        index: dict[str, etree._Element] | None = None,
+    ) -> str | None:
         """特定の条文を抽出
 
         Args:
-            xml_content: 法令XML文字列
-            article_number: 条番号（例: "709", "1"）
+            xml_content: 法令XML文字列またはパース済みの要素
+            article_number: 条番号（例: "709", "1", "709_2", "第七百九条の二"）
+            law_title: 法令タイトル（取得済みの場合。未指定時はXMLから取得）
+            index: `build_article_index` で作成済みの索引（未指定時は作成する）
 
         Returns:
             Markdown形式の条文。見つからない場合はNone。
         """
-        root = etree.fromstring(xml_content.encode("utf-8"))
-
-        # 条番号で検索（Num属性で一致）
-        article = root.find(f".//Article[@Num='{article_number}']")
-        if article is None:
-            # 数値形式でも試行
-            article = root.find(f".//Article[@Num='{int(article_number)}']")
+        root = self.parse(xml_content)
 
+        num = normalize_article_number(article_number)
+        if num is None:
+            return None
+        if index is None:
+            index = self.build_article_index(root)
+        article = index.get(num)
         if article is None:
             return None
 
         # 法令タイトル取得
-        law_title = self.get_law_title(xml_content)
-
-        lines: list[str] = []
+        if law_title is None:
+            law_title = self.get_law_title(root)
 
-        # 条見出し
-        caption = article.find("ArticleCaption")
-        title = article.find("ArticleTitle")
-
-        article_header = ""
-        if title is not None:
-            article_header = self._get_text(title)
-        if caption is not None:
-            cap_text = self._get_text(caption)
-            if article_header:
-                article_header = f"{article_header}{cap_text}"
+        # 条見出し（見出しは条名がある場合のみ付ける）
+        article_header = self._get_text(article.find("ArticleTitle"))
+        if article_header:
+            article_header += self._get_text(article.find("ArticleCaption"))
 
+        visitor = MarkdownVisitor(self)
         if law_title:
-            lines.append(f"# {law_title} {article_header}")
+            visitor.lines += (f"# {law_title} {article_header}", "")
         else:
-            lines.append(f"# {article_header}")
-        lines.append("")
+            visitor.lines += (f"# {article_header}", "")
 
         # 項
-        for para in article.findall("Paragraph"):
-            lines.extend(self._parse_paragraph(para))
+        self.render(article, visitor, include_self=False)
+        return visitor.getvalue()
 
-        return "\n".join(lines)
-
-    def parse_toc(self, xml_content: str) -> str:
+    def parse_toc(self, xml_content: XMLSource) -> str:
         """目次形式でパース（見出しのみ）
 
         Args:
-            xml_content: 法令XML文字列
+            xml_content: 法令XML文字列またはパース済みの要素
 
         Returns:
             目次形式のMarkdown
         """
-        root = etree.fromstring(xml_content.encode("utf-8"))
-        lines: list[str] = []
+        root = self.parse(xml_content)
+        visitor = TocVisitor(self)
 
         # 法令タイトル
         law_title = root.find(".//LawTitle")
         if law_title is not None:
-            title = self._get_text(law_title)
-            lines.append(f"# {title}")
-            lines.append("")
+            visitor.lines += (f"# {self._get_text(law_title)}", "")
 
         # 本則の構造を取得
         main_provision = root.find(".//MainProvision")
         if main_provision is not None:
-            lines.extend(self._parse_toc_structure(main_provision))
-
-        return "\n".join(lines)
-
-    def _parse_toc_structure(self, element: etree._Element) -> list[str]:
-        """目次構造をパース（再帰）"""
-        lines: list[str] = []
-
-        for child in element:
-            tag = child.tag
-
-            if tag == "Part":
-                title = child.find("PartTitle")
-                if title is not None:
-                    lines.append(f"# {self._get_text(title)}")
-                lines.extend(self._parse_toc_structure(child))
-
-            elif tag == "Chapter":
-                title = child.find("ChapterTitle")
-                if title is not None:
-                    lines.append(f"## {self._get_text(title)}")
-                lines.extend(self._parse_toc_structure(child))
-
-            elif tag == "Section":
-                title = child.find("SectionTitle")
-                if title is not None:
-                    lines.append(f"### {self._get_text(title)}")
-                lines.extend(self._parse_toc_structure(child))
-
-            elif tag == "Subsection":
-                title = child.find("SubsectionTitle")
-                if title is not None:
-                    lines.append(f"#### {self._get_text(title)}")
-                lines.extend(self._parse_toc_structure(child))
-
-            elif tag == "Article":
-                caption = child.find("ArticleCaption")
-                title = child.find("ArticleTitle")
-                article_text = ""
-                if title is not None:
-                    article_text = self._get_text(title)
-                if caption is not None:
-                    article_text += self._get_text(caption)
-                if article_text:
-                    lines.append(f"- {article_text}")
-
-        return lines
+            self.render(main_provision, visitor)
+
+        return visitor.getvalue()
@@ -3,22 +3,28 @@
 import asyncio
 import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
-from egov_law_mcp.api import EGovAPIError
-from egov_law_mcp.cache import CacheManager
+from egov_law_mcp.api import EGovAPIError, close_shared_http_client, get_shared_http_client
+from egov_law_mcp.cache import BackendCollector, CacheManager, CacheSyncer, FileCacheCollector
 from egov_law_mcp.models import ErrorCode, ErrorDetail, ErrorResponse, LawType
 from egov_law_mcp.tools import (
     get_law_article,
+    get_law_data_many,
     get_law_full_text,
     get_law_revisions,
     keyword_search,
     list_law_types,
+    open_law_full_text,
     search_laws,
+    search_laws_all,
+    wait_background_refreshes,
 )
 
 # ロギング設定
@@ -29,8 +35,36 @@ logger = logging.getLogger(__name__)
 # グローバルキャッシュ
 _cache = CacheManager()
 
+
+@asynccontextmanager
+async def server_lifespan(server: Server) -> AsyncIterator[dict[str, Any]]:
+    """サーバーのライフスパン
+
+    起動時に共有コネクションプールを生成し、更新差分によるキャッシュ同期と
+    ファイルキャッシュ・永続層のGCを開始します。終了時にはいずれも停止し、
+    実行中の法令本文のバックグラウンド更新もキャンセルします。
+    永続層への書き込みが残っていれば、終わるまで待ちます。
+    """
+    get_shared_http_client()
+    syncer = CacheSyncer(_cache)
+    collector = FileCacheCollector(_cache)
+    backend_collector = BackendCollector(_cache)
+    syncer.start()
+    collector.start()
+    backend_collector.start()
+    try:
+        yield {}
+    finally:
+        await backend_collector.stop()
+        await collector.stop()
+        await syncer.stop()
+        await wait_background_refreshes(cancel=True)
+        await close_shared_http_client()
+        await asyncio.to_thread(_cache.flush)
+
+
 # MCPサーバーインスタンス
-app = Server("egov-law-mcp")
+app = Server("egov-law-mcp", lifespan=server_lifespan)
 
 
 @app.list_tools()
@@ -75,6 +109,10 @@ async def handle_list_tools() -> list[Tool]:
                         "description": "ページネーション用オフセット",
                         "default": 0,
                     },
+                    "max_results": {
+                        "type": "integer",
+                        "description": "指定するとページをまたいで最大N件まで取得（最大: 1000）。limit/offsetは無視されます。",
+                    },
                 },
                 "required": ["keyword"],
             },
@@ -91,7 +129,9 @@ async def handle_list_tools() -> list[Tool]:
                     },
                     "article_number": {
                         "type": "string",
-                        "description": "条番号（例: 709, 1）※半角数字推奨",
+                        "description": (
+                            "条番号（例: 709, 1）。枝番は 709_2 または 第七百九条の二 の形式"
+                        ),
                     },
                     "asof": {
                         "type": "string",
@@ -121,10 +161,43 @@ async def handle_list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "施行日時点（YYYY-MM-DD形式）",
                     },
+                    "stream": {
+                        "type": "boolean",
+                        "description": (
+                            "markdown形式の全文を条の区切りで分割し、複数のテキストとして返す"
+                            "（大規模な法令向け）"
+                        ),
+                        "default": False,
+                    },
                 },
                 "required": ["law_id"],
             },
         ),
+        Tool(
+            name="get_law_data_many",
+            description="複数の法令をまとめて取得します。一部の法令が取得できなくても、取得できた法令とエラーを両方返します（最大100件）。",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "law_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "法令IDのリスト",
+                    },
+                    "output_format": {
+                        "type": "string",
+                        "description": "出力形式",
+                        "enum": ["markdown", "toc", "xml_raw"],
+                        "default": "toc",
+                    },
+                    "asof": {
+                        "type": "string",
+                        "description": "施行日時点（YYYY-MM-DD形式）",
+                    },
+                },
+                "required": ["law_ids"],
+            },
+        ),
         Tool(
             name="get_law_revisions",
             description="法令の改正履歴一覧を取得します。過去の施行日を確認するのに使用します。",
@@ -174,6 +247,16 @@ async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[TextCon
         if name == "list_law_types":
             result = list_law_types()
 
+        elif name == "search_laws" and arguments.get("max_results"):
+            result = await search_laws_all(
+                keyword=arguments["keyword"],
+                law_type=arguments.get("law_type"),
+                asof=arguments.get("asof"),
+                max_results=arguments["max_results"],
+                cache=_cache,
+            )
+            result = result.model_dump()
+
         elif name == "search_laws":
             result = await search_laws(
                 keyword=arguments["keyword"],
@@ -193,7 +276,23 @@ async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[TextCon
                 cache=_cache,
             )
             # 条文はMarkdown形式でそのまま返す
-            return [TextContent(type="text", text=result.content)]
+            return [TextContent(type="text", text=result.content, _meta={"stale": result.stale})]
+
+        elif (
+            name == "get_law_full_text"
+            and arguments.get("stream")
+            and arguments.get("output_format", "markdown") == "markdown"
+        ):
+            # 全文を1つの文字列に組み立てず、変換できた順に分割して返す
+            stream = await open_law_full_text(
+                law_id=arguments["law_id"],
+                asof=arguments.get("asof"),
+                cache=_cache,
+            )
+            return [
+                TextContent(type="text", text=chunk, _meta={"stale": stream.stale})
+                for chunk in stream
+            ]
 
         elif name == "get_law_full_text":
             result = await get_law_full_text(
@@ -202,8 +301,17 @@ async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[TextCon
                 asof=arguments.get("asof"),
                 cache=_cache,
             )
-            # 全文は内容のみ返す
-            return [TextContent(type="text", text=result.content)]
+            # 全文は内容のみ返す（期限切れのキャッシュから返したかはメタデータで示す）
+            return [TextContent(type="text", text=result.content, _meta={"stale": result.stale})]
+
+        elif name == "get_law_data_many":
+            result = await get_law_data_many(
+                law_ids=arguments["law_ids"],
+                output_format=arguments.get("output_format", "toc"),
+                asof=arguments.get("asof"),
+                cache=_cache,
+            )
+            result = result.model_dump(mode="json")
 
         elif name == "get_law_revisions":
             result = await get_law_revisions(
@@ -1,16 +1,26 @@
 """tools パッケージ"""
 
 from .article import get_law_article
-from .fulltext import get_law_full_text
+from .bulk import get_law_data_many, iter_law_data_many
+from .fulltext import LawFullTextStream, get_law_full_text, iter_law_full_text, open_law_full_text
 from .keyword import keyword_search
+from .loader import wait_background_refreshes
 from .revisions import get_law_revisions
-from .search import list_law_types, search_laws
+from .search import iter_search_laws, list_law_types, search_laws, search_laws_all
 
 __all__ = [
     "list_law_types",
     "search_laws",
+    "search_laws_all",
+    "iter_search_laws",
     "get_law_article",
     "get_law_full_text",
+    "iter_law_full_text",
+    "open_law_full_text",
+    "LawFullTextStream",
+    "get_law_data_many",
+    "iter_law_data_many",
     "get_law_revisions",
     "keyword_search",
+    "wait_background_refreshes",
 ]
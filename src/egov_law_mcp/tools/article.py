@@ -1,9 +1,13 @@
 """条文取得ツール"""
 
+from typing import Any
+
 from egov_law_mcp.api import EGovAPIClient, EGovAPIError
 from egov_law_mcp.cache import CacheManager
 from egov_law_mcp.models import ErrorCode, LawArticle
-from egov_law_mcp.parser import LawXMLParser
+from egov_law_mcp.parser import LawXMLParser, normalize_article_number
+
+from .loader import load_law_data
 
 
 async def get_law_article(
@@ -17,7 +21,7 @@ async def get_law_article(
 
     Args:
         law_id: 法令ID
-        article_number: 条番号（例: "709", "1"）
+        article_number: 条番号（例: "709", "1", "709_2", "第七百九条の二"）
         asof: 施行日時点（YYYY-MM-DD形式）
         client: APIクライアント（テスト用）
         cache: キャッシュマネージャー（テスト用）
@@ -33,37 +37,40 @@ async def get_law_article(
     if cache is None:
         cache = CacheManager()
 
-    parser = LawXMLParser()
+    # 表記の違う同じ条番号（"709" と "第七百九条" など）でキャッシュを共有する
+    article_key = normalize_article_number(article_number) or article_number
 
-    # キャッシュ確認
-    xml_content = cache.get_law_data(law_id, asof=asof)
+    # 存在しないと分かっている条文はすぐに返す
+    not_found = cache.get_not_found(law_id, asof=asof, article_number=article_key)
+    if not_found is not None:
+        raise EGovAPIError(**not_found)
 
-    # キャッシュミスの場合はAPI呼び出し
-    if xml_content is None:
-        try:
-            xml_content = await client.get_law_data(law_id, asof=asof)
-        except EGovAPIError:
-            raise
+    parser = LawXMLParser()
 
-        # キャッシュ保存
-        cache.set_law_data(law_id, xml_content, asof=asof)
+    # キャッシュ確認（キャッシュミスの場合はAPIからストリーミング取得）
+    law = await load_law_data(law_id, asof, client, cache, parser)
 
     # 法令タイトル取得
-    law_name = parser.get_law_title(xml_content)
+    law_name = law.render("title", lambda document: document.title) or ""
 
-    # 条文抽出
-    article_content = parser.extract_article(xml_content, article_number)
+    # 条文抽出（変換結果は本文ハッシュ単位でキャッシュ）
+    article_content = law.render(
+        "article", lambda document: document.article(article_number), article_key
+    )
 
     if article_content is None:
-        raise EGovAPIError(
-            code=ErrorCode.ARTICLE_NOT_FOUND.value,
-            message=f"Article '{article_number}' not found in Law ID '{law_id}'.",
-            details={"law_id": law_id, "article_number": article_number},
-        )
+        error: dict[str, Any] = {
+            "code": ErrorCode.ARTICLE_NOT_FOUND.value,
+            "message": f"Article '{article_number}' not found in Law ID '{law_id}'.",
+            "details": {"law_id": law_id, "article_number": article_number},
+        }
+        cache.set_not_found(law_id, error, asof=asof, article_number=article_key)
+        raise EGovAPIError(**error)
 
     return LawArticle(
         law_id=law_id,
         law_name=law_name,
         article_number=article_number,
         content=article_content,
+        stale=law.stale,
     )
@@ -0,0 +1,158 @@
+"""法令一括取得ツール"""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator, AsyncIterator
+
+from egov_law_mcp.api import EGovAPIClient, EGovAPIError
+from egov_law_mcp.cache import CacheManager
+from egov_law_mcp.models import (
+    BulkLawError,
+    BulkLawResult,
+    ErrorCode,
+    ErrorDetail,
+    LawFullText,
+)
+
+from .fulltext import get_law_full_text
+
+# 1回の呼び出しで取得できる法令数の上限
+MAX_BULK_LAWS = 100
+
+# 同時に取得する法令数のデフォルト
+DEFAULT_BULK_CONCURRENCY = 5
+
+
+def _unique_law_ids(law_ids: list[str]) -> list[str]:
+    """重複を除いた法令IDを入力順で返す"""
+    ids = list(dict.fromkeys(law_ids))
+    if not ids:
+        raise EGovAPIError(ErrorCode.INVALID_PARAMETER.value, "law_ids must not be empty")
+    if len(ids) > MAX_BULK_LAWS:
+        raise EGovAPIError(
+            ErrorCode.INVALID_PARAMETER.value,
+            f"Too many law_ids (max {MAX_BULK_LAWS})",
+            {"count": len(ids)},
+        )
+    return ids
+
+
+async def iter_law_data_many(
+    law_ids: list[str],
+    output_format: str = "toc",
+    asof: str | None = None,
+    max_concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    client: EGovAPIClient | None = None,
+    cache: CacheManager | None = None,
+) -> AsyncIterator[LawFullText | BulkLawError]:
+    """複数の法令を並列に取得し、完了した順に返す
+
+    取得はキャッシュ経由で行い、同時実行数は `max_concurrency` に制限します。
+    個々の法令の取得エラーは例外にせず `BulkLawError` として返します。
+
+    Args:
+        law_ids: 法令IDのリスト（重複は除外）
+        output_format: 出力形式（"markdown", "toc", "xml_raw"）
+        asof: 施行日時点（YYYY-MM-DD形式）
+        max_concurrency: 同時に取得する法令数
+        client: APIクライアント（テスト用）
+        cache: キャッシュマネージャー（テスト用）
+
+    Yields:
+        取得できた法令全文、または取得エラー
+
+    Raises:
+        EGovAPIError: 法令IDの指定が不正な場合
+    """
+    ids = _unique_law_ids(law_ids)
+    # 打ち切られた場合に内側の取得もすぐに後始末されるよう、明示的に閉じる
+    async with contextlib.aclosing(
+        _iter_law_data(ids, output_format, asof, max_concurrency, client, cache)
+    ) as results:
+        async for result in results:
+            yield result
+
+
+async def _iter_law_data(
+    ids: list[str],
+    output_format: str,
+    asof: str | None,
+    max_concurrency: int,
+    client: EGovAPIClient | None,
+    cache: CacheManager | None,
+) -> AsyncGenerator[LawFullText | BulkLawError, None]:
+    """検証済みの法令IDを並列に取得し、完了した順に返す"""
+    if client is None:
+        client = EGovAPIClient()
+    if cache is None:
+        cache = CacheManager()
+
+    # 永続層（Redisなど）にある法令本文は1往復でまとめて読んでおく
+    # （asof指定時は法令履歴ID単位でキャッシュするため対象外）
+    if asof is None:
+        await cache.aprefetch_law_data(ids)
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def fetch(law_id: str) -> LawFullText | BulkLawError:
+        async with semaphore:
+            try:
+                return await get_law_full_text(
+                    law_id=law_id,
+                    output_format=output_format,
+                    asof=asof,
+                    client=client,
+                    cache=cache,
+                )
+            except EGovAPIError as e:
+                return BulkLawError(
+                    law_id=law_id,
+                    error=ErrorDetail(code=ErrorCode(e.code), message=e.message, details=e.details),
+                )
+
+    tasks = [asyncio.ensure_future(fetch(law_id)) for law_id in ids]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        # 途中で反復を打ち切られた場合は残りの取得をキャンセルし、終わるまで待つ
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def get_law_data_many(
+    law_ids: list[str],
+    output_format: str = "toc",
+    asof: str | None = None,
+    max_concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    client: EGovAPIClient | None = None,
+    cache: CacheManager | None = None,
+) -> BulkLawResult:
+    """複数の法令を並列に取得
+
+    一部の法令の取得に失敗しても、取得できた法令とエラーの両方を返します。
+    結果は入力順に並びます。
+
+    Args:
+        law_ids: 法令IDのリスト（重複は除外、最大100件）
+        output_format: 出力形式（"markdown", "toc", "xml_raw"）
+        asof: 施行日時点（YYYY-MM-DD形式）
+        max_concurrency: 同時に取得する法令数
+        client: APIクライアント（テスト用）
+        cache: キャッシュマネージャー（テスト用）
+
+    Returns:
+        一括取得結果
+
+    Raises:
+        EGovAPIError: 法令IDの指定が不正な場合
+    """
+    ids = _unique_law_ids(law_ids)
+    results: dict[str, LawFullText | BulkLawError] = {}
+    async for result in _iter_law_data(ids, output_format, asof, max_concurrency, client, cache):
+        results[result.law_id] = result
+
+    laws = [r for law_id in ids if isinstance(r := results[law_id], LawFullText)]
+    errors = [r for law_id in ids if isinstance(r := results[law_id], BulkLawError)]
+    return BulkLawResult(total_count=len(ids), laws=laws, errors=errors)
@@ -1,9 +1,16 @@
 """法令全文取得ツール"""
 
-from egov_law_mcp.api import EGovAPIClient, EGovAPIError
+from collections.abc import AsyncIterator, Iterator
+
+from egov_law_mcp.api import EGovAPIClient
 from egov_law_mcp.cache import CacheManager
 from egov_law_mcp.models import LawFullText, OutputFormat
-from egov_law_mcp.parser import LawXMLParser
+from egov_law_mcp.parser import LawDocument, LawXMLParser
+
+from .loader import load_law_data
+
+# 逐次取得で1回に返すMarkdownの目安の文字数
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
 
 
 async def get_law_full_text(
@@ -41,33 +48,120 @@ async def get_law_full_text(
     except ValueError:
         fmt = OutputFormat.MARKDOWN
 
-    # キャッシュ確認
-    xml_content = cache.get_law_data(law_id, asof=asof)
-
-    # キャッシュミスの場合はAPI呼び出し
-    if xml_content is None:
-        try:
-            xml_content = await client.get_law_data(law_id, asof=asof)
-        except EGovAPIError:
-            raise
-
-        # キャッシュ保存
-        cache.set_law_data(law_id, xml_content, asof=asof)
+    # キャッシュ確認（キャッシュミスの場合はAPIからストリーミング取得）
+    law = await load_law_data(law_id, asof, client, cache, parser)
 
     # 法令タイトル取得
-    law_name = parser.get_law_title(xml_content)
+    law_name = law.render("title", lambda document: document.title) or ""
 
-    # フォーマットに応じて変換
+    # フォーマットに応じて変換（変換結果は本文ハッシュ単位でキャッシュ）
     if fmt == OutputFormat.XML_RAW:
-        content = xml_content
+        content = law.content
     elif fmt == OutputFormat.TOC:
-        content = parser.parse_toc(xml_content)
+        content = law.render("toc", LawDocument.toc) or ""
     else:  # markdown
-        content = parser.parse_full_text(xml_content)
+        content = law.render("markdown", LawDocument.full_text) or ""
 
     return LawFullText(
         law_id=law_id,
         law_name=law_name,
         format=fmt,
         content=content,
+        stale=law.stale,
     )
+
+
+class LawFullTextStream:
+    """Markdown形式で少しずつ取り出す法令全文
+
+    `stale` は期限切れのキャッシュから返した場合にTrueになります。
+    """
+
+    def __init__(self, chunks: Iterator[str], stale: bool = False) -> None:
+        self._chunks = chunks
+        self.stale = stale
+
+    def __iter__(self) -> Iterator[str]:
+        return self._chunks
+
+
+async def open_law_full_text(
+    law_id: str,
+    asof: str | None = None,
+    chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    client: EGovAPIClient | None = None,
+    cache: CacheManager | None = None,
+) -> LawFullTextStream:
+    """法令全文をMarkdown形式で少しずつ取り出せるように開く
+
+    変換済みの全文がキャッシュにあれば、それを `chunk_size` 文字ずつ返します。
+    ダウンロードと並行してパース済みの文書があれば、XMLをパースし直さずにそこから変換します。
+    どちらも無ければ、ツリー全体を作らずに変換できた条の単位で `chunk_size` 文字程度ずつ
+    返します（変換中のメモリ使用量は法令の大きさによらずほぼ一定）。
+
+    Args:
+        law_id: 法令ID
+        asof: 施行日時点（YYYY-MM-DD形式）
+        chunk_size: 1回に返す文字数の目安
+        client: APIクライアント（テスト用）
+        cache: キャッシュマネージャー（テスト用）
+
+    Returns:
+        Markdown形式の法令全文のチャンク（連結すると `get_law_full_text` の結果と一致）
+
+    Raises:
+        EGovAPIError: API呼び出しエラー
+    """
+    if client is None:
+        client = EGovAPIClient()
+    if cache is None:
+        cache = CacheManager()
+    chunk_size = max(1, chunk_size)
+
+    parser = LawXMLParser()
+    law = await load_law_data(law_id, asof, client, cache, parser)
+
+    cached = cache.get_derived(law.content_hash, parser.RENDERER_VERSION, "markdown")
+    if cached is None and law.parsed_document is not None:
+        cached = law.render("markdown", LawDocument.full_text) or ""
+    if cached is not None:
+        text = cached
+        pieces: Iterator[str] = (
+            text[offset : offset + chunk_size] for offset in range(0, len(text), chunk_size)
+        )
+        return LawFullTextStream(pieces, stale=law.stale)
+
+    def iter_chunks() -> Iterator[str]:
+        buffer: list[str] = []
+        size = 0
+        for piece in parser.iter_full_text(law.content):
+            buffer.append(piece)
+            size += len(piece)
+            if size >= chunk_size:
+                yield "".join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield "".join(buffer)
+
+    return LawFullTextStream(iter_chunks(), stale=law.stale)
+
+
+async def iter_law_full_text(
+    law_id: str,
+    asof: str | None = None,
+    chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    client: EGovAPIClient | None = None,
+    cache: CacheManager | None = None,
+) -> AsyncIterator[str]:
+    """法令全文をMarkdown形式で少しずつ返す（`open_law_full_text` の非同期イテレータ版）
+
+    Yields:
+        Markdown形式の法令全文のチャンク（連結すると `get_law_full_text` の結果と一致）
+
+    Raises:
+        EGovAPIError: API呼び出しエラー
+    """
+    stream = await open_law_full_text(law_id, asof, chunk_size, client, cache)
+    for chunk in stream:
+        yield chunk
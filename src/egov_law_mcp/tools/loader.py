@@ -0,0 +1,278 @@
+"""法令本文の取得ヘルパー（キャッシュ・ストリーミング対応）"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from lxml import etree
+
+from egov_law_mcp.api import EGovAPIClient, EGovAPIError
+from egov_law_mcp.cache import CacheManager, compute_content_hash
+from egov_law_mcp.models import ErrorCode
+from egov_law_mcp.parser import LawDocument, LawXMLParser
+
+from .revisions import get_law_revisions, resolve_revision_id
+
+logger = logging.getLogger(__name__)
+
+# APIエラー時に期限切れのキャッシュを返すエラー
+# （404は法令自体が無くなった可能性があるため対象外）
+STALE_IF_ERROR_CODES = frozenset(
+    {
+        ErrorCode.API_CONNECTION_ERROR.value,
+        ErrorCode.INTERNAL_ERROR.value,
+        ErrorCode.RATE_LIMIT_EXCEEDED.value,
+    }
+)
+
+# 実行中のバックグラウンド更新（タスクが途中で破棄されないよう参照を保持する）
+_background_refreshes: dict[Any, asyncio.Task[None]] = {}
+
+
+class LoadedLawData:
+    """取得した法令本文
+
+    パースは必要になった時点で1回だけ行い、パース済みの文書は本文ハッシュ単位で
+    キャッシュします（同じ法令を続けて参照してもパースし直さない）。
+    派生データがキャッシュにあればパース自体を省略できます。
+    `stale` は期限切れのキャッシュから返した場合にTrueになります。
+    """
+
+    def __init__(
+        self,
+        content: str,
+        parser: LawXMLParser,
+        cache: CacheManager,
+        content_hash: str | None = None,
+        root: etree._Element | None = None,
+        stale: bool = False,
+    ) -> None:
+        self.content = content
+        self.parser = parser
+        self.cache = cache
+        self.stale = stale
+        self._content_hash = content_hash or None
+        self._document: LawDocument | None = None
+        if root is not None:
+            # ダウンロードと並行してパース済み
+            self._document = LawDocument(root, parser, source_size=len(content))
+            cache.set_document(self.content_hash, self._document, self._document.memory_size)
+
+    @property
+    def content_hash(self) -> str:
+        """法令本文のハッシュ"""
+        if self._content_hash is None:
+            self._content_hash = compute_content_hash(self.content)
+        return self._content_hash
+
+    @property
+    def parsed_document(self) -> LawDocument | None:
+        """パース済みの文書（無ければNone。パースはしない）"""
+        if self._document is None:
+            self._document = self.cache.get_document(self.content_hash)
+        return self._document
+
+    @property
+    def document(self) -> LawDocument:
+        """パース済みの文書（キャッシュに無ければパースする）"""
+        if self._document is None:
+            document = self.cache.get_document(self.content_hash)
+            if document is None:
+                document = LawDocument.parse(self.content, self.parser)
+                self.cache.set_document(self.content_hash, document, document.memory_size)
+            self._document = document
+        return self._document
+
+    def render(
+        self,
+        fmt: str,
+        render: Callable[[LawDocument], str | None],
+        *args: str,
+    ) -> str | None:
+        """派生データを (本文ハッシュ, 変換バージョン, 形式) をキーにキャッシュして取得
+
+        Args:
+            fmt: 派生データの種類（"markdown", "toc", "article" など）
+            render: パース済みの文書から派生データを生成する関数
+            args: 種類ごとの追加キー（条番号など）
+
+        Returns:
+            派生データ（生成できない場合はNone）
+        """
+        version = self.parser.RENDERER_VERSION
+        cached = self.cache.get_derived(self.content_hash, version, fmt, *args)
+        if cached is not None:
+            return cached
+        value = render(self.document)
+        if value is not None:
+            self.cache.set_derived(self.content_hash, version, fmt, *args, value=value)
+        return value
+
+
+def _refresh_in_background(key: Any, law_id: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+    """法令本文・改正履歴をバックグラウンドで取得し直す（同じキーの更新が実行中なら何もしない）"""
+    if key in _background_refreshes:
+        return
+
+    async def refresh() -> None:
+        try:
+            await fetch()
+        except EGovAPIError as e:
+            logger.warning("Background refresh for law %s failed: %s", law_id, e.message)
+        except Exception:
+            logger.exception("Background refresh for law %s failed", law_id)
+        finally:
+            _background_refreshes.pop(key, None)
+
+    _background_refreshes[key] = asyncio.create_task(refresh())
+
+
+async def _resolve_revision_id(
+    law_id: str, asof: str, client: EGovAPIClient, cache: CacheManager
+) -> str | None:
+    """施行日時点を法令履歴IDに変換
+
+    改正履歴の期限が切れていても、以前に求めた法令履歴IDがあれば待たせずにそれを返し、
+    改正履歴は裏で取得し直します。
+    """
+    if await cache.aget_revisions(law_id) is None:
+        revision_id = await cache.aget_revision_id(law_id, asof)
+        if revision_id is not None:
+            key = ("get_law_revisions", client.base_url, id(cache), law_id)
+            _refresh_in_background(key, law_id, lambda: get_law_revisions(law_id, client, cache))
+            return revision_id
+    return await resolve_revision_id(law_id, asof, client, cache)
+
+
+async def wait_background_refreshes(cancel: bool = False) -> None:
+    """実行中のバックグラウンド更新がすべて終わるまで待つ
+
+    Args:
+        cancel: 完了を待たずにキャンセルする（サーバー終了時）
+    """
+    while _background_refreshes:
+        tasks = list(_background_refreshes.values())
+        if cancel:
+            for task in tasks:
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for key, task in list(_background_refreshes.items()):
+            if task.done():
+                del _background_refreshes[key]
+
+
+async def load_law_data(
+    law_id: str,
+    asof: str | None,
+    client: EGovAPIClient,
+    cache: CacheManager,
+    parser: LawXMLParser,
+) -> LoadedLawData:
+    """法令本文を取得する
+
+    キャッシュにあればそれを使い、無ければAPIからストリーミングで取得します。
+    ダウンロード中のチャンクはそのままパーサーとキャッシュに流し込むため、
+    ボディ全体を文字列として保持してから再エンコード・パースすることはありません。
+    同じ法令を同時に要求された場合はダウンロードを1回にまとめます。
+    期限切れのキャッシュが検証子を持っている場合は条件付きGETで再検証し、
+    未更新（304）ならボディを再取得せずにTTLだけを延長します。
+    存在しない法令（404）は短いTTLでネガティブキャッシュし、繰り返しAPIを呼びません。
+    施行日時点（asof）は改正履歴から法令履歴IDに変換し、法令履歴ID単位でキャッシュします。
+    改正履歴の期限が切れている場合は以前に求めた法令履歴IDを使い、改正履歴は裏で取得し直します。
+
+    TTLを過ぎたエントリは次のように扱います（結果の `stale` がTrueになる）。
+    - TTL後 `cache.stale_while_revalidate` 秒以内: そのまま返し、バックグラウンドで更新
+    - TTL後 `cache.stale_if_error` 秒以内: 取得し直し、APIエラーなら期限切れのまま返す
+
+    Args:
+        law_id: 法令ID
+        asof: 施行日時点（YYYY-MM-DD形式）
+        client: APIクライアント
+        cache: キャッシュマネージャー
+        parser: XMLパーサー
+
+    Returns:
+        取得した法令本文
+
+    Raises:
+        EGovAPIError: API呼び出しエラー
+    """
+    # 日付ごとではなく法令履歴ごとにキャッシュし、同じ改正の施行期間内の日付で共有する
+    # （存在しないと分かっている法令は改正履歴も問い合わせない）
+    revision_id: str | None = None
+    if asof and cache.get_not_found(law_id, asof=asof) is None:
+        revision_id = await _resolve_revision_id(law_id, asof, client, cache)
+
+    entry = await cache.aget_law_data_entry(law_id, asof=asof, revision_id=revision_id)
+    if entry is not None and entry.is_fresh:
+        return LoadedLawData(entry.content, parser, cache, content_hash=entry.content_hash)
+    if entry is None:
+        not_found = cache.get_not_found(law_id, asof=asof)
+        if not_found is not None:
+            raise EGovAPIError(**not_found)
+
+    # 期限切れエントリの検証子で条件付きGET
+    validated = entry if entry is not None and entry.has_validators else None
+
+    async def download() -> LoadedLawData:
+        # 法令履歴IDが分かっていれば、その版を直接取得する
+        async with client.stream_law_data(
+            revision_id or law_id,
+            asof=None if revision_id else asof,
+            etag=validated.etag if validated else None,
+            last_modified=validated.last_modified if validated else None,
+        ) as response:
+            if response.status_code == 304 and validated is not None:
+                await cache.arenew_law_data(law_id, asof=asof, revision_id=revision_id)
+                return LoadedLawData(
+                    validated.content, parser, cache, content_hash=validated.content_hash
+                )
+
+            writer = cache.open_law_data_writer(
+                law_id,
+                asof=asof,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                revision_id=revision_id,
+            )
+            try:
+                root = await parser.parse_stream(response.aiter_bytes(), sink=writer.write)
+            except BaseException:
+                writer.abort()
+                raise
+            return LoadedLawData(writer.commit(), parser, cache, root=root)
+
+    key = (
+        "load_law_data",
+        client.base_url,
+        id(cache),
+        law_id,
+        None if revision_id else asof,
+        revision_id,
+    )
+
+    # 期限切れ直後のエントリは待たせずに返し、裏で取得し直す
+    if entry is not None and entry.is_within(cache.stale_while_revalidate):
+        _refresh_in_background(key, law_id, lambda: client.single_flight.do(key, download))
+        return LoadedLawData(
+            entry.content, parser, cache, content_hash=entry.content_hash, stale=True
+        )
+
+    try:
+        return await client.single_flight.do(key, download)
+    except EGovAPIError as e:
+        if e.code == ErrorCode.LAW_NOT_FOUND.value:
+            cache.set_not_found(
+                law_id, {"code": e.code, "message": e.message, "details": e.details}, asof=asof
+            )
+        elif (
+            entry is not None
+            and e.code in STALE_IF_ERROR_CODES
+            and entry.is_within(cache.stale_if_error)
+        ):
+            logger.warning("Serving stale law data %s: %s", law_id, e.message)
+            return LoadedLawData(
+                entry.content, parser, cache, content_hash=entry.content_hash, stale=True
+            )
+        raise
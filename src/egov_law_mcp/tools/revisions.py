@@ -1,6 +1,8 @@
 """法令改正履歴取得ツール"""
 
+from bisect import bisect_right
 from datetime import date
+from typing import Any
 
 from egov_law_mcp.api import EGovAPIClient, EGovAPIError
 from egov_law_mcp.cache import CacheManager
@@ -31,7 +33,7 @@ async def get_law_revisions(
         cache = CacheManager()
 
     # キャッシュ確認
-    cached = cache.get_revisions(law_id)
+    cached = await cache.aget_revisions(law_id)
     if cached:
         return LawRevisionsResult(**cached)
 
@@ -79,3 +81,79 @@ async def get_law_revisions(
     cache.set_revisions(law_id, result.model_dump(mode="json"))
 
     return result
+
+
+class RevisionTimeline:
+    """施行日順に並べた改正履歴
+
+    施行日時点（asof）から、その時点で有効な法令履歴IDを二分探索で求めます。
+    """
+
+    def __init__(self, revisions: list[dict[str, Any]]) -> None:
+        """
+        Args:
+            revisions: `LawRevisionsResult` の `revisions`（JSON形式）
+        """
+        by_date: dict[date, set[str]] = {}
+        for revision in revisions:
+            revision_id = revision.get("revision_id")
+            enforced_date = revision.get("enforced_date")
+            if not revision_id or not enforced_date:
+                continue
+            try:
+                day = date.fromisoformat(str(enforced_date))
+            except ValueError:
+                continue
+            by_date.setdefault(day, set()).add(revision_id)
+        self._dates = sorted(by_date)
+        # 同じ施行日に複数の履歴がある場合はどれが有効か決められないためNone
+        self._ids = [
+            next(iter(by_date[day])) if len(by_date[day]) == 1 else None for day in self._dates
+        ]
+
+    def resolve(self, asof: date) -> str | None:
+        """施行日時点で有効な法令履歴ID（決められない場合はNone）"""
+        index = bisect_right(self._dates, asof) - 1
+        if index < 0:
+            return None
+        return self._ids[index]
+
+
+async def resolve_revision_id(
+    law_id: str,
+    asof: str,
+    client: EGovAPIClient,
+    cache: CacheManager,
+) -> str | None:
+    """施行日時点を、その時点で有効な法令履歴IDに変換
+
+    改正履歴はキャッシュ済みのものを使い、無ければ取得してキャッシュします。
+    同じ改正の施行期間内の日付はすべて同じ法令履歴IDになるため、
+    法令本文のキャッシュを日付をまたいで共有できます。
+    求めた法令履歴IDは改正履歴とは別に記録し、改正履歴を取得できない場合に使います。
+
+    Args:
+        law_id: 法令ID
+        asof: 施行日時点（YYYY-MM-DD形式）
+        client: APIクライアント
+        cache: キャッシュマネージャー
+
+    Returns:
+        法令履歴ID。履歴を取得できない・決められない場合はNone
+    """
+    try:
+        day = date.fromisoformat(asof)
+    except ValueError:
+        return None
+
+    cached = await cache.aget_revisions(law_id)
+    if cached is None:
+        try:
+            cached = (await get_law_revisions(law_id, client, cache)).model_dump(mode="json")
+        except EGovAPIError:
+            # 改正履歴を取得できなくても、以前に求めた法令履歴IDがあればそれを使う
+            return await cache.aget_revision_id(law_id, asof)
+    revision_id = RevisionTimeline(cached.get("revisions", [])).resolve(day)
+    if revision_id is not None and await cache.aget_revision_id(law_id, asof) != revision_id:
+        cache.set_revision_id(law_id, asof, revision_id)
+    return revision_id
@@ -1,9 +1,23 @@
 """法令検索ツール"""
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+
 from egov_law_mcp.api import EGovAPIClient, EGovAPIError
 from egov_law_mcp.cache import CacheManager
 from egov_law_mcp.models import LawInfo, LawSearchResult, LawType
 
+# APIの1ページあたりの最大取得件数
+SEARCH_PAGE_SIZE = 100
+
+# ページをまたいで取得できる件数の上限
+MAX_SEARCH_RESULTS = 1000
+
+# search_laws_all で同時に取得するページ数
+# （件数の少ない検索で、存在しないページまで一度に問い合わせないように）
+SEARCH_PAGE_WINDOW = 3
+
 
 def list_law_types() -> dict[str, str]:
     """法令種別一覧を取得
@@ -46,7 +60,9 @@ async def search_laws(
         cache = CacheManager()
 
     # キャッシュ確認
-    cached = cache.get_search_result(keyword, law_type=law_type, asof=asof, limit=limit, offset=offset)
+    cached = await cache.aget_search_result(
+        keyword, law_type=law_type, asof=asof, limit=limit, offset=offset
+    )
     if cached:
         return LawSearchResult(**cached)
 
@@ -92,3 +108,138 @@ async def search_laws(
     )
 
     return result
+
+
+async def iter_search_laws(
+    keyword: str,
+    law_type: str | None = None,
+    asof: str | None = None,
+    page_size: int = SEARCH_PAGE_SIZE,
+    client: EGovAPIClient | None = None,
+    cache: CacheManager | None = None,
+) -> AsyncIterator[LawInfo]:
+    """該当する法令を全ページにわたって順に返す
+
+    現在のページを返している間に次のページを先読みするため、
+    ページごとの往復待ちが重なりません。各ページはキャッシュされます。
+
+    Args:
+        keyword: 検索キーワード
+        law_type: 法令種別
+        asof: 施行日時点（YYYY-MM-DD形式）
+        page_size: 1ページあたりの取得件数（最大: 100）
+        client: APIクライアント（テスト用）
+        cache: キャッシュマネージャー（テスト用）
+
+    Yields:
+        法令情報
+
+    Raises:
+        EGovAPIError: API呼び出しエラー
+    """
+    if client is None:
+        client = EGovAPIClient()
+    if cache is None:
+        cache = CacheManager()
+    page_size = min(max(1, page_size), SEARCH_PAGE_SIZE)
+
+    def fetch_page(offset: int) -> asyncio.Future[LawSearchResult]:
+        return asyncio.ensure_future(
+            search_laws(
+                keyword,
+                law_type=law_type,
+                asof=asof,
+                limit=page_size,
+                offset=offset,
+                client=client,
+                cache=cache,
+            )
+        )
+
+    offset = 0
+    pending: asyncio.Future[LawSearchResult] | None = fetch_page(offset)
+    try:
+        while pending is not None:
+            page = await pending
+            pending = None
+            # 1ページ分揃っていれば続きがあるとみなして先読みする
+            if len(page.laws) >= page_size:
+                offset += page_size
+                pending = fetch_page(offset)
+            for law in page.laws:
+                yield law
+    finally:
+        # 打ち切られた場合は先読み中のページを取り消し、終わるまで待つ
+        if pending is not None:
+            pending.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await pending
+
+
+async def search_laws_all(
+    keyword: str,
+    law_type: str | None = None,
+    asof: str | None = None,
+    max_results: int = SEARCH_PAGE_SIZE,
+    client: EGovAPIClient | None = None,
+    cache: CacheManager | None = None,
+) -> LawSearchResult:
+    """ページをまたいで最大 `max_results` 件の法令を検索
+
+    1ページ目で続きがあると分かった場合、残りのページは `SEARCH_PAGE_WINDOW` ページずつ
+    並列に取得し、件数が足りないページが出たところで打ち切ります
+    （同時実行数はAPIクライアントのレート制限に従います）。
+
+    Args:
+        keyword: 検索キーワード
+        law_type: 法令種別
+        asof: 施行日時点（YYYY-MM-DD形式）
+        max_results: 取得件数上限（最大: 1000）
+        client: APIクライアント（テスト用）
+        cache: キャッシュマネージャー（テスト用）
+
+    Returns:
+        法令検索結果
+
+    Raises:
+        EGovAPIError: API呼び出しエラー
+    """
+    if client is None:
+        client = EGovAPIClient()
+    if cache is None:
+        cache = CacheManager()
+    max_results = min(max(1, max_results), MAX_SEARCH_RESULTS)
+    page_size = min(max_results, SEARCH_PAGE_SIZE)
+
+    first = await search_laws(
+        keyword, law_type=law_type, asof=asof, limit=page_size, offset=0, client=client, cache=cache
+    )
+    laws = list(first.laws)
+    offsets = range(page_size, max_results, page_size)
+    more = len(first.laws) >= page_size
+    for start in range(0, len(offsets), SEARCH_PAGE_WINDOW):
+        if not more:
+            break
+        pages = await asyncio.gather(
+            *(
+                search_laws(
+                    keyword,
+                    law_type=law_type,
+                    asof=asof,
+                    limit=page_size,
+                    offset=offset,
+                    client=client,
+                    cache=cache,
+                )
+                for offset in offsets[start : start + SEARCH_PAGE_WINDOW]
+            )
+        )
+        # 件数が足りないページがあれば、そこで打ち切る
+        for page in pages:
+            laws.extend(page.laws)
+            if len(page.laws) < page_size:
+                more = False
+                break
+
+    laws = laws[:max_results]
+    return LawSearchResult(total_count=len(laws), laws=laws)
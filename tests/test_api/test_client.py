@@ -1,10 +1,20 @@
 """e-Gov APIクライアントのユニットテスト (TDD)"""
 
+import asyncio
+import threading
+
+import httpx
 import pytest
 import respx
 from httpx import Response
 
-from egov_law_mcp.api.client import EGovAPIClient, EGovAPIError
+from egov_law_mcp.api.client import (
+    EGovAPIClient,
+    EGovAPIError,
+    close_shared_http_client,
+    create_http_client,
+    get_shared_http_client,
+)
 
 
 class TestEGovAPIClient:
@@ -98,6 +108,35 @@ class TestEGovAPIClient:
 
         assert exc_info.value.code == "E002"
 
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_stream_law_data(self, client: EGovAPIClient) -> None:
+        """法令本文をストリーミング取得できる"""
+        mock_xml = "<Law><LawBody><LawTitle>民法</LawTitle></LawBody></Law>"
+
+        respx.get("https://laws.e-gov.go.jp/api/2/law_data/329AC0000000089").mock(
+            return_value=Response(200, content=mock_xml.encode("utf-8"))
+        )
+
+        async with client.stream_law_data("329AC0000000089") as response:
+            chunks = [chunk async for chunk in response.aiter_bytes()]
+
+        assert b"".join(chunks).decode("utf-8") == mock_xml
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_stream_law_data_not_found(self, client: EGovAPIClient) -> None:
+        """ストリーミング取得でも404はE002になる"""
+        respx.get("https://laws.e-gov.go.jp/api/2/law_data/INVALID_ID").mock(
+            return_value=Response(404, json={"error": "Not found"})
+        )
+
+        with pytest.raises(EGovAPIError) as exc_info:
+            async with client.stream_law_data("INVALID_ID"):
+                pass
+
+        assert exc_info.value.code == "E002"
+
     @respx.mock
     @pytest.mark.asyncio
     async def test_get_law_revisions_success(self, client: EGovAPIClient) -> None:
@@ -176,3 +215,101 @@ class TestEGovAPIClient:
         """カスタムベースURL設定"""
         custom_client = EGovAPIClient(base_url="https://custom.example.com/api")
         assert custom_client.base_url == "https://custom.example.com/api"
+
+
+class TestSharedHTTPClient:
+    """共有コネクションプールのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_instances_share_pool(self) -> None:
+        """複数インスタンスが同じプールを使う"""
+        first = EGovAPIClient()
+        second = EGovAPIClient()
+
+        assert first._get_http_client() is second._get_http_client()
+        assert first._get_http_client() is get_shared_http_client()
+
+        await close_shared_http_client()
+
+    @pytest.mark.asyncio
+    async def test_close_and_recreate(self) -> None:
+        """クローズ後は新しいプールが生成される"""
+        pool = get_shared_http_client()
+        await close_shared_http_client()
+
+        assert pool.is_closed
+        assert get_shared_http_client() is not pool
+
+        await close_shared_http_client()
+
+    def test_loop_change_closes_pool_on_closed_loop(self) -> None:
+        """ループが変わったら古いプールを閉じる（元のループが閉じている場合）"""
+
+        async def get() -> httpx.AsyncClient:
+            return get_shared_http_client()
+
+        old = asyncio.run(get())
+        new = asyncio.run(get())
+        assert new is not old
+        asyncio.run(close_shared_http_client())
+
+        assert old.is_closed
+        assert new.is_closed
+
+    def test_loop_change_closes_pool_on_stopped_loop(self) -> None:
+        """ループが変わったら古いプールを閉じる（元のループが止まっているが閉じていない場合）"""
+
+        async def get() -> httpx.AsyncClient:
+            return get_shared_http_client()
+
+        other = asyncio.new_event_loop()
+        try:
+            old = other.run_until_complete(get())
+            new = asyncio.run(get())
+            assert new is not old
+            asyncio.run(close_shared_http_client())
+        finally:
+            other.close()
+
+        assert old.is_closed
+        assert new.is_closed
+
+    @pytest.mark.asyncio
+    async def test_loop_change_closes_pool_on_running_loop(self) -> None:
+        """ループが変わったら古いプールを閉じる（元のループが動いている場合）"""
+        other = asyncio.new_event_loop()
+        thread = threading.Thread(target=other.run_forever, daemon=True)
+        thread.start()
+        try:
+
+            async def get() -> httpx.AsyncClient:
+                return get_shared_http_client()
+
+            old = asyncio.run_coroutine_threadsafe(get(), other).result()
+            get_shared_http_client()
+            for _ in range(100):
+                if old.is_closed:
+                    break
+                await asyncio.sleep(0.01)
+            assert old.is_closed
+        finally:
+            other.call_soon_threadsafe(other.stop)
+            thread.join()
+            other.close()
+            await close_shared_http_client()
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_explicit_http_client(self) -> None:
+        """明示的に渡したHTTPクライアントが使われる"""
+        respx.get("https://laws.e-gov.go.jp/api/2/laws").mock(
+            return_value=Response(200, json={"laws": []})
+        )
+
+        async with create_http_client(max_connections=2, http2=False) as http_client:
+            client = EGovAPIClient(http_client=http_client)
+            assert client._get_http_client() is http_client
+
+            result = await client.search_laws(keyword="民法")
+
+        assert result == {"laws": []}
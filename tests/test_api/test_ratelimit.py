@@ -0,0 +1,204 @@
+"""レートリミッターのユニットテスト"""
+
+import asyncio
+import time
+
+import pytest
+import respx
+from httpx import Response
+
+from egov_law_mcp.api.client import EGovAPIClient
+from egov_law_mcp.api.ratelimit import (
+    AdaptiveConcurrencyLimiter,
+    TokenBucketRateLimiter,
+    get_rate_limiter,
+)
+from egov_law_mcp.api.resilience import CircuitBreaker, RetryPolicy
+
+
+class TestTokenBucketRateLimiter:
+    """TokenBucketRateLimiterのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_not_delayed(self) -> None:
+        """バースト容量内のリクエストは待機しない"""
+        limiter = TokenBucketRateLimiter(rate=10, burst=3)
+
+        start = time.monotonic()
+        for _ in range(3):
+            async with limiter.acquire():
+                pass
+
+        assert time.monotonic() - start < 0.05
+
+    @pytest.mark.asyncio
+    async def test_rate_is_enforced_after_burst(self) -> None:
+        """バーストを超えるとレートに従って待機する"""
+        limiter = TokenBucketRateLimiter(rate=20, burst=1)
+
+        start = time.monotonic()
+        for _ in range(3):
+            async with limiter.acquire():
+                pass
+
+        # 1件目は即時、残り2件は 1/20 秒ずつ待機
+        assert time.monotonic() - start >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_max_concurrency(self) -> None:
+        """同時実行数が上限を超えない"""
+        limiter = TokenBucketRateLimiter(rate=1000, burst=100, max_concurrency=2)
+        running = 0
+        peak = 0
+
+        async def worker() -> None:
+            nonlocal running, peak
+            async with limiter.acquire():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(worker() for _ in range(6)))
+
+        assert peak == 2
+        assert limiter.stats()["in_flight"] == 0
+
+    def test_invalid_rate(self) -> None:
+        """レートは正の値でなければならない"""
+        with pytest.raises(ValueError):
+            TokenBucketRateLimiter(rate=0)
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """AdaptiveConcurrencyLimiterのテスト"""
+
+    def test_additive_increase(self) -> None:
+        """速い成功が続くと上限が増える"""
+        limiter = AdaptiveConcurrencyLimiter(max_limit=10, initial_limit=2, latency_target=1.0)
+        for _ in range(20):
+            limiter.record_success(0.05)
+
+        assert limiter.limit > 2
+        assert limiter.limit <= 10
+
+    def test_multiplicative_decrease(self) -> None:
+        """429/タイムアウトで上限が半減する（1往復に1回まで）"""
+        limiter = AdaptiveConcurrencyLimiter(max_limit=20, initial_limit=16)
+
+        limiter.record_overload()
+        assert limiter.limit == 8
+        # 同じ往復内の連続した過負荷では何重にも減らさない
+        limiter.record_overload()
+        assert limiter.limit == 8
+
+    def test_never_below_min(self) -> None:
+        """下限を下回らない"""
+        limiter = AdaptiveConcurrencyLimiter(min_limit=2, initial_limit=2)
+        limiter.record_overload()
+        assert limiter.limit == 2
+
+    def test_slow_responses_do_not_increase(self) -> None:
+        """目標応答時間を超える間は上限を増やさない"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, latency_target=0.1)
+        for _ in range(10):
+            limiter.record_success(0.5)
+        assert limiter.limit <= 4
+
+    @pytest.mark.asyncio
+    async def test_enforces_current_limit(self) -> None:
+        """同時実行数が現在の上限を超えない"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=3)
+        running = 0
+        peak = 0
+
+        async def worker() -> None:
+            nonlocal running, peak
+            async with limiter.acquire():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(worker() for _ in range(9)))
+
+        assert peak == 3
+        assert limiter.stats()["in_flight"] == 0
+
+    def test_initial_limit_is_clamped(self, caplog: pytest.LogCaptureFixture) -> None:
+        """初期値が範囲外なら上限・下限に丸めて警告する"""
+        limiter = AdaptiveConcurrencyLimiter(max_limit=20, initial_limit=50)
+
+        assert limiter.limit == 20
+        assert "outside" in caplog.text
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimiter(min_limit=5, max_limit=2)
+
+    @pytest.mark.asyncio
+    async def test_rate_is_enforced(self) -> None:
+        """rate指定時は同時実行数とあわせて秒間リクエスト数も制限する"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, rate=20, burst=2)
+
+        start = time.monotonic()
+        for _ in range(4):
+            async with limiter.acquire():
+                pass
+
+        # バースト2件の後、残り2件は1/20秒ずつ待つ
+        assert time.monotonic() - start >= 0.09
+        assert limiter.stats()["rate"] == 20
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_client_feeds_limiter(self) -> None:
+        """クライアントが429を過負荷として報告する"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+        client = EGovAPIClient(
+            rate_limiter=limiter,
+            retry_policy=RetryPolicy(max_retries=1),
+            circuit_breaker=CircuitBreaker(),
+        )
+        respx.get("https://laws.e-gov.go.jp/api/2/laws").mock(
+            side_effect=[
+                Response(429, headers={"Retry-After": "0"}),
+                Response(200, json={"laws": []}),
+            ]
+        )
+
+        await client.search_laws(keyword="民法")
+
+        assert limiter.limit == 4
+        assert limiter.stats()["latency_ewma"] is not None
+
+
+class TestSharedRateLimiter:
+    """プロセス共有リミッターのテスト"""
+
+    def test_same_config_returns_same_instance(self) -> None:
+        """同じ設定なら同じインスタンス"""
+        assert get_rate_limiter(5, burst=5, max_concurrency=5) is get_rate_limiter(
+            5, burst=5, max_concurrency=5
+        )
+
+    def test_clients_share_limiter(self) -> None:
+        """クライアントインスタンス間でリミッターが共有される"""
+        assert EGovAPIClient().rate_limiter is EGovAPIClient().rate_limiter
+
+    def test_adaptive_mode(self) -> None:
+        """adaptive指定でAIMDリミッターが共有される"""
+        first = EGovAPIClient(adaptive=True)
+        second = EGovAPIClient(adaptive=True)
+
+        assert isinstance(first.rate_limiter, AdaptiveConcurrencyLimiter)
+        assert first.rate_limiter is second.rate_limiter
+        assert first.rate_limiter.stats()["rate"] == first.rate_limit
+
+    def test_adaptive_mode_clamps_max_concurrency(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """同時実行数の設定が自動調整の上限を超えていても起動できる"""
+        monkeypatch.setenv("EGOV_API_MAX_CONCURRENCY", "50")
+        monkeypatch.setenv("EGOV_API_ADAPTIVE_MAX_CONCURRENCY", "20")
+
+        limiter = EGovAPIClient(adaptive=True).rate_limiter
+
+        assert isinstance(limiter, AdaptiveConcurrencyLimiter)
+        assert limiter.limit == 20
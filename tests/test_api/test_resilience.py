@@ -0,0 +1,212 @@
+"""リトライ・サーキットブレーカーのユニットテスト"""
+
+import asyncio
+import time
+
+import pytest
+import respx
+from httpx import Request, Response
+
+from egov_law_mcp.api.client import EGovAPIClient, EGovAPIError
+from egov_law_mcp.api.resilience import (
+    CircuitBreaker,
+    CircuitState,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+
+class TestParseRetryAfter:
+    """parse_retry_afterのテスト"""
+
+    def test_seconds(self) -> None:
+        assert parse_retry_after("3") == 3.0
+
+    def test_http_date(self) -> None:
+        value = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 60))
+        result = parse_retry_after(value)
+        assert result is not None
+        assert 55 <= result <= 61
+
+    def test_invalid(self) -> None:
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+
+class TestRetryPolicy:
+    """RetryPolicyのテスト"""
+
+    def test_backoff_is_bounded(self) -> None:
+        policy = RetryPolicy(max_retries=5, backoff_base=1.0, backoff_max=3.0)
+        for attempt in range(5):
+            delay = policy.compute_delay(attempt)
+            assert delay is not None
+            assert 0 <= delay <= min(3.0, 2**attempt)
+
+    def test_max_retries(self) -> None:
+        policy = RetryPolicy(max_retries=1)
+        assert policy.compute_delay(0) is not None
+        assert policy.compute_delay(1) is None
+
+    def test_retry_after(self) -> None:
+        policy = RetryPolicy(max_retries=3, retry_after_max=10)
+        assert policy.compute_delay(0, retry_after=2.5) == 2.5
+        assert policy.compute_delay(0, retry_after=60) is None
+
+
+class TestCircuitBreaker:
+    """CircuitBreakerのテスト"""
+
+    def test_opens_after_threshold(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.OPEN
+        assert not breaker.allow_request()
+        assert breaker.stats()["total_rejected"] == 1
+
+    def test_half_open_probe(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request()
+        # プローブ中は他のリクエストを通さない
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_half_open_failure_reopens(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=0)
+        for _ in range(3):
+            breaker.record_failure()
+        assert breaker.allow_request()
+
+        breaker.recovery_timeout = 60
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+
+
+class TestClientRetry:
+    """EGovAPIClientのリトライのテスト"""
+
+    @pytest.fixture
+    def client(self) -> EGovAPIClient:
+        return EGovAPIClient(
+            retry_policy=RetryPolicy(max_retries=2, backoff_base=0.01),
+            circuit_breaker=CircuitBreaker(failure_threshold=10),
+        )
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_retries_5xx_then_succeeds(self, client: EGovAPIClient) -> None:
+        """一時的な5xxはリトライで回復する"""
+        route = respx.get("https://laws.e-gov.go.jp/api/2/laws").mock(
+            side_effect=[Response(503), Response(200, json={"laws": []})]
+        )
+
+        result = await client.search_laws(keyword="民法")
+
+        assert result == {"laws": []}
+        assert route.call_count == 2
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_honours_retry_after(self, client: EGovAPIClient) -> None:
+        """429のRetry-Afterに従って待機してからリトライする"""
+        route = respx.get("https://laws.e-gov.go.jp/api/2/laws").mock(
+            side_effect=[
+                Response(429, headers={"Retry-After": "0"}),
+                Response(200, json={"laws": []}),
+            ]
+        )
+
+        await client.search_laws(keyword="民法")
+
+        assert route.call_count == 2
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, client: EGovAPIClient) -> None:
+        """リトライ上限に達したら最後のエラーを返す"""
+        route = respx.get("https://laws.e-gov.go.jp/api/2/laws").mock(
+            return_value=Response(502)
+        )
+
+        with pytest.raises(EGovAPIError) as exc_info:
+            await client.search_laws(keyword="民法")
+
+        assert exc_info.value.code == "E005"
+        assert route.call_count == 3
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_404_not_retried(self, client: EGovAPIClient) -> None:
+        """404はリトライしない"""
+        route = respx.get("https://laws.e-gov.go.jp/api/2/law_data/INVALID_ID").mock(
+            return_value=Response(404)
+        )
+
+        with pytest.raises(EGovAPIError):
+            await client.get_law_data("INVALID_ID")
+
+        assert route.call_count == 1
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self) -> None:
+        """サーキットがオープンの間はAPIを呼ばずに失敗する"""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        client = EGovAPIClient(
+            retry_policy=RetryPolicy(max_retries=1, backoff_base=0.01),
+            circuit_breaker=breaker,
+        )
+        route = respx.get("https://laws.e-gov.go.jp/api/2/laws").mock(
+            return_value=Response(500)
+        )
+
+        with pytest.raises(EGovAPIError):
+            await client.search_laws(keyword="民法")
+        assert breaker.state == CircuitState.OPEN
+
+        with pytest.raises(EGovAPIError) as exc_info:
+            await client.search_laws(keyword="刑法")
+
+        assert route.call_count == 2
+        assert exc_info.value.code == "E001"
+        assert exc_info.value.details["circuit_state"] == "open"
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_releases_half_open(self) -> None:
+        """ハーフオープンの試行がキャンセルされても、次の試行を通す"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+        client = EGovAPIClient(
+            retry_policy=RetryPolicy(max_retries=0),
+            circuit_breaker=breaker,
+        )
+        started = asyncio.Event()
+
+        async def hang(request: Request) -> Response:
+            started.set()
+            await asyncio.sleep(60)
+            return Response(200, json={"laws": []})
+
+        route = respx.get("https://laws.e-gov.go.jp/api/2/laws")
+        route.side_effect = hang
+        # single-flightを通さず、リクエスト自体をキャンセルする
+        task = asyncio.ensure_future(client._request("GET", "/laws"))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert breaker.state == CircuitState.HALF_OPEN
+        route.side_effect = None
+        route.return_value = Response(200, json={"laws": []})
+        assert await client.search_laws(keyword="刑法") == {"laws": []}
+        assert breaker.state == CircuitState.CLOSED
@@ -0,0 +1,121 @@
+"""single-flightのユニットテスト"""
+
+import asyncio
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from egov_law_mcp.api.client import EGovAPIClient
+from egov_law_mcp.api.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """SingleFlightのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_result(self) -> None:
+        """同時呼び出しは1回の実行にまとめられる"""
+        group = SingleFlight()
+        calls = 0
+
+        async def fetch() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(group.do("key", fetch) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert group.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self) -> None:
+        """キーが異なれば別々に実行される"""
+        group = SingleFlight()
+        calls: list[str] = []
+
+        async def fetch(key: str) -> str:
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        results = await asyncio.gather(
+            group.do("a", lambda: fetch("a")),
+            group.do("b", lambda: fetch("b")),
+        )
+
+        assert results == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_exception_is_shared(self) -> None:
+        """例外も全ての呼び出し元に伝搬する"""
+        group = SingleFlight()
+
+        async def fail() -> str:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            group.do("key", fail), group.do("key", fail), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_completed_call_is_not_cached(self) -> None:
+        """完了後の呼び出しは再実行される"""
+        group = SingleFlight()
+        calls = 0
+
+        async def fetch() -> int:
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await group.do("key", fetch) == 1
+        assert await group.do("key", fetch) == 2
+
+
+class TestClientCoalescing:
+    """EGovAPIClientでのリクエスト合流のテスト"""
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_concurrent_get_law_data(self) -> None:
+        """同一法令の同時取得はAPI呼び出し1回になる"""
+
+        async def slow_response(request: httpx.Request) -> Response:
+            await asyncio.sleep(0.05)
+            return Response(200, content="<Law><LawTitle>民法</LawTitle></Law>")
+
+        route = respx.get("https://laws.e-gov.go.jp/api/2/law_data/COALESCE_ID").mock(
+            side_effect=slow_response
+        )
+
+        results = await asyncio.gather(
+            *(EGovAPIClient().get_law_data("COALESCE_ID") for _ in range(4))
+        )
+
+        assert route.call_count == 1
+        assert all("民法" in r for r in results)
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_different_asof_not_coalesced(self) -> None:
+        """asofが異なるリクエストは別々に発行される"""
+        route = respx.get("https://laws.e-gov.go.jp/api/2/law_data/ASOF_ID").mock(
+            return_value=Response(200, content="<Law/>")
+        )
+
+        client = EGovAPIClient()
+        await asyncio.gather(
+            client.get_law_data("ASOF_ID", asof="2020-04-01"),
+            client.get_law_data("ASOF_ID", asof="2021-04-01"),
+        )
+
+        assert route.call_count == 2
@@ -0,0 +1 @@
+"""test_cache パッケージ"""
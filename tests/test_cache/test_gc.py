@@ -0,0 +1,165 @@
+"""ファイルキャッシュGCのユニットテスト"""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from egov_law_mcp.cache import (
+    BackendCollector,
+    CacheManager,
+    FileCacheCollector,
+    compute_content_hash,
+)
+
+
+@pytest.fixture
+def file_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> CacheManager:
+    monkeypatch.delenv("CACHE_TYPE", raising=False)
+    monkeypatch.delenv("CACHE_DIR", raising=False)
+    return CacheManager(cache_type="file", cache_dir=str(tmp_path))
+
+
+def _law_xml(i: int) -> str:
+    # 圧縮が効きにくいよう法令ごとに内容を変える
+    return (
+        "<Law>"
+        + "".join(chr(0x4E00 + (i * 7919 + j * 104729) % 20000) for j in range(3000))
+        + "</Law>"
+    )
+
+
+class TestFileCacheCollector:
+    """FileCacheCollectorのテスト"""
+
+    def test_sharded_layout(self, file_cache: CacheManager) -> None:
+        """ファイルはキーの先頭2文字のサブディレクトリに置かれる"""
+        file_cache.set_law_data("LAW1", "<Law/>")
+
+        (path,) = file_cache.cache_dir.glob("*/*.bin")
+        assert path.parent.name == path.name[:2]
+
+    @pytest.mark.asyncio
+    async def test_removes_expired_and_stale_tmp(
+        self, file_cache: CacheManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """検証子の無い期限切れエントリと古い一時ファイルを削除する"""
+        file_cache.set_law_data("EXPIRED", "<Law/>")
+        file_cache.set_law_data("VALIDATED", "<Law/>", etag='"v1"')
+        stale_tmp = file_cache.cache_dir / "ab" / "orphan.bin.1.tmp"
+        stale_tmp.parent.mkdir(exist_ok=True)
+        stale_tmp.write_bytes(b"partial")
+        os.utime(stale_tmp, (0, 0))
+        now = time.time()
+        # 期限切れのまま返せる期間も過ぎた時点
+        expired_at = now + CacheManager.DEFAULT_LAW_DATA_TTL + CacheManager.DEFAULT_STALE_IF_ERROR
+        monkeypatch.setattr(time, "time", lambda: expired_at + 1)
+
+        await FileCacheCollector(file_cache, interval=0).collect()
+
+        assert not stale_tmp.exists()
+        assert len(list(file_cache.cache_dir.glob("*/*.bin"))) == 1
+        assert file_cache.get_law_data_entry("VALIDATED") is not None
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self, file_cache: CacheManager) -> None:
+        """容量を超えたら最終利用日時の古いものから削除する"""
+        for i in range(5):
+            file_cache.set_law_data(f"LAW{i}", _law_xml(i))
+        # 本文は本文ハッシュ単位のファイルに置かれる
+        paths = {
+            f"LAW{i}": file_cache._get_blob_path(compute_content_hash(_law_xml(i)))
+            for i in range(5)
+        }
+        for i, path in enumerate(paths.values()):
+            os.utime(path, (1000 + i, 1000 + i))
+        entry_size = max(path.stat().st_size for path in paths.values())
+
+        total = await FileCacheCollector(file_cache, max_bytes=entry_size * 3, interval=0).collect()
+
+        assert total <= entry_size * 3
+        assert not paths["LAW0"].exists()
+        assert paths["LAW4"].exists()
+        # 本文が消えたエントリは読み込み時に削除される
+        reloaded = CacheManager(cache_type="file", cache_dir=str(file_cache.cache_dir))
+        assert reloaded.get_law_data("LAW0") is None
+        assert reloaded.get_law_data("LAW4") == _law_xml(4)
+
+    @pytest.mark.asyncio
+    async def test_removes_unreferenced_blobs(self, file_cache: CacheManager) -> None:
+        """どのエントリからも参照されなくなった本文を削除する"""
+        file_cache.set_law_data("LAW1", "<Law>v1</Law>")
+        file_cache.set_law_data("LAW2", "<Law>v1</Law>")
+        file_cache.set_law_data("LAW1", "<Law>v2</Law>")
+        old_blob = file_cache._get_blob_path(compute_content_hash("<Law>v1</Law>"))
+        new_blob = file_cache._get_blob_path(compute_content_hash("<Law>v2</Law>"))
+        os.utime(old_blob, (1000, 1000))
+
+        # LAW2がまだ参照している
+        await FileCacheCollector(file_cache, interval=0).collect()
+        assert old_blob.exists()
+
+        file_cache.invalidate_law("LAW2")
+        await FileCacheCollector(file_cache, interval=0).collect()
+        assert not old_blob.exists()
+        assert new_blob.exists()
+
+    def test_read_refreshes_recency(self, file_cache: CacheManager) -> None:
+        """読み込むと最終利用日時が更新される"""
+        file_cache.set_law_data("LAW1", "<Law/>")
+        (path,) = file_cache.cache_dir.glob("*/*.bin")
+        os.utime(path, (1000, 1000))
+
+        reloaded = CacheManager(cache_type="file", cache_dir=str(file_cache.cache_dir))
+        assert reloaded.get_law_data("LAW1") == "<Law/>"
+        assert path.stat().st_mtime > 1000
+
+    @pytest.mark.asyncio
+    async def test_memory_hits_refresh_recency(
+        self, file_cache: CacheManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """メモリから返し続けているエントリはGCで先に消えない"""
+        file_cache.set_law_data("HOT", _law_xml(1))
+        file_cache.set_law_data("COLD", _law_xml(2))
+        hot = file_cache._get_blob_path(compute_content_hash(_law_xml(1)))
+        cold = file_cache._get_blob_path(compute_content_hash(_law_xml(2)))
+        # HOTの方が先に書かれ、その後はメモリからしか読まれていない
+        os.utime(hot, (1000, 1000))
+        os.utime(cold, (2000, 2000))
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + CacheManager.FILE_TOUCH_INTERVAL)
+
+        assert file_cache.get_law_data("HOT") == _law_xml(1)
+        # 本文1つ分だけ残る容量
+        max_bytes = hot.stat().st_size * 3 // 2
+        await FileCacheCollector(file_cache, max_bytes=max_bytes, interval=0).collect()
+
+        assert hot.exists()
+        assert not cold.exists()
+
+
+@pytest.mark.parametrize("collector_type", [FileCacheCollector, BackendCollector])
+@pytest.mark.asyncio
+async def test_run_survives_unexpected_errors(
+    collector_type: type[FileCacheCollector] | type[BackendCollector],
+    file_cache: CacheManager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """想定外のエラーが起きてもGCを続ける"""
+    collector = collector_type(file_cache, interval=0)
+    calls = 0
+
+    async def collect() -> int:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ValueError("bad header")
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(collector, "collect", collect)
+
+    with pytest.raises(asyncio.CancelledError):
+        await collector.run()
+    assert calls == 2
@@ -0,0 +1,498 @@
+"""キャッシュマネージャーのユニットテスト"""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from egov_law_mcp.cache import BackendCollector, CacheManager, SQLiteStore, compute_content_hash
+
+SAMPLE_XML = '<?xml version="1.0" encoding="UTF-8"?><Law><LawTitle>民法</LawTitle></Law>'
+
+
+class TestLawDataWriter:
+    """LawDataWriterのテスト"""
+
+    def test_commit_memory(self) -> None:
+        """メモリキャッシュへのストリーミング書き込み"""
+        cache = CacheManager(cache_type="memory")
+        writer = cache.open_law_data_writer("LAW1")
+        data = SAMPLE_XML.encode("utf-8")
+        for i in range(0, len(data), 5):
+            writer.write(data[i : i + 5])
+
+        assert writer.commit() == SAMPLE_XML
+        assert cache.get_law_data("LAW1") == SAMPLE_XML
+
+    def test_commit_file(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """ファイルキャッシュへのストリーミング書き込み（マルチバイト境界をまたぐ）"""
+        monkeypatch.delenv("CACHE_TYPE", raising=False)
+        monkeypatch.delenv("CACHE_DIR", raising=False)
+        cache = CacheManager(cache_type="file", cache_dir=str(tmp_path))
+        writer = cache.open_law_data_writer("LAW1", asof="2020-04-01")
+        data = SAMPLE_XML.encode("utf-8")
+        for i in range(0, len(data), 3):
+            writer.write(data[i : i + 3])
+        writer.commit()
+
+        # 別インスタンス（メモリ空）からファイル経由で読める
+        reloaded = CacheManager(cache_type="file", cache_dir=str(tmp_path))
+        assert reloaded.get_law_data("LAW1", asof="2020-04-01") == SAMPLE_XML
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_commit_backend(self, tmp_path: Path) -> None:
+        """永続層への書き込み（バッファは確定時に解放する）"""
+        cache = CacheManager(backend=SQLiteStore(tmp_path / "cache.sqlite3"))
+        writer = cache.open_law_data_writer("LAW1")
+        data = SAMPLE_XML.encode("utf-8")
+        for i in range(0, len(data), 3):
+            writer.write(data[i : i + 3])
+        assert writer.commit() == SAMPLE_XML
+        assert not writer._buffer
+        cache.flush()
+
+        reloaded = CacheManager(backend=SQLiteStore(tmp_path / "cache.sqlite3"))
+        assert reloaded.get_law_data("LAW1") == SAMPLE_XML
+
+    def test_concurrent_writers(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """同じキーへの書き込みが重なっても一時ファイルを共有しない"""
+        monkeypatch.delenv("CACHE_TYPE", raising=False)
+        monkeypatch.delenv("CACHE_DIR", raising=False)
+        cache = CacheManager(cache_type="file", cache_dir=str(tmp_path))
+        first = cache.open_law_data_writer("LAW1")
+        second = cache.open_law_data_writer("LAW1")
+        other_xml = SAMPLE_XML.replace("民法", "刑法")
+        for a, b in zip(SAMPLE_XML.encode("utf-8"), other_xml.encode("utf-8"), strict=False):
+            first.write(bytes([a]))
+            second.write(bytes([b]))
+        first.commit()
+        second.commit()
+
+        reloaded = CacheManager(cache_type="file", cache_dir=str(tmp_path))
+        assert reloaded.get_law_data("LAW1") == other_xml
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_abort(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """中止した書き込みは残らない"""
+        monkeypatch.delenv("CACHE_TYPE", raising=False)
+        monkeypatch.delenv("CACHE_DIR", raising=False)
+        cache = CacheManager(cache_type="file", cache_dir=str(tmp_path))
+        writer = cache.open_law_data_writer("LAW1")
+        writer.write(b"<Law>")
+        writer.abort()
+
+        assert cache.get_law_data("LAW1") is None
+        assert not [p for p in tmp_path.rglob("*") if p.is_file()]
+
+
+class TestLawDataRevalidation:
+    """法令本文の再検証用エントリのテスト"""
+
+    def test_expired_entry_kept_for_revalidation(self) -> None:
+        """期限切れエントリは get_law_data では返らないが検証子付きで残る"""
+        cache = CacheManager(cache_type="memory")
+        cache.set_law_data(
+            "LAW1", SAMPLE_XML, etag='"v1"', last_modified="Wed, 01 Apr 2020 00:00:00 GMT"
+        )
+        entry = cache.get_law_data_entry("LAW1")
+        assert entry is not None
+        entry.expires_at = 0
+
+        assert cache.get_law_data("LAW1") is None
+        stale = cache.get_law_data_entry("LAW1")
+        assert stale is not None
+        assert not stale.is_fresh
+        assert stale.etag == '"v1"'
+        assert stale.has_validators
+
+    def test_renew(self) -> None:
+        """renew_law_data でTTLが延長される"""
+        cache = CacheManager(cache_type="memory")
+        cache.set_law_data("LAW1", SAMPLE_XML, etag='"v1"')
+        entry = cache.get_law_data_entry("LAW1")
+        assert entry is not None
+        entry.expires_at = 0
+
+        assert cache.renew_law_data("LAW1")
+        assert cache.get_law_data("LAW1") == SAMPLE_XML
+        assert cache.stats()["law_data_revalidated_count"] == 1
+
+    def test_validators_persisted_in_file(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """ファイルキャッシュにも検証子が保存される"""
+        monkeypatch.delenv("CACHE_TYPE", raising=False)
+        monkeypatch.delenv("CACHE_DIR", raising=False)
+        cache = CacheManager(cache_type="file", cache_dir=str(tmp_path))
+        writer = cache.open_law_data_writer("LAW1", etag='"v1"')
+        writer.write(SAMPLE_XML.encode("utf-8"))
+        writer.commit()
+
+        reloaded = CacheManager(cache_type="file", cache_dir=str(tmp_path))
+        entry = reloaded.get_law_data_entry("LAW1")
+        assert entry is not None
+        assert entry.etag == '"v1"'
+
+
+class TestInvalidateLaw:
+    """法令単位の無効化のテスト"""
+
+    def test_invalidates_only_related_entries(self) -> None:
+        """更新された法令に関係するエントリだけを無効化する"""
+        cache = CacheManager(cache_type="memory")
+        cache.set_law_data("LAW1", SAMPLE_XML)
+        cache.set_law_data("LAW1", SAMPLE_XML, asof="2020-04-01")
+        cache.set_law_data("LAW2", SAMPLE_XML)
+        cache.set_revisions("LAW1", {"revisions": []})
+        cache.set_search_result("民法", {"laws": [{"law_id": "LAW1"}]})
+        cache.set_search_result("刑法", {"laws": [{"law_id": "LAW2"}]})
+
+        removed = cache.invalidate_law("LAW1")
+
+        assert removed == 4
+        assert cache.get_law_data("LAW1") is None
+        assert cache.get_law_data("LAW1", asof="2020-04-01") is None
+        assert cache.get_revisions("LAW1") is None
+        assert cache.get_search_result("民法") is None
+        assert cache.get_law_data("LAW2") == SAMPLE_XML
+        assert cache.get_search_result("刑法") is not None
+
+    @pytest.mark.asyncio
+    async def test_invalidates_file_entries_after_restart(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """再起動後も、ファイルキャッシュのasof・法令履歴ID違いのエントリを無効化する"""
+        monkeypatch.delenv("CACHE_TYPE", raising=False)
+        monkeypatch.delenv("CACHE_DIR", raising=False)
+        cache = CacheManager(cache_type="file", cache_dir=str(tmp_path))
+        cache.set_law_data("LAW1", SAMPLE_XML, asof="2020-04-01")
+        cache.set_law_data("LAW1", SAMPLE_XML, revision_id="LAW1_20190401")
+        cache.set_law_data("LAW2", SAMPLE_XML, asof="2020-04-01")
+
+        restarted = CacheManager(cache_type="file", cache_dir=str(tmp_path))
+        assert await restarted.ainvalidate_law("LAW1") == 2
+
+        reloaded = CacheManager(cache_type="file", cache_dir=str(tmp_path))
+        assert reloaded.get_law_data("LAW1", asof="2020-04-01") is None
+        assert reloaded.get_law_data("LAW1", revision_id="LAW1_20190401") is None
+        assert reloaded.get_law_data("LAW2", asof="2020-04-01") == SAMPLE_XML
+
+    def test_invalidates_search_matching_title(self) -> None:
+        """新たにヒットしうる検索結果（キーワードが法令名に含まれる）も無効化する"""
+        cache = CacheManager(cache_type="memory")
+        cache.set_search_result("ドローン", {"laws": []})
+
+        cache.invalidate_law("NEW_LAW", law_title="無人航空機（ドローン）規制法")
+
+        assert cache.get_search_result("ドローン") is None
+
+    def test_invalidates_file(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """ファイルキャッシュからも削除する"""
+        monkeypatch.delenv("CACHE_TYPE", raising=False)
+        monkeypatch.delenv("CACHE_DIR", raising=False)
+        CacheManager(cache_type="file", cache_dir=str(tmp_path)).set_law_data("LAW1", SAMPLE_XML)
+
+        cache = CacheManager(cache_type="file", cache_dir=str(tmp_path))
+        assert cache.invalidate_law("LAW1") == 1
+        assert cache.get_law_data("LAW1") is None
+
+
+class TestHasLaw:
+    """キャッシュ済みかの確認のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_file_reads_header_only(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """ファイルキャッシュはヘッダだけを読む"""
+        monkeypatch.delenv("CACHE_TYPE", raising=False)
+        monkeypatch.delenv("CACHE_DIR", raising=False)
+        CacheManager(cache_type="file", cache_dir=str(tmp_path)).set_law_data("LAW1", SAMPLE_XML)
+        cache = CacheManager(cache_type="file", cache_dir=str(tmp_path))
+        monkeypatch.setattr(cache, "_load_blob_file", lambda content_hash: pytest.fail())
+
+        assert await cache.ahas_law("LAW1")
+        assert not await cache.ahas_law("LAW2")
+
+    @pytest.mark.asyncio
+    async def test_backend_checks_existence(self, tmp_path: Path) -> None:
+        """永続層はエントリの有無だけを確認する"""
+        store = SQLiteStore(tmp_path / "cache.sqlite3")
+        CacheManager(cache_type="memory", backend=store).set_law_data("LAW1", SAMPLE_XML)
+        cache = CacheManager(cache_type="memory", backend=store)
+        store.get = lambda category, key: pytest.fail()  # type: ignore[method-assign]
+
+        assert await cache.ahas_law("LAW1")
+        assert not cache.has_law("LAW2")
+
+
+class TestNegativeCache:
+    """ネガティブキャッシュのテスト"""
+
+    ERROR = {"code": "E002", "message": "Resource not found.", "details": None}
+
+    def test_expires_after_ttl(self) -> None:
+        """TTLを過ぎると消える"""
+        cache = CacheManager(negative_ttl=60)
+        cache.set_not_found("LAW1", self.ERROR)
+        assert cache.get_not_found("LAW1") == self.ERROR
+        assert cache.get_not_found("LAW1", asof="2020-01-01") is None
+        assert cache.get_not_found("LAW1", article_number="1") is None
+
+        cache._negative_cache.expire(time.monotonic() + 61)
+        assert cache.get_not_found("LAW1") is None
+
+    def test_invalidate_law_clears_negatives(self) -> None:
+        """法令の更新で、その法令の「見つからない」結果も消える"""
+        cache = CacheManager()
+        cache.set_not_found("LAW1", self.ERROR)
+        cache.set_not_found("LAW1", self.ERROR, article_number="9")
+        cache.set_not_found("LAW2", self.ERROR)
+
+        assert cache.invalidate_law("LAW1") == 2
+        assert cache.get_not_found("LAW1") is None
+        assert cache.get_not_found("LAW1", article_number="9") is None
+        assert cache.get_not_found("LAW2") == self.ERROR
+
+    def test_size_limit(self) -> None:
+        """容量はカテゴリ別に指定できる"""
+        cache = CacheManager(category_max_bytes={"negative": 4096})
+        for i in range(100):
+            cache.set_not_found(f"LAW{i}", self.ERROR)
+        assert 0 < cache.stats()["negative_count"] < 100
+        assert cache.stats()["negative_bytes"] <= 4096
+
+
+class TestByteBudget:
+    """バイト数による容量管理のテスト"""
+
+    def test_category_budget_evicts_lru(self) -> None:
+        """カテゴリの容量を超えると古いエントリから追い出す"""
+        cache = CacheManager(cache_type="memory", category_max_bytes={"law_data": 50_000})
+        for law_id in ("LAW1", "LAW2", "LAW3"):
+            cache.set_law_data(law_id, law_id + "条" * 10_000)  # 約20KB
+
+        assert cache.get_law_data("LAW1") is None
+        assert cache.get_law_data("LAW3") == "LAW3" + "条" * 10_000
+        assert cache.stats()["law_data_bytes"] <= 50_000
+
+    def test_oversized_value_not_kept_in_memory(self) -> None:
+        """容量を単独で超える値はメモリに載せない"""
+        cache = CacheManager(cache_type="memory", category_max_bytes={"law_data": 1_000})
+
+        cache.set_law_data("LAW1", "x" * 10_000)
+
+        assert cache.get_law_data("LAW1") is None
+        assert cache.stats()["law_data_bytes"] == 0
+
+    def test_global_budget(self) -> None:
+        """全体の容量を超えると使用率の高いカテゴリから追い出す"""
+        cache = CacheManager(cache_type="memory", max_bytes=60_000)
+        for i in range(5):
+            cache.set_law_data(f"LAW{i}", str(i) * 20_000)
+        cache.set_search_result("民法", {"laws": [{"law_id": "LAW0"}]})
+
+        assert cache.stats()["total_bytes"] <= 60_000
+        assert cache.get_search_result("民法") is not None
+
+    def test_budget_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """環境変数で容量を設定できる"""
+        monkeypatch.setenv("CACHE_SEARCH_MAX_BYTES", "1234")
+        monkeypatch.setenv("CACHE_MAX_BYTES", "99999")
+
+        cache = CacheManager(cache_type="memory")
+
+        assert cache.category_max_bytes["search"] == 1234
+        assert cache.max_bytes == 99999
+
+
+class TestContentAddressedBlobs:
+    """本文ハッシュ単位の本文共有のテスト"""
+
+    def test_same_content_shared_in_memory(self) -> None:
+        """同じ本文は1つだけ保持し、容量も1つ分だけ数える"""
+        cache = CacheManager(cache_type="memory")
+        content = SAMPLE_XML * 100
+        cache.set_law_data("LAW1", content)
+        cache.set_law_data("LAW1", content, asof="2024-04-01")
+        cache.set_law_data("LAW2", content)
+
+        stats = cache.stats()
+        assert stats["law_data_count"] == 3
+        assert stats["law_data_blob_count"] == 1
+        assert stats["law_data_bytes"] < len(content.encode("utf-8")) * 2
+        assert cache.get_law_data("LAW1") is cache.get_law_data("LAW2")
+
+    def test_blob_removed_with_last_reference(self) -> None:
+        """最後の参照が無くなった本文は削除される"""
+        cache = CacheManager(cache_type="memory")
+        cache.set_law_data("LAW1", SAMPLE_XML)
+        cache.set_law_data("LAW2", SAMPLE_XML)
+
+        cache.invalidate_law("LAW1")
+        assert cache.stats()["law_data_blob_count"] == 1
+        assert cache.get_law_data("LAW2") == SAMPLE_XML
+
+        cache.set_law_data("LAW2", SAMPLE_XML + "<!-- v2 -->")
+        assert cache.stats()["law_data_blob_count"] == 1
+
+    def test_eviction_drops_all_references(self) -> None:
+        """本文を追い出すと、参照していたキーもまとめて外れる"""
+        cache = CacheManager(cache_type="memory", category_max_bytes={"law_data": 50_000})
+        shared = "条" * 10_000  # 約20KB
+        cache.set_law_data("LAW1", shared)
+        cache.set_law_data("LAW2", shared)
+        cache.set_law_data("LAW3", "LAW3" + shared)
+        cache.set_law_data("LAW4", "LAW4" + shared)
+
+        assert cache.get_law_data("LAW1") is None
+        assert cache.get_law_data("LAW2") is None
+        assert cache.get_law_data("LAW4") is not None
+        assert cache.stats()["law_data_count"] == cache.stats()["law_data_blob_count"]
+
+    def test_same_content_shared_on_disk(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """ファイルキャッシュでも本文のファイルは1つだけ作る"""
+        monkeypatch.delenv("CACHE_TYPE", raising=False)
+        cache = CacheManager(cache_type="file", cache_dir=str(tmp_path))
+        cache.set_law_data("LAW1", SAMPLE_XML)
+        cache.set_law_data("LAW2", SAMPLE_XML)
+
+        assert len(list(tmp_path.glob("*/*.bin"))) == 2
+        assert len(list(tmp_path.glob("blobs/*/*.blob"))) == 1
+        reloaded = CacheManager(cache_type="file", cache_dir=str(tmp_path))
+        assert reloaded.get_law_data("LAW2") == SAMPLE_XML
+        assert reloaded.stats()["law_data_blob_count"] == 1
+
+
+class TestBinaryFileCache:
+    """バイナリ形式のファイルキャッシュのテスト"""
+
+    @pytest.fixture
+    def file_cache(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> CacheManager:
+        monkeypatch.delenv("CACHE_TYPE", raising=False)
+        monkeypatch.delenv("CACHE_DIR", raising=False)
+        return CacheManager(cache_type="file", cache_dir=str(tmp_path))
+
+    def _reload(self, cache: CacheManager) -> CacheManager:
+        return CacheManager(cache_type="file", cache_dir=str(cache.cache_dir))
+
+    def test_compressed(self, file_cache: CacheManager) -> None:
+        """本文は圧縮して保存される"""
+        content = SAMPLE_XML * 200
+        file_cache.set_law_data("LAW1", content)
+
+        path = file_cache._get_blob_path(compute_content_hash(content))
+        assert path.stat().st_size < len(content.encode("utf-8")) / 5
+        entry = self._reload(file_cache).get_law_data_entry("LAW1")
+        assert entry is not None
+        assert entry.content == content
+
+    def test_expired_without_validators_removed(
+        self, file_cache: CacheManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """期限切れのまま返せる期間も過ぎた、検証子の無いエントリは読み込み時に削除される"""
+        file_cache.set_law_data("LAW1", SAMPLE_XML)
+        now = time.time()
+        # 期限切れのまま返せる期間も過ぎた時点
+        expired_at = now + CacheManager.DEFAULT_LAW_DATA_TTL + CacheManager.DEFAULT_STALE_IF_ERROR
+        monkeypatch.setattr(time, "time", lambda: expired_at + 1)
+
+        assert self._reload(file_cache).get_law_data_entry("LAW1") is None
+        assert not list(file_cache.cache_dir.glob("*/*.bin"))
+
+    def test_expired_with_validators_kept_and_renewed(
+        self, file_cache: CacheManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """検証子付きの期限切れエントリは再検証用に残り、延長がファイルにも反映される"""
+        file_cache.set_law_data("LAW1", SAMPLE_XML, etag='"v1"')
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + CacheManager.DEFAULT_LAW_DATA_TTL + 1)
+
+        reloaded = self._reload(file_cache)
+        entry = reloaded.get_law_data_entry("LAW1")
+        assert entry is not None
+        assert not entry.is_fresh
+        assert reloaded.renew_law_data("LAW1")
+
+        assert self._reload(file_cache).get_law_data("LAW1") == SAMPLE_XML
+
+    def test_corrupt_file_ignored(self, file_cache: CacheManager) -> None:
+        """壊れたファイルは例外にならず削除される"""
+        file_cache.set_law_data("LAW1", SAMPLE_XML)
+        (path,) = file_cache.cache_dir.glob("*/*.bin")
+        path.write_bytes(path.read_bytes()[:-10])
+
+        assert self._reload(file_cache).get_law_data("LAW1") is None
+        assert not path.exists()
+
+
+class SlowStore(SQLiteStore):
+    """読み込みに時間のかかる永続層"""
+
+    def get(self, category: str, key: str) -> dict[str, Any] | None:
+        time.sleep(0.2)
+        return super().get(category, key)
+
+
+class TestBackendIO:
+    """永続層のI/Oのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_reads_do_not_block_event_loop(self, tmp_path: Path) -> None:
+        """永続層の読み込み中もイベントループは止まらない"""
+        CacheManager(backend=SQLiteStore(tmp_path / "cache.sqlite3")).set_revisions(
+            "LAW1", {"revisions": []}
+        )
+        cache = CacheManager(backend=SlowStore(tmp_path / "cache.sqlite3"))
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        try:
+            assert await cache.aget_revisions("LAW1") == {"revisions": []}
+        finally:
+            ticker.cancel()
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_writes_are_ordered_before_reads(self, tmp_path: Path) -> None:
+        """完了を待たない書き込みも、後から読む時には反映されている"""
+        cache = CacheManager(backend=SQLiteStore(tmp_path / "cache.sqlite3"))
+        cache.set_search_result("民法", {"laws": []})
+        cache._search_cache.clear()
+
+        assert await cache.aget_search_result("民法") == {"laws": []}
+
+    @pytest.mark.asyncio
+    async def test_backend_errors_are_cache_misses(self, tmp_path: Path) -> None:
+        """永続層のエラーはキャッシュミスとして扱う"""
+        store = SQLiteStore(tmp_path / "cache.sqlite3")
+        cache = CacheManager(backend=store)
+        store.close()
+
+        assert await cache.aget_law_data_entry("LAW1") is None
+        cache.set_law_data("LAW1", SAMPLE_XML)
+        assert cache.get_law_data("LAW1") == SAMPLE_XML
+
+    @pytest.mark.asyncio
+    async def test_background_collector(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """期限切れのエントリはバックグラウンドのGCで削除する"""
+        cache = CacheManager(backend=SQLiteStore(tmp_path / "cache.sqlite3"))
+        cache.set_search_result("民法", {"laws": []})
+        cache.flush()
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + CacheManager.DEFAULT_SEARCH_TTL + 1)
+
+        assert await BackendCollector(cache, interval=0).collect() == 1
+        assert cache.stats()["backend_search_count"] == 0
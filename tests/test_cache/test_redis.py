@@ -0,0 +1,372 @@
+"""Redisキャッシュのユニットテスト
+
+Redisサーバーの代わりに、必要なコマンドだけを実装したインプロセスのスタンドインを使う。
+"""
+
+import fnmatch
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from egov_law_mcp.cache import CacheManager, RedisStore, compute_content_hash
+
+SAMPLE_XML = '<?xml version="1.0" encoding="UTF-8"?><Law><LawTitle>民法</LawTitle></Law>'
+
+
+def _b(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode("utf-8")
+
+
+class FakeRedis:
+    """`redis.Redis` のインプロセスのスタンドイン（TTL・パイプライン対応）"""
+
+    def __init__(self) -> None:
+        self.data: dict[bytes, Any] = {}
+        self.expires: dict[bytes, float] = {}
+        self.round_trips = 0
+
+    def _live(self, name: Any) -> Any:
+        key = _b(name)
+        if key in self.expires and time.time() >= self.expires[key]:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+    def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        self.round_trips += 1
+        return getattr(self, f"_cmd_{method}")(*args, **kwargs)
+
+    def __getattr__(self, method: str) -> Any:
+        if method.startswith("_"):
+            raise AttributeError(method)
+        return lambda *args, **kwargs: self._call(method, *args, **kwargs)
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    def close(self) -> None:
+        pass
+
+    def _cmd_hgetall(self, name: Any) -> dict[bytes, bytes]:
+        return dict(self._live(name) or {})
+
+    def _cmd_hget(self, name: Any, key: Any) -> bytes | None:
+        return (self._live(name) or {}).get(_b(key))
+
+    def _cmd_hmget(self, name: Any, keys: list[Any]) -> list[bytes | None]:
+        fields = self._live(name) or {}
+        return [fields.get(_b(k)) for k in keys]
+
+    def _cmd_hkeys(self, name: Any) -> list[bytes]:
+        return list(self._live(name) or {})
+
+    def _cmd_hset(
+        self, name: Any, key: Any = None, value: Any = None, mapping: dict[Any, Any] | None = None
+    ) -> int:
+        fields = self._live(name)
+        if fields is None:
+            fields = self.data[_b(name)] = {}
+        items = dict(mapping or {})
+        if key is not None:
+            items[key] = value
+        for k, v in items.items():
+            fields[_b(k)] = _b(v)
+        return len(items)
+
+    def _cmd_hincrby(self, name: Any, key: Any, amount: int = 1) -> int:
+        fields = self._live(name)
+        if fields is None:
+            fields = self.data[_b(name)] = {}
+        value = int(fields.get(_b(key), b"0")) + amount
+        fields[_b(key)] = _b(value)
+        return value
+
+    def _cmd_hdel(self, name: Any, *keys: Any) -> int:
+        fields = self._live(name) or {}
+        return sum(fields.pop(_b(k), None) is not None for k in keys)
+
+    def _cmd_sadd(self, name: Any, *members: Any) -> int:
+        members_set = self._live(name)
+        if members_set is None:
+            members_set = self.data[_b(name)] = set()
+        before = len(members_set)
+        members_set.update(_b(m) for m in members)
+        return len(members_set) - before
+
+    def _cmd_smembers(self, name: Any) -> set[bytes]:
+        return set(self._live(name) or set())
+
+    def _cmd_srem(self, name: Any, *members: Any) -> int:
+        members_set = self._live(name) or set()
+        before = len(members_set)
+        members_set.difference_update(_b(m) for m in members)
+        return before - len(members_set)
+
+    def _cmd_delete(self, *names: Any) -> int:
+        removed = 0
+        for name in names:
+            if self._live(name) is not None:
+                del self.data[_b(name)]
+                removed += 1
+            self.expires.pop(_b(name), None)
+        return removed
+
+    def _cmd_exists(self, *names: Any) -> int:
+        return sum(self._live(name) is not None for name in names)
+
+    def _cmd_expire(self, name: Any, seconds: int) -> bool:
+        if self._live(name) is None:
+            return False
+        self.expires[_b(name)] = time.time() + seconds
+        return True
+
+    def _cmd_scan_iter(self, match: str = "*", count: int | None = None) -> list[bytes]:
+        return [
+            key
+            for key in list(self.data)
+            if self._live(key) is not None and fnmatch.fnmatchcase(key.decode(), match)
+        ]
+
+
+class FakePipeline:
+    """コマンドをためて `execute()` で1往復として実行する"""
+
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._commands: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def __getattr__(self, method: str) -> Any:
+        def queue(*args: Any, **kwargs: Any) -> "FakePipeline":
+            self._commands.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list[Any]:
+        self._redis.round_trips += 1
+        commands, self._commands = self._commands, []
+        return [getattr(self._redis, f"_cmd_{m}")(*a, **kw) for m, a, kw in commands]
+
+
+@pytest.fixture
+def redis() -> FakeRedis:
+    return FakeRedis()
+
+
+@pytest.fixture(autouse=True)
+def _clear_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name in ("CACHE_TYPE", "CACHE_DIR", "REDIS_URL", "REDIS_KEY_PREFIX"):
+        monkeypatch.delenv(name, raising=False)
+
+
+def _open(redis: FakeRedis, tmp_path: Path) -> CacheManager:
+    return CacheManager(cache_dir=str(tmp_path), backend=RedisStore(redis))
+
+
+class TestRedisCache:
+    """Redisキャッシュのテスト"""
+
+    def test_shared_between_instances(self, redis: FakeRedis, tmp_path: Path) -> None:
+        """別インスタンス（別ノード相当）から全カテゴリを読める"""
+        writer = _open(redis, tmp_path)
+        writer.set_law_data("LAW1", SAMPLE_XML, etag='"v1"')
+        writer.set_search_result("民法", {"total_count": 1, "laws": [{"law_id": "LAW1"}]})
+        writer.set_revisions("LAW1", {"law_id": "LAW1", "revisions": []})
+
+        reader = _open(redis, tmp_path)
+        entry = reader.get_law_data_entry("LAW1")
+        assert entry is not None
+        assert entry.content == SAMPLE_XML
+        assert entry.etag == '"v1"'
+        assert entry.content_hash == compute_content_hash(SAMPLE_XML)
+        assert reader.get_search_result("民法") == {
+            "total_count": 1,
+            "laws": [{"law_id": "LAW1"}],
+        }
+        assert reader.get_revisions("LAW1") == {"law_id": "LAW1", "revisions": []}
+        assert not (tmp_path / "cache.sqlite3").exists()
+
+    def test_values_are_compressed(self, redis: FakeRedis, tmp_path: Path) -> None:
+        """値は圧縮して保存される"""
+        content = SAMPLE_XML + "<Article>第一条</Article>" * 1000
+        _open(redis, tmp_path).set_law_data("LAW1", content)
+        stored = [v for k, v in redis.data.items() if k.startswith(b"egov-law-mcp:e:law_data:")]
+        assert len(stored) == 1
+        assert len(stored[0][b"v"]) < len(content.encode("utf-8")) // 10
+
+    def test_server_side_ttl(
+        self, redis: FakeRedis, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """検証子の無いエントリはサーバー側のTTLで消え、検証子付きは猶予期間だけ残る"""
+        cache = _open(redis, tmp_path)
+        cache.set_search_result("民法", {"laws": []})
+        cache.set_law_data("LAW1", SAMPLE_XML)
+        cache.set_law_data("LAW2", SAMPLE_XML, etag='"v1"')
+
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + CacheManager.DEFAULT_LAW_DATA_TTL + 1)
+        reader = _open(redis, tmp_path)
+        assert reader.get_search_result("民法") is None
+        assert reader.get_law_data_entry("LAW1") is None
+        entry = reader.get_law_data_entry("LAW2")
+        assert entry is not None
+        assert not entry.is_fresh
+
+        # 再検証でTTLを延長すると新しいものとして読める
+        assert reader.renew_law_data("LAW2")
+        assert _open(redis, tmp_path).get_law_data("LAW2") == SAMPLE_XML
+
+        grace = RedisStore.DEFAULT_VALIDATOR_GRACE
+        monkeypatch.setattr(
+            time, "time", lambda: now + 2 * CacheManager.DEFAULT_LAW_DATA_TTL + grace + 2
+        )
+        assert _open(redis, tmp_path).get_law_data_entry("LAW2") is None
+
+    def test_prefetch_uses_pipelined_round_trips(self, redis: FakeRedis, tmp_path: Path) -> None:
+        """一括取得前のプリフェッチはエントリと本文をそれぞれ1往復にまとめる"""
+        writer = _open(redis, tmp_path)
+        law_ids = [f"LAW{i}" for i in range(20)]
+        for law_id in law_ids:
+            writer.set_law_data(law_id, SAMPLE_XML)
+
+        reader = _open(redis, tmp_path)
+        redis.round_trips = 0
+        assert reader.prefetch_law_data([*law_ids, "MISSING"]) == 20
+        assert redis.round_trips == 2
+        assert all(reader.get_law_data(law_id) == SAMPLE_XML for law_id in law_ids)
+        assert redis.round_trips == 2
+
+    def test_invalidate_law_across_nodes(self, redis: FakeRedis, tmp_path: Path) -> None:
+        """別ノードが保存した関連エントリも法令単位で無効化できる"""
+        writer = _open(redis, tmp_path)
+        writer.set_law_data("LAW1", SAMPLE_XML)
+        writer.set_law_data("LAW1", SAMPLE_XML, asof="2020-01-01")
+        writer.set_revisions("LAW1", {"revisions": []})
+        writer.set_search_result("民法", {"laws": [{"law_id": "LAW1"}]})
+        writer.set_search_result("民法 第", {"laws": []})
+        writer.set_search_result("刑法", {"laws": [{"law_id": "LAW2"}]})
+        writer.set_law_data("LAW2", SAMPLE_XML)
+
+        other = _open(redis, tmp_path)
+        assert other.invalidate_law("LAW1", law_title="民法") == 4
+
+        reader = _open(redis, tmp_path)
+        assert reader.get_law_data("LAW1") is None
+        assert reader.get_law_data("LAW1", asof="2020-01-01") is None
+        assert reader.get_revisions("LAW1") is None
+        assert reader.get_search_result("民法") is None
+        assert reader.get_search_result("民法 第") == {"laws": []}
+        assert reader.get_search_result("刑法") is not None
+        assert reader.get_law_data("LAW2") == SAMPLE_XML
+
+    def test_purge_removes_stale_index_members(
+        self, redis: FakeRedis, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """期限切れで消えたエントリは法令インデックスからも除かれる"""
+        cache = _open(redis, tmp_path)
+        cache.set_search_result("民法", {"laws": [{"law_id": "LAW1"}]})
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + CacheManager.DEFAULT_SEARCH_TTL + 1)
+        assert cache.purge_expired() == 2  # 法令インデックスとキーワード
+        assert not redis.smembers("egov-law-mcp:kw:民法")
+
+    def test_invalidate_by_title_uses_keyword_index(
+        self, redis: FakeRedis, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """法令名に含まれるキーワードの検索結果は、キーワードを全件読まずに無効化する"""
+
+        def no_full_read(*args: Any, **kwargs: Any) -> Any:
+            raise AssertionError("read every keyword")
+
+        cache = _open(redis, tmp_path)
+        for i in range(250):
+            cache.set_search_result(f"刑法{i}", {"laws": []})
+        cache.set_search_result("ドローン", {"laws": []})
+        monkeypatch.setattr(redis, "_cmd_hgetall", no_full_read)
+        monkeypatch.setattr(redis, "_cmd_scan_iter", no_full_read)
+        redis.round_trips = 0
+
+        cache.invalidate_law("NEW_LAW", law_title="無人航空機（ドローン）規制法")
+        assert redis.round_trips <= 4
+        monkeypatch.undo()
+        reader = _open(redis, tmp_path)
+        assert reader.get_search_result("ドローン") is None
+        assert reader.get_search_result("刑法1") == {"laws": []}
+
+    def test_corrupt_entry_is_discarded(self, redis: FakeRedis, tmp_path: Path) -> None:
+        """展開できないエントリは削除してキャッシュミスとして扱う"""
+        _open(redis, tmp_path).set_law_data("LAW1", SAMPLE_XML)
+        (key,) = [k for k in redis.data if k.startswith(b"egov-law-mcp:e:law_data:")]
+        redis.data[key][b"v"] = b"not zlib"
+        assert _open(redis, tmp_path).get_law_data("LAW1") is None
+        assert key not in redis.data
+
+    def test_metadata_and_clear(self, redis: FakeRedis, tmp_path: Path) -> None:
+        """メタデータはノード間で共有され、クリア後も残る"""
+        cache = _open(redis, tmp_path)
+        cache.set_metadata("last_synced", "2024-01-01")
+        cache.set_law_data("LAW1", SAMPLE_XML)
+        assert cache.stats()["backend_law_data_count"] == 1
+
+        cache.clear()
+        reader = _open(redis, tmp_path)
+        assert reader.get_law_data("LAW1") is None
+        assert reader.stats()["backend_law_data_count"] == 0
+        assert reader.get_metadata("last_synced") == "2024-01-01"
+
+    def test_writes_and_stats_do_not_scan(
+        self, redis: FakeRedis, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """書き込みと統計ではキーを走査せず、エントリ数は書き込み・削除のたびに更新する"""
+
+        def no_scan(*args: Any, **kwargs: Any) -> Any:
+            raise AssertionError("SCAN on the request path")
+
+        cache = _open(redis, tmp_path)
+        monkeypatch.setattr(redis, "_cmd_scan_iter", no_scan)
+        for i in range(250):
+            cache.set_search_result(f"民法{i}", {"laws": [{"law_id": "LAW1"}]})
+        cache.set_law_data("LAW1", SAMPLE_XML)
+        cache.set_law_data("LAW1", SAMPLE_XML)
+        stats = cache.stats()
+        assert stats["backend_search_count"] == 250
+        assert stats["backend_law_data_count"] == 1
+
+        cache.invalidate_law("LAW1")
+        stats = cache.stats()
+        assert stats["backend_search_count"] == 0
+        assert stats["backend_law_data_count"] == 0
+
+    def test_purge_recounts_expired_entries(
+        self, redis: FakeRedis, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """TTLで消えたエントリはバックグラウンドの掃除で数え直す"""
+        cache = _open(redis, tmp_path)
+        cache.set_search_result("民法", {"laws": []})
+        cache.set_law_data("LAW1", SAMPLE_XML, etag='"v1"')
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + CacheManager.DEFAULT_SEARCH_TTL + 1)
+
+        assert cache.stats()["backend_search_count"] == 1
+        cache.purge_expired()
+        assert cache.stats()["backend_search_count"] == 0
+        assert cache.stats()["backend_law_data_count"] == 1
+
+    def test_cache_type_requires_redis_package(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """redis パッケージが無い環境では分かりやすいエラーにする"""
+        import builtins
+
+        real_import = builtins.__import__
+
+        def fake_import(name: str, *args: Any, **kwargs: Any) -> Any:
+            if name == "redis":
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", fake_import)
+        with pytest.raises(RuntimeError, match="redis"):
+            CacheManager(cache_type="redis")
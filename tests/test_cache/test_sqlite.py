@@ -0,0 +1,178 @@
+"""SQLiteキャッシュのユニットテスト"""
+
+import contextlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from egov_law_mcp.cache import CacheManager, SQLiteStore
+
+SAMPLE_XML = '<?xml version="1.0" encoding="UTF-8"?><Law><LawTitle>民法</LawTitle></Law>'
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    for name in ("CACHE_TYPE", "CACHE_DIR", "CACHE_SQLITE_PATH"):
+        monkeypatch.delenv(name, raising=False)
+    return tmp_path
+
+
+def _open(cache_dir: Path) -> CacheManager:
+    return CacheManager(cache_type="sqlite", cache_dir=str(cache_dir))
+
+
+class TestSQLiteCache:
+    """SQLiteキャッシュのテスト"""
+
+    def test_wal_mode(self, cache_dir: Path) -> None:
+        """WALモードで開かれる"""
+        cache = _open(cache_dir)
+        assert cache._backend is not None
+        (mode,) = cache._backend._conn.execute("PRAGMA journal_mode").fetchone()
+        assert mode == "wal"
+
+    def test_shared_between_instances(self, cache_dir: Path) -> None:
+        """別インスタンス（別プロセス相当）から全カテゴリを読める"""
+        writer = _open(cache_dir)
+        writer.set_law_data("LAW1", SAMPLE_XML, etag='"v1"')
+        writer.set_search_result("民法", {"total_count": 1, "laws": [{"law_id": "LAW1"}]})
+        writer.set_revisions("LAW1", {"law_id": "LAW1", "revisions": []})
+
+        reader = _open(cache_dir)
+        entry = reader.get_law_data_entry("LAW1")
+        assert entry is not None
+        assert entry.content == SAMPLE_XML
+        assert entry.etag == '"v1"'
+        assert reader.get_search_result("民法") == {
+            "total_count": 1,
+            "laws": [{"law_id": "LAW1"}],
+        }
+        assert reader.get_revisions("LAW1") == {"law_id": "LAW1", "revisions": []}
+
+    def test_expired_search_not_returned(
+        self, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """TTLを過ぎた検索結果は返さず、パージで削除される"""
+        _open(cache_dir).set_search_result("民法", {"laws": []})
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + CacheManager.DEFAULT_SEARCH_TTL + 1)
+
+        reader = _open(cache_dir)
+        assert reader.get_search_result("民法") is None
+        assert reader.purge_expired() == 1
+
+    def test_purge_keeps_validated_law_data(
+        self, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """検証子付きの法令本文は期限切れでも再検証用に残る"""
+        cache = _open(cache_dir)
+        cache.set_law_data("LAW1", SAMPLE_XML, etag='"v1"')
+        cache.set_law_data("LAW2", SAMPLE_XML)
+        now = time.time()
+        # 期限切れのまま返せる期間も過ぎた時点
+        expired_at = now + CacheManager.DEFAULT_LAW_DATA_TTL + CacheManager.DEFAULT_STALE_IF_ERROR
+        monkeypatch.setattr(time, "time", lambda: expired_at + 1)
+
+        assert cache.purge_expired() == 1
+
+        reader = _open(cache_dir)
+        entry = reader.get_law_data_entry("LAW1")
+        assert entry is not None
+        assert not entry.is_fresh
+        assert reader.renew_law_data("LAW1")
+        assert _open(cache_dir).get_law_data("LAW1") == SAMPLE_XML
+
+    def test_invalidate_law_across_instances(self, cache_dir: Path) -> None:
+        """無効化は他のインスタンスが保存したエントリにも及ぶ"""
+        writer = _open(cache_dir)
+        writer.set_law_data("LAW1", SAMPLE_XML)
+        writer.set_revisions("LAW1", {"revisions": []})
+        writer.set_search_result("民法", {"laws": [{"law_id": "LAW1"}]})
+        writer.set_search_result("刑法", {"laws": [{"law_id": "LAW2"}]})
+
+        _open(cache_dir).invalidate_law("LAW1")
+
+        reader = _open(cache_dir)
+        assert reader.get_law_data("LAW1") is None
+        assert reader.get_revisions("LAW1") is None
+        assert reader.get_search_result("民法") is None
+        assert reader.get_search_result("刑法") is not None
+
+    def test_same_content_stored_once(self, cache_dir: Path) -> None:
+        """同じ本文は1行だけ保存し、参照が無くなればパージで削除される"""
+        writer = _open(cache_dir)
+        writer.set_law_data("LAW1", SAMPLE_XML)
+        writer.set_law_data("LAW2", SAMPLE_XML)
+        assert writer._backend is not None
+        assert writer._backend.count("blob") == 1
+
+        assert _open(cache_dir).get_law_data("LAW2") == SAMPLE_XML
+
+        writer.invalidate_law("LAW1")
+        writer.purge_expired()
+        assert writer._backend.count("blob") == 1
+        writer.invalidate_law("LAW2")
+        writer.purge_expired()
+        assert writer._backend.count("blob") == 0
+
+    def test_purge_counts_entries_only(
+        self, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """パージの件数に、あわせて消した本文は含めない"""
+        cache = _open(cache_dir)
+        cache.set_law_data("LAW1", SAMPLE_XML)
+        cache.set_search_result("民法", {"laws": []})
+        expired_at = time.time() + CacheManager.DEFAULT_LAW_DATA_TTL + cache.stale_grace
+        monkeypatch.setattr(time, "time", lambda: expired_at + 1)
+
+        assert cache.purge_expired() == 2
+        assert cache._backend is not None
+        assert cache._backend.count("blob") == 0
+
+    def test_locked_database_is_cache_miss(
+        self, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """他プロセスが書き込み中でも長く待たず、キャッシュミスとして扱う"""
+        monkeypatch.setenv("CACHE_SQLITE_BUSY_TIMEOUT", "0.05")
+        cache = _open(cache_dir)
+        other = sqlite3.connect(str(cache_dir / "cache.sqlite3"), isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        try:
+            start = time.monotonic()
+            cache.set_search_result("民法", {"laws": []})
+            cache.invalidate_law("LAW1")
+            assert time.monotonic() - start < 1.0
+        finally:
+            other.execute("ROLLBACK")
+            other.close()
+
+        cache.set_search_result("民法", {"laws": []})
+        assert _open(cache_dir).get_search_result("民法") == {"laws": []}
+
+    def test_blob_and_entry_written_together(
+        self, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """本文とそれを参照するエントリの間に他プロセスのパージが割り込んでも本文が消えない"""
+        cache = _open(cache_dir)
+        other = SQLiteStore(cache_dir / "cache.sqlite3", busy_timeout=0.05)
+        insert = SQLiteStore._insert
+
+        def insert_then_purge(self: SQLiteStore, category: str, *args: Any, **kwargs: Any) -> None:
+            insert(self, category, *args, **kwargs)
+            if category == "blob":
+                with contextlib.suppress(sqlite3.OperationalError):
+                    other.purge_expired()
+
+        monkeypatch.setattr(SQLiteStore, "_insert", insert_then_purge)
+        cache.set_law_data("LAW1", SAMPLE_XML)
+        other.close()
+
+        assert _open(cache_dir).get_law_data("LAW1") == SAMPLE_XML
+
+    def test_metadata_shared(self, cache_dir: Path) -> None:
+        """メタデータはインスタンス間で共有される"""
+        _open(cache_dir).set_metadata("last_synced", "2024-04-01")
+        assert _open(cache_dir).get_metadata("last_synced") == "2024-04-01"
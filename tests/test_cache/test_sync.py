@@ -0,0 +1,209 @@
+"""キャッシュ同期のユニットテスト"""
+
+import asyncio
+from datetime import date
+
+import pytest
+import respx
+from httpx import Request, Response
+
+from egov_law_mcp.api import EGovAPIClient
+from egov_law_mcp.cache import CacheManager, CacheSyncer
+from egov_law_mcp.parser import LawXMLParser
+from egov_law_mcp.tools.loader import load_law_data
+
+SAMPLE_XML = "<Law><LawBody><LawTitle>民法</LawTitle></LawBody></Law>"
+
+
+def _updated_laws(*law_ids: str, updated: str = "2024-04-01T00:00:00") -> dict[str, object]:
+    return {
+        "laws": [
+            {
+                "law_info": {"law_id": law_id},
+                "revision_info": {"law_title": f"{law_id}法", "updated": updated},
+            }
+            for law_id in law_ids
+        ]
+    }
+
+
+class TestCacheSyncer:
+    """CacheSyncerのテスト"""
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_invalidates_updated_laws(self) -> None:
+        """更新された法令のキャッシュだけを無効化する"""
+        route = respx.get("https://laws.e-gov.go.jp/api/2/laws").mock(
+            return_value=Response(200, json=_updated_laws("LAW1"))
+        )
+        cache = CacheManager(cache_type="memory")
+        cache.set_law_data("LAW1", SAMPLE_XML)
+        cache.set_law_data("LAW2", SAMPLE_XML)
+        syncer = CacheSyncer(cache, client=EGovAPIClient(), interval=0, refresh=False)
+
+        updated = await syncer.sync_once(today=date(2024, 4, 2))
+
+        assert updated == ["LAW1"]
+        assert cache.get_law_data("LAW1") is None
+        assert cache.get_law_data("LAW2") == SAMPLE_XML
+        params = route.calls.last.request.url.params
+        assert params["updated_from"] == "2024-04-01"
+        assert params["updated_to"] == "2024-04-02"
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_same_update_not_repeated(self) -> None:
+        """同じ更新は次の同期で再度無効化しない"""
+        respx.get("https://laws.e-gov.go.jp/api/2/laws").mock(
+            return_value=Response(200, json=_updated_laws("LAW1"))
+        )
+        cache = CacheManager(cache_type="memory")
+        syncer = CacheSyncer(cache, client=EGovAPIClient(), interval=0, refresh=False)
+
+        await syncer.sync_once(today=date(2024, 4, 2))
+        cache.set_law_data("LAW1", SAMPLE_XML)
+        updated = await syncer.sync_once(today=date(2024, 4, 2))
+
+        assert updated == []
+        assert cache.get_law_data("LAW1") == SAMPLE_XML
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_refresh_cached_law(self) -> None:
+        """refresh有効時はキャッシュ済みだった法令本文を取得し直す"""
+        respx.get("https://laws.e-gov.go.jp/api/2/laws").mock(
+            return_value=Response(200, json=_updated_laws("LAW1", "LAW3"))
+        )
+        law_data = respx.get(url__regex=r"https://laws.e-gov.go.jp/api/2/law_data/.*").mock(
+            side_effect=lambda request: Response(200, content=b"<Law>new</Law>")
+        )
+        cache = CacheManager(cache_type="memory")
+        cache.set_law_data("LAW1", SAMPLE_XML)
+        syncer = CacheSyncer(cache, client=EGovAPIClient(), interval=0, refresh=True)
+
+        await syncer.sync_once(today=date(2024, 4, 2))
+
+        # キャッシュされていなかったLAW3は取得しない
+        assert law_data.call_count == 1
+        assert cache.get_law_data("LAW1") == "<Law>new</Law>"
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_refresh_shares_download_with_loads(self) -> None:
+        """取得し直しは同時に要求された同じ法令の取得とダウンロードを共有する"""
+        respx.get("https://laws.e-gov.go.jp/api/2/laws").mock(
+            return_value=Response(200, json=_updated_laws("LAW1"))
+        )
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def handler(request: Request) -> Response:
+            started.set()
+            await release.wait()
+            return Response(200, content=b"<Law>new</Law>")
+
+        law_data = respx.get(url__regex=r"https://laws.e-gov.go.jp/api/2/law_data/.*").mock(
+            side_effect=handler
+        )
+        cache = CacheManager(cache_type="memory")
+        cache.set_law_data("LAW1", SAMPLE_XML)
+        client = EGovAPIClient()
+        syncer = CacheSyncer(cache, client=client, interval=0, refresh=True)
+
+        sync = asyncio.create_task(syncer.sync_once(today=date(2024, 4, 2)))
+        await started.wait()
+        load = asyncio.create_task(load_law_data("LAW1", None, client, cache, LawXMLParser()))
+        await asyncio.sleep(0)
+        release.set()
+        await sync
+        loaded = await load
+
+        assert law_data.call_count == 1
+        assert loaded.content == "<Law>new</Law>"
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_cached_check_does_not_read_body(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """キャッシュ済みかの確認では法令本文を読まない"""
+        respx.get("https://laws.e-gov.go.jp/api/2/laws").mock(
+            return_value=Response(200, json=_updated_laws("LAW1"))
+        )
+        cache = CacheManager(cache_type="memory")
+        cache.set_law_data("LAW1", SAMPLE_XML)
+        syncer = CacheSyncer(cache, client=EGovAPIClient(), interval=0, refresh=False)
+
+        async def fail(*args: object, **kwargs: object) -> None:
+            raise AssertionError("law body read")
+
+        monkeypatch.setattr(cache, "aget_law_data_entry", fail)
+
+        assert await syncer.sync_once(today=date(2024, 4, 2)) == ["LAW1"]
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_seen_updates_pruned(self) -> None:
+        """同期範囲より前の処理済みの更新は忘れる"""
+        route = respx.get("https://laws.e-gov.go.jp/api/2/laws").mock(
+            return_value=Response(200, json=_updated_laws("LAW1"))
+        )
+        syncer = CacheSyncer(
+            CacheManager(cache_type="memory"), client=EGovAPIClient(), interval=0
+        )
+
+        await syncer.sync_once(today=date(2024, 4, 2))
+        route.mock(return_value=Response(200, json={"laws": []}))
+        await syncer.sync_once(today=date(2024, 4, 5))
+        assert "LAW1" in syncer._seen
+        await syncer.sync_once(today=date(2024, 4, 6))
+
+        assert syncer._seen == {}
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_paginates(self) -> None:
+        """更新件数がページサイズを超える場合は全ページを取得する"""
+
+        def handler(request: Request) -> Response:
+            offset = int(request.url.params["offset"])
+            count = 100 if offset == 0 else 5
+            return Response(
+                200, json=_updated_laws(*(f"LAW{offset + i}" for i in range(count)))
+            )
+
+        route = respx.get("https://laws.e-gov.go.jp/api/2/laws").mock(side_effect=handler)
+        syncer = CacheSyncer(
+            CacheManager(cache_type="memory"), client=EGovAPIClient(), interval=0
+        )
+
+        updated = await syncer.sync_once(today=date(2024, 4, 2))
+
+        assert len(updated) == 105
+        assert route.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_run_survives_unexpected_errors(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """想定外のエラーが起きても同期を続ける"""
+        syncer = CacheSyncer(CacheManager(cache_type="memory"), client=EGovAPIClient(), interval=0)
+        calls = 0
+
+        async def sync_once() -> list[str]:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("boom")
+            raise asyncio.CancelledError
+
+        monkeypatch.setattr(syncer, "sync_once", sync_once)
+
+        with pytest.raises(asyncio.CancelledError):
+            await syncer.run()
+        assert calls == 2
+
+    def test_refresh_flag_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """CACHE_SYNC_REFRESH は他の真偽値の環境変数と同じように読む"""
+        monkeypatch.setenv("CACHE_SYNC_REFRESH", " On ")
+        assert CacheSyncer(CacheManager(cache_type="memory"), client=EGovAPIClient()).refresh
+
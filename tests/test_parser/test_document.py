@@ -0,0 +1,49 @@
+"""LawDocumentのユニットテスト"""
+
+from egov_law_mcp.parser import LawDocument
+
+LAW_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<Law>
+    <LawBody>
+        <LawTitle>テスト法</LawTitle>
+        <MainProvision>
+            <Chapter Num="1">
+                <ChapterTitle>第一章　総則</ChapterTitle>
+                <Article Num="1">
+                    <ArticleCaption>（目的）</ArticleCaption>
+                    <ArticleTitle>第一条</ArticleTitle>
+                    <Paragraph Num="1">
+                        <ParagraphNum/>
+                        <ParagraphSentence>
+                            <Sentence>この法律は、テストを目的とする。</Sentence>
+                        </ParagraphSentence>
+                    </Paragraph>
+                </Article>
+            </Chapter>
+        </MainProvision>
+    </LawBody>
+</Law>
+"""
+
+
+class TestLawDocument:
+    """LawDocumentのテスト"""
+
+    def test_views_share_one_tree(self) -> None:
+        """1回のパースでタイトル・目次・条文・全文を得られる"""
+        document = LawDocument.parse(LAW_XML)
+        root = document.root
+
+        assert document.title == "テスト法"
+        assert "## 第一章　総則" in document.toc()
+        article = document.article("1")
+        assert article is not None
+        assert article.startswith("# テスト法 第一条（目的）")
+        assert "この法律は、テストを目的とする。" in document.full_text()
+        assert document.article("99") is None
+        assert document.root is root
+
+    def test_memory_size_estimate(self) -> None:
+        """メモリ使用量は元のXMLのサイズから見積もる"""
+        document = LawDocument.parse(LAW_XML)
+        assert document.memory_size == len(LAW_XML) * LawDocument.TREE_SIZE_FACTOR
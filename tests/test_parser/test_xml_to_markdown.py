@@ -1,8 +1,12 @@
 """XMLパーサーのユニットテスト (TDD)"""
 
+from collections.abc import AsyncIterator
+
 import pytest
+from lxml import etree
 
-from egov_law_mcp.parser.xml_to_markdown import LawXMLParser
+from egov_law_mcp.parser import normalize_article_number
+from egov_law_mcp.parser.xml_to_markdown import LawVisitor, LawXMLParser, MarkdownVisitor
 
 
 class TestLawXMLParser:
@@ -178,6 +182,43 @@ class TestLawXMLParser:
         result = parser.extract_article(xml, "999")
         assert result is None
 
+    @pytest.mark.parametrize(
+        "article_number",
+        ["709_2", "709-2", "709の2", "第709条の2", "第七百九条の二", "第７０９条の２"],
+    )
+    def test_extract_branch_article(self, parser: LawXMLParser, article_number: str) -> None:
+        """枝番の条文はどの表記でも抽出できる"""
+        xml = """<?xml version="1.0" encoding="UTF-8"?>
+        <Law>
+            <LawBody>
+                <LawTitle>テスト法</LawTitle>
+                <MainProvision>
+                    <Article Num="709">
+                        <ArticleTitle>第七百九条</ArticleTitle>
+                        <Paragraph Num="1">
+                            <ParagraphSentence><Sentence>本条</Sentence></ParagraphSentence>
+                        </Paragraph>
+                    </Article>
+                    <Article Num="709_2">
+                        <ArticleTitle>第七百九条の二</ArticleTitle>
+                        <Paragraph Num="1">
+                            <ParagraphSentence><Sentence>枝番の条</Sentence></ParagraphSentence>
+                        </Paragraph>
+                    </Article>
+                </MainProvision>
+            </LawBody>
+        </Law>
+        """
+        result = parser.extract_article(xml, article_number)
+        assert result is not None
+        assert "枝番の条" in result
+        assert "本条" not in result
+
+    def test_extract_article_invalid_number(self, parser: LawXMLParser) -> None:
+        """解釈できない条番号は例外にならず見つからない扱いになる"""
+        xml = "<Law><LawBody><MainProvision/></LawBody></Law>"
+        assert parser.extract_article(xml, "abc") is None
+
     def test_parse_toc_format(self, parser: LawXMLParser) -> None:
         """目次形式のパース"""
         xml = """<?xml version="1.0" encoding="UTF-8"?>
@@ -236,6 +277,20 @@ class TestLawXMLParser:
         assert "民法を適用する。" in result
         assert "みんぽう" not in result
 
+    def test_sup_and_sub(self, parser: LawXMLParser) -> None:
+        """上付き文字は ^{...}、下付き文字は _{...} に変換する"""
+        xml = """<Law><LawBody><LawTitle>テスト法</LawTitle><MainProvision>
+            <Article Num="1"><ArticleTitle>第一条</ArticleTitle>
+            <Paragraph Num="1"><ParagraphNum/><ParagraphSentence>
+            <Sentence>十<Sup>6</Sup>トンのCO<Sub>2</Sub>及び<Ruby>硫黄<Rt>いおう</Rt></Ruby>と
+            x<Sup>n<Sub>i</Sub></Sup></Sentence>
+            </ParagraphSentence></Paragraph></Article>
+            </MainProvision></LawBody></Law>"""
+        result = parser.parse_full_text(xml)
+        assert "十^{6}トンのCO_{2}及び硫黄と" in result
+        assert "x^{n_{i}}" in result
+        assert "いおう" not in result
+
     def test_get_law_title(self, parser: LawXMLParser) -> None:
         """法令タイトル取得"""
         xml = """<?xml version="1.0" encoding="UTF-8"?>
@@ -319,3 +374,182 @@ class TestLawXMLParser:
         assert "イ" in result
         assert "ロ" in result
         assert "イの内容" in result
+
+    @pytest.mark.asyncio
+    async def test_parse_stream(self, parser: LawXMLParser) -> None:
+        """チャンク単位の逐次パース"""
+        xml = "<Law><LawBody><LawTitle>民<Ruby>法<Rt>ほう</Rt></Ruby></LawTitle></LawBody></Law>".encode()
+        received: list[bytes] = []
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for i in range(0, len(xml), 7):
+                yield xml[i : i + 7]
+
+        root = await parser.parse_stream(chunks(), sink=received.append)
+
+        assert parser.get_law_title(root) == "民法"
+        assert b"".join(received) == xml
+
+    def test_accepts_parsed_root(self, parser: LawXMLParser) -> None:
+        """パース済みの要素を渡せる"""
+        xml = """<Law><LawBody><LawTitle>テスト法</LawTitle><MainProvision>
+            <Article Num="1"><ArticleTitle>第一条</ArticleTitle>
+            <Paragraph Num="1"><ParagraphNum/><ParagraphSentence>
+            <Sentence>内容</Sentence></ParagraphSentence></Paragraph></Article>
+            </MainProvision></LawBody></Law>"""
+        root = parser.parse(xml)
+
+        assert parser.parse(root) is root
+        assert parser.get_law_title(root) == "テスト法"
+        assert parser.extract_article(root, "1") == parser.extract_article(xml, "1")
+        assert parser.parse_full_text(root) == parser.parse_full_text(xml)
+
+
+class TestIterFullText:
+    """全文の逐次変換のテスト"""
+
+    LAW_XML = """<?xml version="1.0" encoding="UTF-8"?>
+    <Law>
+        <LawBody>
+            <LawTitle>テスト<Ruby>法<Rt>ほう</Rt></Ruby></LawTitle>
+            <TOC><TOCLabel>目次</TOCLabel></TOC>
+            <MainProvision>
+                <Part Num="1">
+                    <PartTitle>第一編　総則</PartTitle>
+                    <Chapter Num="1">
+                        <ChapterTitle>第一章　通則</ChapterTitle>
+                        <Section Num="1">
+                            <SectionTitle>第一節　目的</SectionTitle>
+                            <Article Num="1">
+                                <ArticleCaption>（目的）</ArticleCaption>
+                                <ArticleTitle>第一条</ArticleTitle>
+                                <Paragraph Num="1">
+                                    <ParagraphNum/>
+                                    <ParagraphSentence>
+                                        <Sentence><Ruby>目的<Rt>もくてき</Rt></Ruby>を十<Sup>6</Sup>定める。</Sentence>
+                                    </ParagraphSentence>
+                                    <Item Num="1">
+                                        <ItemTitle>一</ItemTitle>
+                                        <ItemSentence><Sentence>号</Sentence></ItemSentence>
+                                        <Subitem1 Num="1">
+                                            <Subitem1Title>イ</Subitem1Title>
+                                            <Subitem1Sentence><Sentence>細分</Sentence></Subitem1Sentence>
+                                        </Subitem1>
+                                    </Item>
+                                </Paragraph>
+                            </Article>
+                        </Section>
+                    </Chapter>
+                </Part>
+            </MainProvision>
+            <SupplProvision>
+                <Paragraph Num="1">
+                    <ParagraphNum/>
+                    <ParagraphSentence><Sentence>公布の日から施行する。</Sentence></ParagraphSentence>
+                </Paragraph>
+            </SupplProvision>
+            <SupplProvision AmendLawNum="令和元年法律第一号">
+                <Article Num="1">
+                    <ArticleTitle>第一条</ArticleTitle>
+                    <Paragraph Num="1">
+                        <ParagraphSentence><Sentence>附則の条</Sentence></ParagraphSentence>
+                    </Paragraph>
+                </Article>
+            </SupplProvision>
+        </LawBody>
+    </Law>
+    """
+
+    def test_matches_parse_full_text(self) -> None:
+        """チャンクを連結すると parse_full_text の結果と一致する"""
+        parser = LawXMLParser()
+        chunks = list(parser.iter_full_text(self.LAW_XML))
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == parser.parse_full_text(self.LAW_XML)
+        assert chunks[0] == "# テスト法\n"
+
+    def test_small_feed_size(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """要素の途中で区切って読み込んでも結果は変わらない"""
+        parser = LawXMLParser()
+        monkeypatch.setattr(LawXMLParser, "STREAM_FEED_SIZE", 7)
+
+        result = "".join(parser.iter_full_text(self.LAW_XML.encode("utf-8")))
+        assert result == parser.parse_full_text(self.LAW_XML)
+
+
+class TestRender:
+    """要素の走査（render）と変換処理のテスト"""
+
+    def test_custom_visitor(self) -> None:
+        """CHILDREN で指定した子要素だけを文書順に辿る"""
+
+        class ArticleNumVisitor(LawVisitor):
+            CHILDREN = {
+                "MainProvision": frozenset({"Chapter", "Article"}),
+                "Chapter": frozenset({"Article"}),
+            }
+
+            def enter(self, element: etree._Element) -> None:
+                if element.tag == "Article":
+                    self.lines.append(element.get("Num", ""))
+
+        parser = LawXMLParser()
+        root = parser.parse(
+            """<Law><LawBody><MainProvision>
+            <Article Num="1"/>
+            <Chapter Num="1"><Article Num="2"/><Section Num="1"><Article Num="9"/></Section></Chapter>
+            <Article Num="3"/>
+            </MainProvision></LawBody></Law>"""
+        )
+        main = root.find(".//MainProvision")
+        assert main is not None
+
+        visitor = parser.render(main, ArticleNumVisitor(parser))
+        assert visitor.getvalue() == "1\n2\n3"
+
+    def test_deep_subitems(self) -> None:
+        """深い号の細分も階層に応じて字下げする"""
+        inner = ""
+        for level in range(10, 0, -1):
+            inner = (
+                f"<Subitem{level}><Subitem{level}Title>{level}</Subitem{level}Title>"
+                f"<Subitem{level}Sentence><Sentence>細分</Sentence></Subitem{level}Sentence>"
+                f"{inner}</Subitem{level}>"
+            )
+        parser = LawXMLParser()
+        item = parser.parse(f"<Item><ItemTitle>一</ItemTitle>{inner}</Item>")
+
+        lines = parser.render(item, MarkdownVisitor(parser)).lines
+        assert lines[0] == "* 一 "
+        assert lines[1] == "  * 1 細分"
+        assert lines[10] == "  " * 10 + "* 10 細分"
+        assert len(lines) == 11
+
+
+class TestNormalizeArticleNumber:
+    """条番号の正規化のテスト"""
+
+    @pytest.mark.parametrize(
+        ("article_number", "expected"),
+        [
+            ("709", "709"),
+            ("７０９", "709"),
+            ("第709条", "709"),
+            ("第七百九条", "709"),
+            ("千五十", "1050"),
+            ("二十", "20"),
+            ("十", "10"),
+            ("709_2", "709_2"),
+            ("第三条の二の三", "3_2_3"),
+            ("三十二条の二", "32_2"),
+        ],
+    )
+    def test_normalize(self, article_number: str, expected: str) -> None:
+        """算用数字・全角数字・漢数字・枝番の表記を Num 属性の形式にそろえる"""
+        assert normalize_article_number(article_number) == expected
+
+    @pytest.mark.parametrize("article_number", ["", "abc", "0", "第一条第二項", "一一百"])
+    def test_invalid(self, article_number: str) -> None:
+        """解釈できない表記はNone"""
+        assert normalize_article_number(article_number) is None
@@ -1,17 +1,33 @@
 """MCPツールのユニットテスト"""
 
+import asyncio
+import time
+from datetime import date
+from typing import Any
+
 import pytest
 import respx
-from httpx import Response
+from httpx import Request, Response
+from lxml import etree
 
-from egov_law_mcp.api import EGovAPIClient
+from egov_law_mcp.api import EGovAPIClient, EGovAPIError, RetryPolicy
 from egov_law_mcp.cache import CacheManager
+from egov_law_mcp.parser import LawXMLParser
 from egov_law_mcp.tools import (
+    bulk,
     get_law_article,
+    get_law_data_many,
     get_law_full_text,
+    iter_law_data_many,
+    iter_law_full_text,
+    iter_search_laws,
     list_law_types,
+    open_law_full_text,
     search_laws,
+    search_laws_all,
+    wait_background_refreshes,
 )
+from egov_law_mcp.tools.revisions import RevisionTimeline
 
 
 class TestListLawTypes:
@@ -66,6 +82,111 @@ class TestSearchLaws:
         assert result.laws[0].law_id == "329AC0000000089"
         assert result.laws[0].law_name == "民法"
 
+    @staticmethod
+    def _page(start: int, count: int) -> dict[str, list[dict[str, dict[str, str]]]]:
+        return {
+            "laws": [
+                {
+                    "law_info": {"law_id": f"LAW_{i:03d}", "law_num": f"第{i}号"},
+                    "revision_info": {"law_title": f"府省令{i}"},
+                }
+                for i in range(start, start + count)
+            ]
+        }
+
+    def _mock_pages(self, total: int) -> respx.Route:
+        def handler(request: Request) -> Response:
+            limit = int(request.url.params["limit"])
+            offset = int(request.url.params["offset"])
+            return Response(200, json=self._page(offset, max(0, min(limit, total - offset))))
+
+        return respx.get("https://laws.e-gov.go.jp/api/2/laws").mock(side_effect=handler)
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_iter_search_laws_all_pages(self) -> None:
+        """全ページを順に返し、最後のページで止まる"""
+        route = self._mock_pages(total=25)
+
+        law_ids = [
+            law.law_id
+            async for law in iter_search_laws(
+                "府省令", page_size=10, client=EGovAPIClient(), cache=CacheManager()
+            )
+        ]
+
+        assert law_ids == [f"LAW_{i:03d}" for i in range(25)]
+        assert route.call_count == 3
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_iter_search_laws_stops_prefetch_on_break(self) -> None:
+        """途中で打ち切った場合は先読み中のページ以降を取得しない"""
+        route = self._mock_pages(total=1000)
+
+        async for _ in iter_search_laws(
+            "府省令", page_size=10, client=EGovAPIClient(), cache=CacheManager()
+        ):
+            break
+        await asyncio.sleep(0)
+
+        assert route.call_count <= 2
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_iter_search_laws_awaits_prefetch_on_close(self) -> None:
+        """閉じた時点で先読み中のページのタスクも終わっている"""
+        self._mock_pages(total=1000)
+        laws = iter_search_laws(
+            "府省令", page_size=10, client=EGovAPIClient(), cache=CacheManager()
+        )
+
+        await anext(laws)
+        await laws.aclose()
+
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_search_laws_all(self) -> None:
+        """ページをまたいで最大件数まで取得する"""
+        route = self._mock_pages(total=230)
+
+        result = await search_laws_all(
+            "府省令", max_results=250, client=EGovAPIClient(), cache=CacheManager()
+        )
+
+        assert result.total_count == 230
+        assert result.laws[-1].law_id == "LAW_229"
+        assert route.call_count == 3
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_search_laws_all_bounded_fan_out(self) -> None:
+        """件数の少ない検索では、存在しないページまで一度に問い合わせない"""
+        route = self._mock_pages(total=230)
+
+        result = await search_laws_all(
+            "府省令", max_results=1000, client=EGovAPIClient(), cache=CacheManager()
+        )
+
+        assert result.total_count == 230
+        # 1ページ目 + 1ウィンドウ（3ページ）で打ち切る
+        assert route.call_count == 4
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_search_laws_all_truncates(self) -> None:
+        """max_resultsを超える分は返さない"""
+        self._mock_pages(total=1000)
+
+        result = await search_laws_all(
+            "府省令", max_results=150, client=EGovAPIClient(), cache=CacheManager()
+        )
+
+        assert result.total_count == 150
+        assert len({law.law_id for law in result.laws}) == 150
+
 
 class TestGetLawArticle:
     """get_law_articleのテスト"""
@@ -115,6 +236,69 @@ class TestGetLawArticle:
         assert "故意又は過失" in result.content
 
 
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_concurrent_articles_share_download(self) -> None:
+        """同じ法令の条文を同時に取得してもダウンロードは1回"""
+        mock_xml = """<Law><LawBody><LawTitle>民法</LawTitle><MainProvision>
+            <Article Num="1"><ArticleTitle>第一条</ArticleTitle><Paragraph Num="1">
+            <ParagraphNum/><ParagraphSentence><Sentence>一条</Sentence></ParagraphSentence>
+            </Paragraph></Article>
+            <Article Num="2"><ArticleTitle>第二条</ArticleTitle><Paragraph Num="1">
+            <ParagraphNum/><ParagraphSentence><Sentence>二条</Sentence></ParagraphSentence>
+            </Paragraph></Article></MainProvision></LawBody></Law>"""
+
+        route = respx.get("https://laws.e-gov.go.jp/api/2/law_data/CONCURRENT_ID").mock(
+            return_value=Response(200, content=mock_xml.encode("utf-8"))
+        )
+
+        client = EGovAPIClient()
+        cache = CacheManager()
+
+        results = await asyncio.gather(
+            get_law_article(law_id="CONCURRENT_ID", article_number="1", client=client, cache=cache),
+            get_law_article(law_id="CONCURRENT_ID", article_number="2", client=client, cache=cache),
+        )
+
+        assert route.call_count == 1
+        assert "一条" in results[0].content
+        assert "二条" in results[1].content
+        assert cache.get_law_data("CONCURRENT_ID") is not None
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_expired_cache_revalidated_with_304(self) -> None:
+        """期限切れキャッシュは条件付きGETで再検証される"""
+        mock_xml = """<Law><LawBody><LawTitle>民法</LawTitle><MainProvision>
+            <Article Num="1"><ArticleTitle>第一条</ArticleTitle><Paragraph Num="1">
+            <ParagraphNum/><ParagraphSentence><Sentence>本文</Sentence></ParagraphSentence>
+            </Paragraph></Article></MainProvision></LawBody></Law>"""
+
+        route = respx.get("https://laws.e-gov.go.jp/api/2/law_data/REVALIDATE_ID").mock(
+            side_effect=[
+                Response(200, content=mock_xml.encode("utf-8"), headers={"ETag": '"v1"'}),
+                Response(304),
+            ]
+        )
+
+        client = EGovAPIClient()
+        cache = CacheManager()
+
+        await get_law_article(law_id="REVALIDATE_ID", article_number="1", client=client, cache=cache)
+        entry = cache.get_law_data_entry("REVALIDATE_ID")
+        assert entry is not None
+        entry.expires_at = 0
+
+        result = await get_law_article(
+            law_id="REVALIDATE_ID", article_number="1", client=client, cache=cache
+        )
+
+        assert route.call_count == 2
+        assert route.calls.last.request.headers["If-None-Match"] == '"v1"'
+        assert "本文" in result.content
+        assert cache.get_law_data("REVALIDATE_ID") is not None
+
+
 class TestGetLawFullText:
     """get_law_full_textのテスト"""
 
@@ -207,3 +391,551 @@ class TestGetLawFullText:
         assert "# 第一編　総則" in result.content
         assert "## 第一章　通則" in result.content
         assert "本文" not in result.content  # 本文は含まれない
+
+    @pytest.mark.asyncio
+    async def test_iter_law_full_text(self) -> None:
+        """逐次取得したチャンクを連結すると全文と一致する"""
+        articles = "".join(
+            f'<Article Num="{i}"><ArticleTitle>第{i}条</ArticleTitle><Paragraph Num="1">'
+            f"<ParagraphNum/><ParagraphSentence><Sentence>本文{i}</Sentence>"
+            "</ParagraphSentence></Paragraph></Article>"
+            for i in range(1, 21)
+        )
+        xml = (
+            "<Law><LawBody><LawTitle>テスト法</LawTitle>"
+            f"<MainProvision>{articles}</MainProvision></LawBody></Law>"
+        )
+        client = EGovAPIClient()
+        streamed_cache = CacheManager()
+        streamed_cache.set_law_data("STREAM_ID", xml)
+
+        chunks = [
+            chunk
+            async for chunk in iter_law_full_text(
+                "STREAM_ID", chunk_size=50, client=client, cache=streamed_cache
+            )
+        ]
+
+        cache = CacheManager()
+        cache.set_law_data("STREAM_ID", xml)
+        full = await get_law_full_text("STREAM_ID", client=client, cache=cache)
+        assert len(chunks) > 1
+        assert "".join(chunks) == full.content
+
+        # 変換済みの全文がキャッシュにあればそれを分割して返す
+        cached = [
+            chunk
+            async for chunk in iter_law_full_text(
+                "STREAM_ID", chunk_size=50, client=client, cache=cache
+            )
+        ]
+        assert "".join(cached) == full.content
+        assert all(len(chunk) <= 50 for chunk in cached)
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_open_law_full_text_parses_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """ダウンロード時にパース済みなら、逐次変換のためにXMLを読み直さない"""
+        respx.get("https://laws.e-gov.go.jp/api/2/law_data/STREAM_ID").mock(
+            return_value=Response(200, content=TestDerivedCache.LAW_XML.encode("utf-8"))
+        )
+
+        original_parse = LawXMLParser.parse
+
+        def parse_tree_only(self: LawXMLParser, xml_content: Any) -> Any:
+            if not isinstance(xml_content, etree._Element):
+                raise AssertionError("parsed twice")
+            return original_parse(self, xml_content)
+
+        def fail(*args: Any, **kwargs: Any) -> Any:
+            raise AssertionError("parsed twice")
+
+        monkeypatch.setattr(LawXMLParser, "parse", parse_tree_only)
+        monkeypatch.setattr(LawXMLParser, "iter_full_text", fail)
+        cache = CacheManager()
+
+        stream = await open_law_full_text("STREAM_ID", client=EGovAPIClient(), cache=cache)
+
+        assert not stream.stale
+        assert "旧本文" in "".join(stream)
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_open_law_full_text_stale(self) -> None:
+        """期限切れのキャッシュから返した場合は stale になる"""
+        respx.get("https://laws.e-gov.go.jp/api/2/law_data/STALE_ID").mock(
+            return_value=Response(503)
+        )
+        client = EGovAPIClient(retry_policy=RetryPolicy(max_retries=0))
+        cache = TestStaleServing()._expired_cache(
+            seconds_ago=CacheManager.DEFAULT_STALE_WHILE_REVALIDATE + 10
+        )
+
+        stream = await open_law_full_text("STALE_ID", client=client, cache=cache)
+
+        assert stream.stale
+        assert "旧本文" in "".join(stream)
+
+
+class TestGetLawDataMany:
+    """get_law_data_manyのテスト"""
+
+    @staticmethod
+    def _law_xml(title: str) -> bytes:
+        return (
+            f"<Law><LawBody><LawTitle>{title}</LawTitle><MainProvision>"
+            f"<Article Num=\"1\"><ArticleTitle>第一条</ArticleTitle></Article>"
+            f"</MainProvision></LawBody></Law>"
+        ).encode()
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_partial_success(self) -> None:
+        """一部が404でも取得できた法令とエラーを入力順に返す"""
+        respx.get("https://laws.e-gov.go.jp/api/2/law_data/BULK_A").mock(
+            return_value=Response(200, content=self._law_xml("甲法"))
+        )
+        respx.get("https://laws.e-gov.go.jp/api/2/law_data/BULK_MISSING").mock(
+            return_value=Response(404)
+        )
+        respx.get("https://laws.e-gov.go.jp/api/2/law_data/BULK_B").mock(
+            return_value=Response(200, content=self._law_xml("乙法"))
+        )
+
+        result = await get_law_data_many(
+            ["BULK_A", "BULK_MISSING", "BULK_B", "BULK_A"],
+            client=EGovAPIClient(),
+            cache=CacheManager(),
+        )
+
+        assert result.total_count == 3
+        assert [law.law_id for law in result.laws] == ["BULK_A", "BULK_B"]
+        assert [law.law_name for law in result.laws] == ["甲法", "乙法"]
+        assert len(result.errors) == 1
+        assert result.errors[0].law_id == "BULK_MISSING"
+        assert result.errors[0].error.code.value == "E002"
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_streams_cached_laws(self) -> None:
+        """キャッシュ済みの法令はAPIを呼ばずに完了順に返す"""
+        cache = CacheManager()
+        for i in range(6):
+            cache.set_law_data(f"CACHED_{i}", self._law_xml(f"法{i}").decode("utf-8"))
+
+        results = [
+            result
+            async for result in iter_law_data_many(
+                [f"CACHED_{i}" for i in range(6)],
+                max_concurrency=2,
+                client=EGovAPIClient(),
+                cache=cache,
+            )
+        ]
+
+        assert sorted(result.law_id for result in results) == [f"CACHED_{i}" for i in range(6)]
+
+    @pytest.mark.asyncio
+    async def test_break_waits_for_cancelled_fetches(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """反復を打ち切ると、残りの取得をキャンセルして終わるまで待つ"""
+        finished: list[str] = []
+
+        async def fetch(law_id: str, **kwargs: Any) -> Any:
+            try:
+                await asyncio.sleep(0 if law_id == "SLOW_0" else 10)
+                return await get_law_full_text(law_id, **kwargs)
+            finally:
+                finished.append(law_id)
+
+        monkeypatch.setattr(bulk, "get_law_full_text", fetch)
+        cache = CacheManager()
+        cache.set_law_data("SLOW_0", self._law_xml("法").decode("utf-8"))
+        results = iter_law_data_many(
+            [f"SLOW_{i}" for i in range(3)], client=EGovAPIClient(), cache=cache
+        )
+        async for _ in results:
+            break
+        await results.aclose()
+
+        assert sorted(finished) == ["SLOW_0", "SLOW_1", "SLOW_2"]
+
+    @pytest.mark.asyncio
+    async def test_ids_validated_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """法令IDの検証は1回だけ行う"""
+        calls = 0
+        original = bulk._unique_law_ids
+
+        def counting(law_ids: list[str]) -> list[str]:
+            nonlocal calls
+            calls += 1
+            return original(law_ids)
+
+        monkeypatch.setattr(bulk, "_unique_law_ids", counting)
+        cache = CacheManager()
+        cache.set_law_data("CACHED", self._law_xml("法").decode("utf-8"))
+
+        await get_law_data_many(["CACHED"], client=EGovAPIClient(), cache=cache)
+
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_too_many_ids(self) -> None:
+        """上限を超える法令IDはE004"""
+        with pytest.raises(EGovAPIError) as exc_info:
+            await get_law_data_many([f"ID_{i}" for i in range(101)], cache=CacheManager())
+
+        assert exc_info.value.code == "E004"
+
+
+class TestDerivedCache:
+    """派生データキャッシュのテスト"""
+
+    LAW_XML = (
+        "<Law><LawBody><LawTitle>テスト法</LawTitle><MainProvision>"
+        '<Article Num="1"><ArticleTitle>第一条</ArticleTitle><Paragraph Num="1">'
+        "<ParagraphNum/><ParagraphSentence><Sentence>旧本文</Sentence></ParagraphSentence>"
+        "</Paragraph></Article></MainProvision></LawBody></Law>"
+    )
+
+    @pytest.mark.asyncio
+    async def test_repeat_requests_skip_parsing(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """2回目以降の全文・目次・条文取得はパースせずキャッシュから返す"""
+        cache = CacheManager()
+        cache.set_law_data("DERIVED_ID", self.LAW_XML)
+        client = EGovAPIClient()
+
+        first_md = await get_law_full_text("DERIVED_ID", client=client, cache=cache)
+        first_toc = await get_law_full_text(
+            "DERIVED_ID", output_format="toc", client=client, cache=cache
+        )
+        first_article = await get_law_article("DERIVED_ID", "1", client=client, cache=cache)
+
+        def fail(*args: object, **kwargs: object) -> None:
+            raise AssertionError("parsed again")
+
+        monkeypatch.setattr(LawXMLParser, "parse", fail)
+
+        assert (await get_law_full_text("DERIVED_ID", client=client, cache=cache)) == first_md
+        assert (
+            await get_law_full_text("DERIVED_ID", output_format="toc", client=client, cache=cache)
+        ) == first_toc
+        assert (
+            await get_law_article("DERIVED_ID", "1", client=client, cache=cache)
+        ) == first_article
+
+    @pytest.mark.asyncio
+    async def test_document_parsed_once_across_articles(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """別の条文を続けて取得しても、パース済みの文書を使い回す"""
+        cache = CacheManager()
+        xml = self.LAW_XML.replace(
+            "</MainProvision>",
+            '<Article Num="2"><ArticleTitle>第二条</ArticleTitle><Paragraph Num="1">'
+            "<ParagraphNum/><ParagraphSentence><Sentence>二条本文</Sentence>"
+            "</ParagraphSentence></Paragraph></Article></MainProvision>",
+        )
+        cache.set_law_data("DERIVED_ID", xml)
+        client = EGovAPIClient()
+        parse_count = 0
+        original_parse = LawXMLParser.parse
+
+        def counting_parse(self: LawXMLParser, xml_content: Any) -> Any:
+            nonlocal parse_count
+            if not isinstance(xml_content, etree._Element):
+                parse_count += 1
+            return original_parse(self, xml_content)
+
+        monkeypatch.setattr(LawXMLParser, "parse", counting_parse)
+
+        first = await get_law_article("DERIVED_ID", "1", client=client, cache=cache)
+        second = await get_law_article("DERIVED_ID", "2", client=client, cache=cache)
+        toc = await get_law_full_text("DERIVED_ID", output_format="toc", client=client, cache=cache)
+
+        assert first.law_name == second.law_name == "テスト法"
+        assert "二条本文" in second.content
+        assert "第二条" in toc.content
+        assert parse_count == 1
+        assert cache.stats()["document_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_article_number_forms_share_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """表記の違う同じ条番号は同じ派生データを使う"""
+        cache = CacheManager()
+        cache.set_law_data("DERIVED_ID", self.LAW_XML)
+        client = EGovAPIClient()
+        first = await get_law_article("DERIVED_ID", "1", client=client, cache=cache)
+
+        def fail(*args: object, **kwargs: object) -> None:
+            raise AssertionError("parsed again")
+
+        monkeypatch.setattr(LawXMLParser, "extract_article", fail)
+
+        kanji = await get_law_article("DERIVED_ID", "第一条", client=client, cache=cache)
+        assert kanji.content == first.content
+        assert kanji.article_number == "第一条"
+
+    @pytest.mark.asyncio
+    async def test_source_change_invalidates(self) -> None:
+        """元XMLが変わると派生データも作り直される"""
+        cache = CacheManager()
+        client = EGovAPIClient()
+        cache.set_law_data("DERIVED_ID", self.LAW_XML)
+        await get_law_full_text("DERIVED_ID", client=client, cache=cache)
+
+        cache.set_law_data("DERIVED_ID", self.LAW_XML.replace("旧本文", "新本文"))
+        result = await get_law_full_text("DERIVED_ID", client=client, cache=cache)
+
+        assert "新本文" in result.content
+
+
+class TestNegativeCache:
+    """「見つからない」結果のキャッシュのテスト"""
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_missing_law_not_refetched(self) -> None:
+        """存在しない法令IDの2回目はAPIを呼ばずにエラーを返す"""
+        route = respx.get("https://laws.e-gov.go.jp/api/2/law_data/MISSING_ID").mock(
+            return_value=Response(404)
+        )
+        client = EGovAPIClient()
+        cache = CacheManager()
+
+        for _ in range(3):
+            with pytest.raises(EGovAPIError) as exc_info:
+                await get_law_full_text("MISSING_ID", client=client, cache=cache)
+            assert exc_info.value.code == "E002"
+
+        assert route.call_count == 1
+        assert cache.stats()["negative_hit_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_article_not_reparsed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """存在しない条番号の2回目はパースせずにエラーを返す"""
+        cache = CacheManager()
+        cache.set_law_data("NEG_ID", TestDerivedCache.LAW_XML)
+        client = EGovAPIClient()
+
+        with pytest.raises(EGovAPIError) as exc_info:
+            await get_law_article("NEG_ID", "999", client=client, cache=cache)
+        assert exc_info.value.code == "E003"
+
+        def fail(*args: object, **kwargs: object) -> None:
+            raise AssertionError("parsed again")
+
+        monkeypatch.setattr(LawXMLParser, "parse", fail)
+        with pytest.raises(EGovAPIError) as exc_info:
+            await get_law_article("NEG_ID", "999", client=client, cache=cache)
+        assert exc_info.value.code == "E003"
+        assert exc_info.value.details == {"law_id": "NEG_ID", "article_number": "999"}
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_disabled_with_zero_ttl(self) -> None:
+        """TTLが0ならキャッシュしない"""
+        route = respx.get("https://laws.e-gov.go.jp/api/2/law_data/MISSING_ID").mock(
+            return_value=Response(404)
+        )
+        client = EGovAPIClient()
+        cache = CacheManager(negative_ttl=0)
+
+        for _ in range(2):
+            with pytest.raises(EGovAPIError):
+                await get_law_full_text("MISSING_ID", client=client, cache=cache)
+
+        assert route.call_count == 2
+
+
+class TestStaleServing:
+    """期限切れの法令本文の扱い（stale-while-revalidate / stale-if-error）のテスト"""
+
+    URL = "https://laws.e-gov.go.jp/api/2/law_data/STALE_ID"
+    NEW_XML = TestDerivedCache.LAW_XML.replace("旧本文", "新本文")
+
+    def _expired_cache(self, seconds_ago: float) -> CacheManager:
+        cache = CacheManager()
+        cache.set_law_data("STALE_ID", TestDerivedCache.LAW_XML)
+        entry = cache.get_law_data_entry("STALE_ID")
+        assert entry is not None
+        entry.expires_at = time.time() - seconds_ago
+        return cache
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self) -> None:
+        """期限切れ直後は古い本文をすぐに返し、バックグラウンドで取得し直す"""
+        route = respx.get(self.URL).mock(
+            return_value=Response(200, content=self.NEW_XML.encode("utf-8"))
+        )
+        client = EGovAPIClient()
+        cache = self._expired_cache(seconds_ago=10)
+
+        first = await get_law_article("STALE_ID", "1", client=client, cache=cache)
+        assert first.stale
+        assert "旧本文" in first.content
+
+        await wait_background_refreshes()
+        assert route.call_count == 1
+
+        second = await get_law_article("STALE_ID", "1", client=client, cache=cache)
+        assert not second.stale
+        assert "新本文" in second.content
+        assert route.call_count == 1
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_stale_if_error(self) -> None:
+        """取得し直しに失敗した場合は期限切れの本文を返す"""
+        respx.get(self.URL).mock(return_value=Response(503))
+        client = EGovAPIClient(retry_policy=RetryPolicy(max_retries=0))
+        cache = self._expired_cache(seconds_ago=CacheManager.DEFAULT_STALE_WHILE_REVALIDATE + 10)
+
+        result = await get_law_full_text("STALE_ID", client=client, cache=cache)
+
+        assert result.stale
+        assert "旧本文" in result.content
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_too_old_raises(self) -> None:
+        """返してよい期間を過ぎたエントリはAPIエラーをそのまま返す"""
+        respx.get(self.URL).mock(return_value=Response(503))
+        client = EGovAPIClient(retry_policy=RetryPolicy(max_retries=0))
+        cache = self._expired_cache(seconds_ago=CacheManager.DEFAULT_STALE_IF_ERROR + 10)
+
+        with pytest.raises(EGovAPIError):
+            await get_law_full_text("STALE_ID", client=client, cache=cache)
+
+
+class TestRevisionAwareCache:
+    """施行日時点を法令履歴IDに変換してキャッシュするテスト"""
+
+    REVISIONS = {
+        "law_info": {"law_id": "REV_ID"},
+        "revisions": [
+            {
+                "law_revision_id": "REV_ID_20210401",
+                "law_title": "テスト法",
+                "amendment_enforcement_date": "2021-04-01",
+            },
+            {
+                "law_revision_id": "REV_ID_20190401",
+                "law_title": "テスト法",
+                "amendment_enforcement_date": "2019-04-01",
+            },
+        ],
+    }
+
+    def test_timeline_resolve(self) -> None:
+        """施行日時点で有効な法令履歴IDを返す"""
+        timeline = RevisionTimeline(
+            [
+                {"revision_id": "B", "enforced_date": "2021-04-01"},
+                {"revision_id": "A", "enforced_date": "2019-04-01"},
+                {"revision_id": "C1", "enforced_date": "2023-01-01"},
+                {"revision_id": "C2", "enforced_date": "2023-01-01"},
+                {"revision_id": "X", "enforced_date": None},
+            ]
+        )
+        assert timeline.resolve(date(2018, 1, 1)) is None
+        assert timeline.resolve(date(2019, 4, 1)) == "A"
+        assert timeline.resolve(date(2021, 3, 31)) == "A"
+        assert timeline.resolve(date(2022, 12, 31)) == "B"
+        # 同じ施行日に複数の履歴がある場合は決められない
+        assert timeline.resolve(date(2024, 1, 1)) is None
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_dates_in_same_revision_share_entry(self) -> None:
+        """同じ改正の施行期間内の日付は、1回の取得・1つのエントリを共有する"""
+        revisions_route = respx.get("https://laws.e-gov.go.jp/api/2/law_revisions/REV_ID").mock(
+            return_value=Response(200, json=self.REVISIONS)
+        )
+        law_route = respx.get("https://laws.e-gov.go.jp/api/2/law_data/REV_ID_20190401").mock(
+            return_value=Response(200, content=TestDerivedCache.LAW_XML.encode("utf-8"))
+        )
+        client = EGovAPIClient()
+        cache = CacheManager()
+
+        for asof in ("2020-04-01", "2020-04-02", "2021-03-31"):
+            result = await get_law_article("REV_ID", "1", asof=asof, client=client, cache=cache)
+            assert "旧本文" in result.content
+
+        assert revisions_route.call_count == 1
+        assert law_route.call_count == 1
+        assert "asof" not in law_route.calls.last.request.url.params
+        assert cache.get_law_data("REV_ID", revision_id="REV_ID_20190401") is not None
+        assert cache.stats()["law_data_count"] == 1
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_falls_back_to_asof(self) -> None:
+        """改正履歴を取得できない場合は施行日時点で取得する"""
+        respx.get("https://laws.e-gov.go.jp/api/2/law_revisions/REV_ID").mock(
+            return_value=Response(404)
+        )
+        law_route = respx.get("https://laws.e-gov.go.jp/api/2/law_data/REV_ID").mock(
+            return_value=Response(200, content=TestDerivedCache.LAW_XML.encode("utf-8"))
+        )
+        client = EGovAPIClient()
+        cache = CacheManager()
+
+        await get_law_full_text("REV_ID", asof="2020-04-01", client=client, cache=cache)
+
+        assert law_route.calls.last.request.url.params["asof"] == "2020-04-01"
+        assert cache.get_law_data("REV_ID", asof="2020-04-01") is not None
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_expired_revisions_serve_stale_on_error(self) -> None:
+        """改正履歴も法令本文も期限切れでAPIが落ちている場合、期限切れの本文を返す"""
+        revisions_route = respx.get("https://laws.e-gov.go.jp/api/2/law_revisions/REV_ID").mock(
+            return_value=Response(200, json=self.REVISIONS)
+        )
+        law_route = respx.get("https://laws.e-gov.go.jp/api/2/law_data/REV_ID_20190401").mock(
+            return_value=Response(200, content=TestDerivedCache.LAW_XML.encode("utf-8"))
+        )
+        client = EGovAPIClient(retry_policy=RetryPolicy(max_retries=0))
+        cache = CacheManager()
+        await get_law_full_text("REV_ID", asof="2020-04-01", client=client, cache=cache)
+
+        # 改正履歴のTTL切れ、法令本文のソフトTTL切れ
+        cache._revisions_cache.clear()
+        entry = cache.get_law_data_entry("REV_ID", revision_id="REV_ID_20190401")
+        assert entry is not None
+        entry.expires_at = time.time() - CacheManager.DEFAULT_STALE_WHILE_REVALIDATE - 10
+        revisions_route.mock(return_value=Response(503))
+        law_route.mock(return_value=Response(503))
+
+        result = await get_law_full_text("REV_ID", asof="2020-04-01", client=client, cache=cache)
+        await wait_background_refreshes()
+
+        assert result.stale
+        assert "旧本文" in result.content
+        assert law_route.call_count == 2
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_expired_revisions_refresh_in_background(self) -> None:
+        """改正履歴の期限切れでは待たせずに法令本文を返し、改正履歴は裏で取得し直す"""
+        revisions_route = respx.get("https://laws.e-gov.go.jp/api/2/law_revisions/REV_ID").mock(
+            return_value=Response(200, json=self.REVISIONS)
+        )
+        respx.get("https://laws.e-gov.go.jp/api/2/law_data/REV_ID_20190401").mock(
+            return_value=Response(200, content=TestDerivedCache.LAW_XML.encode("utf-8"))
+        )
+        client = EGovAPIClient()
+        cache = CacheManager()
+        await get_law_full_text("REV_ID", asof="2020-04-01", client=client, cache=cache)
+        cache._revisions_cache.clear()
+
+        result = await get_law_full_text("REV_ID", asof="2020-04-01", client=client, cache=cache)
+        assert not result.stale
+        assert revisions_route.call_count == 1
+
+        await wait_background_refreshes()
+        assert revisions_route.call_count == 2
+        assert cache.get_revisions("REV_ID") is not None